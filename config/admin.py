@@ -1,11 +1,57 @@
 from django.contrib import admin
-from .models import User, Building, Service, Order, OrderHistory, Client, Category, Review
+from django.utils.html import format_html
+
+from .models import User, Building, Service, Order, OrderHistory, Client, Category, Review, MediaAsset, SlotCapacity, BookedSlot, OrderDailyRollup
+from .thumbnails import rendition_url
+
+
+class ImagePreviewAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'image_preview')
+
+    @admin.display(description="Сүрөт")
+    def image_preview(self, obj):
+        if not obj.image:
+            return '—'
+        return format_html('<img src="{}" width="80" loading="lazy">', rendition_url(obj.image, 'admin', 'webp'))
 
 
 admin.site.register(Review)
-admin.site.register(Category)
-admin.site.register(Building)
-admin.site.register(Service)
+admin.site.register(Category, ImagePreviewAdmin)
+admin.site.register(Building, ImagePreviewAdmin)
+admin.site.register(Service, ImagePreviewAdmin)
 admin.site.register(Order)
 admin.site.register(OrderHistory)
-admin.site.register(Client)
\ No newline at end of file
+admin.site.register(Client)
+
+
+@admin.register(MediaAsset)
+class MediaAssetAdmin(admin.ModelAdmin):
+    list_display = ('original_name', 'name', 'size', 'created_at')
+    search_fields = ('original_name', 'name')
+
+
+@admin.register(SlotCapacity)
+class SlotCapacityAdmin(admin.ModelAdmin):
+    list_display = ('building', 'service', 'weekday', 'start_time', 'end_time', 'slot_minutes', 'capacity')
+    list_filter = ('building', 'weekday')
+
+
+@admin.register(BookedSlot)
+class BookedSlotAdmin(admin.ModelAdmin):
+    list_display = ('building', 'service', 'date', 'time', 'booked', 'capacity')
+    list_filter = ('building',)
+    date_hierarchy = 'date'
+
+
+@admin.register(OrderDailyRollup)
+class OrderDailyRollupAdmin(admin.ModelAdmin):
+    # Маанилер заказдардан эсептелет (rebuild_rollups), колго өзгөртүлбөйт
+    list_display = ('day', 'building', 'service', 'status', 'orders', 'revenue', 'prepayment')
+    list_filter = ('status', 'building')
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
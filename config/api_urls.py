@@ -2,7 +2,9 @@ from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 from .views import (
     UserViewSet, ManagerViewSet, ClientViewSet,
-    BuildingViewSet, ServiceViewSet, OrderViewSet, OrderHistoryViewSet, api_root
+    BuildingViewSet, CategoryViewSet, ServiceViewSet, OrderViewSet, OrderHistoryViewSet, api_root,
+    async_building_list, async_order_detail, async_order_list, async_register, async_service_detail,
+    async_service_list,
 )
 
 router = DefaultRouter()
@@ -10,11 +12,19 @@ router.register(r'users', UserViewSet)
 router.register(r'managers', ManagerViewSet, basename='manager')
 router.register(r'clients', ClientViewSet, basename='client')
 router.register(r'buildings', BuildingViewSet)
+router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'services', ServiceViewSet)
 router.register(r'orders', OrderViewSet, basename='order')
 router.register(r'orderhistories', OrderHistoryViewSet, basename='orderhistory')
 
 urlpatterns = [
     path('', api_root, name='api-root'),
+    # Async (ASGI) окуу endpoint'тери — config/views.py, 8-бөлүм
+    path('async/services/', async_service_list, name='async-service-list'),
+    path('async/services/<int:pk>/', async_service_detail, name='async-service-detail'),
+    path('async/buildings/', async_building_list, name='async-building-list'),
+    path('async/orders/', async_order_list, name='async-order-list'),
+    path('async/orders/<int:pk>/', async_order_detail, name='async-order-detail'),
+    path('async/register/', async_register, name='async-register'),
     path('', include(router.urls)),
 ]
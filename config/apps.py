@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ConfigConfig(AppConfig):
     name = 'config'
+
+    def ready(self):
+        from . import signals  # noqa: F401
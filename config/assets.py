@@ -0,0 +1,481 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+
+# =========================================================
+# CSS ЖАНА ИКОНКАЛАР (manage.py build_css)
+# =========================================================
+# Барактар интернетсиз (CDN'сиз) иштеши үчүн static/ ичине эки файл
+# курулат жана git'ке сакталат:
+#   css/app.<hash>.css   — шаблондордо (жана views.py'дагы класс саптарында)
+#                          колдонулган Tailwind utility'лери гана;
+#   css/icons.<hash>.css — колдонулган Font Awesome иконкалары, шрифттер
+#                          fonts/*.<hash>.woff2 ошол символдорго чейин кыскартылган.
+# Аттары css/manifest.json'до; base.html аларды {% built_static %} менен алат.
+#
+# Tailwind'дин толук компилятору эмес: RULES'та ушул шаблондор колдонгон
+# utility үй-бүлөлөрү гана бар (маанилери Tailwind v3'түкү). Шаблонго
+# жаңы үй-бүлө кошулса (мис. `grid-rows-2`) — RULES'ка бир сап кошуп,
+# `manage.py build_css` кайра иштетиңиз; tests.py 25 эскирген курулушту кармайт.
+
+MANIFEST_NAME = 'css/manifest.json'
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+PSEUDO = {'hover': ':hover', 'focus': ':focus', 'active': ':active'}
+GROUP = {'group-hover': '.group:hover', 'group-focus-within': '.group:focus-within'}
+# Вариант класстар негизгилерден кийин, dark андан кийин, экрандар эң аягында
+VARIANT_WEIGHT = {'group-hover': 1, 'group-focus-within': 2, 'placeholder': 3, 'hover': 4, 'focus': 5,
+                  'active': 6, 'dark': 10}
+
+SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950')
+PALETTES = {
+    'slate': '#f8fafc #f1f5f9 #e2e8f0 #cbd5e1 #94a3b8 #64748b #475569 #334155 #1e293b #0f172a #020617',
+    'red': '#fef2f2 #fee2e2 #fecaca #fca5a5 #f87171 #ef4444 #dc2626 #b91c1c #991b1b #7f1d1d #450a0a',
+    'orange': '#fff7ed #ffedd5 #fed7aa #fdba74 #fb923c #f97316 #ea580c #c2410c #9a3412 #7c2d12 #431407',
+    'amber': '#fffbeb #fef3c7 #fde68a #fcd34d #fbbf24 #f59e0b #d97706 #b45309 #92400e #78350f #451a03',
+    'green': '#f0fdf4 #dcfce7 #bbf7d0 #86efac #4ade80 #22c55e #16a34a #15803d #166534 #14532d #052e16',
+    'emerald': '#ecfdf5 #d1fae5 #a7f3d0 #6ee7b7 #34d399 #10b981 #059669 #047857 #065f46 #064e3b #022c22',
+    'blue': '#eff6ff #dbeafe #bfdbfe #93c5fd #60a5fa #3b82f6 #2563eb #1d4ed8 #1e40af #1e3a8a #172554',
+    'purple': '#faf5ff #f3e8ff #e9d5ff #d8b4fe #c084fc #a855f7 #9333ea #7e22ce #6b21a8 #581c87 #3b0764',
+}
+COLORS = {'white': '#ffffff', 'black': '#000000', 'transparent': 'transparent'}
+for _name, _hexes in PALETTES.items():
+    COLORS.update((f'{_name}-{shade}', value) for shade, value in zip(SHADES, _hexes.split()))
+
+FONT_SIZES = {'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+              'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+              '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+              '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1')}
+FONT_WEIGHTS = {'normal': 400, 'medium': 500, 'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900}
+LEADING = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625'}
+TRACKING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em', 'wider': '0.05em',
+            'widest': '0.1em'}
+RADIUS = {'': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem',
+          'full': '9999px'}
+MAX_WIDTH = {'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem', '2xl': '42rem', '3xl': '48rem',
+             '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem', 'full': '100%'}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'none': '0 0 #0000',
+}
+BLUR = {'sm': '4px', '': '8px', 'md': '12px', 'lg': '16px', 'xl': '24px'}
+TRANSITIONS = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, '
+        'transform, filter, backdrop-filter',
+    'all': 'all',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity',
+    'transform': 'transform',
+}
+ANIMATIONS = {
+    'ping': ('ping 1s cubic-bezier(0, 0, 0.2, 1) infinite', '@keyframes ping{75%,100%{transform:scale(2);opacity:0}}'),
+    'pulse': ('pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite', '@keyframes pulse{50%{opacity:.5}}'),
+}
+SIDES = {'': [''], 't': ['-top'], 'r': ['-right'], 'b': ['-bottom'], 'l': ['-left'], 'x': ['-left', '-right'],
+         'y': ['-top', '-bottom']}
+TRANSFORM = 'transform:translate(var(--tw-translate-x), var(--tw-translate-y)) scale(var(--tw-scale-x), var(--tw-scale-y))'
+CHILDREN = ' > :not([hidden]) ~ :not([hidden])'
+
+PREFLIGHT = """*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb;\
+--tw-translate-x:0;--tw-translate-y:0;--tw-scale-x:1;--tw-scale-y:1;--tw-ring-offset-width:0px;\
+--tw-ring-offset-color:#fff;--tw-ring-color:rgb(59 130 246 / 0.5);--tw-ring-offset-shadow:0 0 #0000;\
+--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000;--tw-shadow-colored:0 0 #0000}
+html{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;font-family:ui-sans-serif,system-ui,sans-serif,\
+"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji"}
+body{margin:0;line-height:inherit}
+hr{height:0;color:inherit;border-top-width:1px}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+small{font-size:80%}
+table{text-indent:0;border-color:inherit;border-collapse:collapse}
+button,input,optgroup,select,textarea{font-family:inherit;font-size:100%;font-weight:inherit;line-height:inherit;\
+letter-spacing:inherit;color:inherit;margin:0;padding:0}
+button,select{text-transform:none}
+button,[type=button],[type=reset],[type=submit]{-webkit-appearance:button;background-color:transparent;\
+background-image:none}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}
+ol,ul,menu{list-style:none;margin:0;padding:0}
+textarea{resize:vertical}
+input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}
+button,[role=button]{cursor:pointer}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+[hidden]{display:none}
+"""
+
+TOKEN_RE = re.compile(r'[^\s"\'`<>{}=;]+')
+
+
+def sources(base_dir):
+    """Класстар окулган файлдар: шаблондор жана views.py (home_statistics() класстарды
+    text-emerald-500 сыяктуу саптар катары шаблонго өзү берет)."""
+    base_dir = Path(base_dir)
+    return [*sorted((base_dir / 'config' / 'templates').rglob('*.html')), base_dir / 'config' / 'views.py']
+
+
+def scan_tokens(paths):
+    tokens = set()
+    for path in paths:
+        tokens.update(TOKEN_RE.findall(Path(path).read_text(encoding='utf-8')))
+    return tokens
+
+
+# --- Маанилер ---
+
+def color(value):
+    """'blue-500', 'white/80' -> CSS түсү же None."""
+    name, _, alpha = value.partition('/')
+    hex_value = COLORS.get(name)
+    if hex_value is None or (alpha and not alpha.isdigit()):
+        return None
+    if not alpha or not hex_value.startswith('#'):
+        return hex_value
+    rgb = ' '.join(str(int(hex_value[i:i + 2], 16)) for i in (1, 3, 5))
+    return f'rgb({rgb} / {int(alpha) / 100:g})'
+
+
+def arbitrary(value):
+    """'[calc(100vh-80px)]' -> 'calc(100vh - 80px)' (Tailwind'дегидей '_' — бош орун)."""
+    if not (value.startswith('[') and value.endswith(']')):
+        return None
+    value = value[1:-1].replace('_', ' ')
+    return re.sub(r'(?<=\w)([+-])(?=\d)', r' \1 ', value) if value.startswith('calc(') else value
+
+
+def length(value):
+    if re.fullmatch(r'\d+(\.5)?', value):
+        return '0px' if value == '0' else f'{float(value) / 4:g}rem'
+    if re.fullmatch(r'\d+/\d+', value):
+        numerator, denominator = map(int, value.split('/'))
+        return f'{numerator / denominator * 100:g}%'
+    return {'px': '1px', 'auto': 'auto', 'full': '100%'}.get(value) or arbitrary(value)
+
+
+def _negate(sign, value):
+    return f'-{value}' if sign and value not in (None, '0px', 'auto') else value
+
+
+def _props(props, value):
+    return None if value is None else ';'.join(f'{prop}:{value}' for prop in props)
+
+
+def _sides(prefix, side, value, suffix=''):
+    return _props([f'{prefix}{s}{suffix}' for s in SIDES[side]], value)
+
+
+def _transform(props, value):
+    return None if value is None else f'{_props(props, value)};{TRANSFORM}'
+
+
+def _static(table):
+    return ('|'.join(re.escape(name) for name in table), lambda m: table[m[0]], '')
+
+
+# --- Utility'лер ---
+# (regex, декларациялар, бала селектору). Тизменин тартиби — CSS'теги тартип
+# (Tailwind'дегидей): кийинкиси мурункусун жеңет (p-4 ... pt-2, border ... border-b).
+
+RULES = [
+    _static({'visible': 'visibility:visible', 'invisible': 'visibility:hidden', 'static': 'position:static',
+             'fixed': 'position:fixed', 'absolute': 'position:absolute', 'relative': 'position:relative',
+             'sticky': 'position:sticky'}),
+    (r'(-?)(inset|top|right|bottom|left)-(.+)', lambda m: _props(
+        ['top', 'right', 'bottom', 'left'] if m[2] == 'inset' else [m[2]], _negate(m[1], length(m[3]))), ''),
+    (r'z-(\d+|\[\d+\])', lambda m: f'z-index:{m[1].strip("[]")}', ''),
+    (r'(-?)m([trblxy]?)-(.+)', lambda m: _sides('margin', m[2], _negate(m[1], length(m[3]))), ''),
+    (r'line-clamp-(\d+)', lambda m: f'overflow:hidden;display:-webkit-box;-webkit-box-orient:vertical;'
+                                    f'-webkit-line-clamp:{m[1]}', ''),
+    _static({'block': 'display:block', 'inline-block': 'display:inline-block', 'inline': 'display:inline',
+             'flex': 'display:flex', 'inline-flex': 'display:inline-flex', 'table': 'display:table',
+             'grid': 'display:grid', 'hidden': 'display:none'}),
+    (r'(min-h|h|w)-(.+)', lambda m: _props(
+        [{'h': 'height', 'w': 'width', 'min-h': 'min-height'}[m[1]]],
+        '100vh' if m[2] == 'screen' and m[1] != 'w' else length(m[2])), ''),
+    (r'max-w-(.+)', lambda m: _props(['max-width'], MAX_WIDTH.get(m[1])), ''),
+    (r'(-?)translate-([xy])-(.+)', lambda m: _transform(
+        [f'--tw-translate-{m[2]}'], _negate(m[1], length(m[3]))), ''),
+    (r'scale-(\d+)', lambda m: _transform(['--tw-scale-x', '--tw-scale-y'], f'{int(m[1]) / 100:g}'), ''),
+    (r'animate-(\w+)', lambda m: _props(['animation'], ANIMATIONS.get(m[1], (None,))[0]), ''),
+    _static({'cursor-pointer': 'cursor:pointer', 'pointer-events-none': 'pointer-events:none',
+             'appearance-none': 'appearance:none'}),
+    (r'grid-cols-(\d+)', lambda m: f'grid-template-columns:repeat({m[1]}, minmax(0, 1fr))', ''),
+    _static({'flex-row': 'flex-direction:row', 'flex-col': 'flex-direction:column', 'flex-wrap': 'flex-wrap:wrap',
+             'items-start': 'align-items:flex-start', 'items-end': 'align-items:flex-end',
+             'items-center': 'align-items:center', 'justify-start': 'justify-content:flex-start',
+             'justify-end': 'justify-content:flex-end', 'justify-center': 'justify-content:center',
+             'justify-between': 'justify-content:space-between'}),
+    (r'gap-(.+)', lambda m: _props(['gap'], length(m[1])), ''),
+    (r'space-y-(.+)', lambda m: _props(['margin-top'], length(m[1])), CHILDREN),
+    (r'divide-y', lambda m: 'border-top-width:1px;border-bottom-width:0px', CHILDREN),
+    (r'divide-(.+)', lambda m: _props(['border-color'], color(m[1])), CHILDREN),
+    (r'overflow-(?:([xy])-)?(auto|hidden)', lambda m: f'overflow{"-" + m[1] if m[1] else ""}:{m[2]}', ''),
+    (r'rounded(?:-(.+))?', lambda m: _props(['border-radius'], RADIUS.get(m[1] or '') or arbitrary(m[1] or '')), ''),
+    (r'border(?:-([trblxy]))?(?:-(\d+))?', lambda m: _sides('border', m[1] or '', f'{m[2] or 1}px', '-width'), ''),
+    _static({'border-dashed': 'border-style:dashed', 'border-none': 'border-style:none',
+             'border-collapse': 'border-collapse:collapse'}),
+    (r'border-(.+)', lambda m: _props(['border-color'], color(m[1])), ''),
+    (r'bg-(.+)', lambda m: _props(['background-color'], color(m[1])), ''),
+    _static({'bg-gradient-to-r': 'background-image:linear-gradient(to right, var(--tw-gradient-stops))',
+             'bg-gradient-to-br': 'background-image:linear-gradient(to bottom right, var(--tw-gradient-stops))'}),
+    (r'from-(.+)', lambda m: color(m[1]) and (
+        f'--tw-gradient-from:{color(m[1])};--tw-gradient-to:{color(m[1] + "/0")};'
+        f'--tw-gradient-stops:var(--tw-gradient-from), var(--tw-gradient-to)'), ''),
+    (r'to-(.+)', lambda m: _props(['--tw-gradient-to'], color(m[1])), ''),
+    _static({'object-cover': 'object-fit:cover'}),
+    (r'p([trblxy]?)-(.+)', lambda m: _sides('padding', m[1], length(m[2])), ''),
+    _static({'text-left': 'text-align:left', 'text-center': 'text-align:center', 'text-right': 'text-align:right'}),
+    (r'text-(.+)', lambda m: (f'font-size:{FONT_SIZES[m[1]][0]};line-height:{FONT_SIZES[m[1]][1]}'
+                              if m[1] in FONT_SIZES else _props(['font-size'], arbitrary(m[1]))), ''),
+    (r'font-(\w+)', lambda m: _props(['font-weight'], FONT_WEIGHTS.get(m[1])), ''),
+    _static({'uppercase': 'text-transform:uppercase', 'italic': 'font-style:italic'}),
+    (r'leading-(\w+)', lambda m: _props(['line-height'], LEADING.get(m[1])), ''),
+    (r'tracking-(.+)', lambda m: _props(['letter-spacing'], TRACKING.get(m[1]) or arbitrary(m[1])), ''),
+    (r'text-(.+)', lambda m: _props(['color'], color(m[1])), ''),
+    _static({'underline': 'text-decoration-line:underline'}),
+    (r'opacity-(\d+)', lambda m: f'opacity:{int(m[1]) / 100:g}', ''),
+    (r'shadow(?:-(\w+))?', lambda m: (m[1] or '') in SHADOWS and (
+        f'--tw-shadow:{SHADOWS[m[1] or ""]};'
+        f'--tw-shadow-colored:{re.sub(r"rgb[(][^)]*[)]|#0000", "var(--tw-shadow-color)", SHADOWS[m[1] or ""])};'
+        f'box-shadow:var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)'), ''),
+    (r'shadow-(.+)', lambda m: color(m[1]) and
+        f'--tw-shadow-color:{color(m[1])};--tw-shadow:var(--tw-shadow-colored)', ''),
+    _static({'outline-none': 'outline:2px solid transparent;outline-offset:2px'}),
+    (r'ring-(\d+)', lambda m: (
+        '--tw-ring-offset-shadow:0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color);'
+        f'--tw-ring-shadow:0 0 0 calc({m[1]}px + var(--tw-ring-offset-width)) var(--tw-ring-color);'
+        'box-shadow:var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)'), ''),
+    (r'ring-(.+)', lambda m: _props(['--tw-ring-color'], color(m[1])), ''),
+    _static({'grayscale': 'filter:grayscale(100%)'}),
+    (r'backdrop-blur(?:-(\w+))?', lambda m: _props(
+        ['-webkit-backdrop-filter', 'backdrop-filter'],
+        f'blur({BLUR[m[1] or ""]})' if (m[1] or '') in BLUR else None), ''),
+    (r'transition(?:-(\w+))?', lambda m: (m[1] or '') in TRANSITIONS and (
+        f'transition-property:{TRANSITIONS[m[1] or ""]};'
+        'transition-timing-function:cubic-bezier(0.4, 0, 0.2, 1);transition-duration:150ms'), ''),
+    (r'duration-(\d+)', lambda m: f'transition-duration:{m[1]}ms', ''),
+]
+RULES = [(re.compile(pattern), build, suffix) for pattern, build, suffix in RULES]
+
+
+def split_variants(token):
+    """'dark:hover:bg-x' -> (['dark', 'hover'], 'bg-x'); [ ] ичиндеги ':' бөлүнбөйт."""
+    parts = re.split(r':(?![^\[]*\])', token)
+    return parts[:-1], parts[-1]
+
+
+def escape(name):
+    return re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', name)
+
+
+def declarations(name):
+    """(тартиби, декларациялар, бала селектору) же None."""
+    for order, (pattern, build, suffix) in enumerate(RULES):
+        match = pattern.fullmatch(name)
+        body = build(match) if match else None
+        if body:
+            return order, body, suffix
+    return None
+
+
+def compile_utility(token):
+    """[(экран, сорттоо ачкычы, селектор, декларациялар)] же None (белгисиз класс)."""
+    variants, name = split_variants(token)
+    screens = [v for v in variants if v in SCREENS]
+    if len(screens) > 1 or any(v not in SCREENS and v not in VARIANT_WEIGHT for v in variants):
+        return None
+    key = (sum(VARIANT_WEIGHT.get(v, 0) for v in variants), token)
+    screen = screens[0] if screens else None
+    if name == 'container' and not variants:
+        return [(None, (0, -1, token), '.container', 'width:100%')] + [
+            (size, (0, -1, token), '.container', f'max-width:{width}') for size, width in SCREENS.items()]
+    found = declarations(name)
+    if found is None:
+        return None
+    order, body, suffix = found
+    selector = '.' + escape(token) + ''.join(PSEUDO[v] for v in variants if v in PSEUDO)
+    selector += ('::placeholder' if 'placeholder' in variants else '') + suffix
+    for variant in variants:
+        if variant in GROUP:
+            selector = f'{GROUP[variant]} {selector}'
+    if 'dark' in variants:
+        selector = f'.dark {selector}'
+    return [(screen, (key[0], order, token), selector, body)]
+
+
+def compile_css(tokens):
+    """(css, колдонулган класстар) — белгисиз сөздөр (Bootstrap, текст) өткөрүлөт."""
+    rules, used = [], set()
+    for token in tokens:
+        compiled = compile_utility(token)
+        if compiled:
+            rules.extend(compiled)
+            used.add(token)
+    screen_order = [None, *SCREENS]
+    rules.sort(key=lambda rule: (screen_order.index(rule[0]), rule[1]))
+
+    lines = [PREFLIGHT.rstrip('\n')]
+    current = None
+    for screen, _, selector, body in rules:
+        if screen != current:
+            if current is not None:
+                lines.append('}')
+            lines.append(f'@media (min-width:{SCREENS[screen]}){{')
+            current = screen
+        lines.append(f'{selector}{{{body}}}')
+    if current is not None:
+        lines.append('}')
+    animations = {split_variants(token)[1][len('animate-'):] for token in used}
+    lines.extend(ANIMATIONS[name][1] for name in sorted(animations & set(ANIMATIONS)))
+    return '\n'.join(lines) + '\n', used
+
+
+# --- Font Awesome ---
+
+ICON_STYLES = {
+    'fa-solid': ('Font Awesome 6 Free', 900, 'fa-solid-900'),
+    'fa-regular': ('Font Awesome 6 Free', 400, 'fa-regular-400'),
+    'fa-brands': ('Font Awesome 6 Brands', 400, 'fa-brands-400'),
+}
+ICON_RULE_RE = re.compile(r'((?:\.fa-[a-z0-9-]+::?before\s*,?\s*)+)\{\s*content:\s*["\']\\([0-9a-fA-F]+)["\']')
+BANNER_RE = re.compile(r'\A\s*/\*!.*?\*/', re.S)
+
+
+def icon_names(tokens):
+    return {token for token in tokens if re.fullmatch(r'fa-[a-z0-9-]+', token)} - set(ICON_STYLES)
+
+
+def parse_icon_codepoints(css):
+    """Font Awesome'дун all.css'инен {'fa-globe': 'f0ac', ...}."""
+    codepoints = {}
+    for selectors, codepoint in ICON_RULE_RE.findall(css):
+        for name in re.findall(r'\.(fa-[a-z0-9-]+)::?before', selectors):
+            codepoints[name] = codepoint.lower()
+    return codepoints
+
+
+def subset_font(source, codepoints, target):
+    """fontTools (+brotli) болсо ушул символдор гана woff2 катары, болбосо шрифт толугу менен."""
+    try:
+        from fontTools import subset
+    except ImportError:
+        shutil.copyfile(source, target)
+        return False
+    options = subset.Options()
+    options.flavor = 'woff2'
+    font = subset.load_font(str(source), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[int(codepoint, 16) for codepoint in codepoints])
+    subsetter.subset(font)
+    subset.save_font(font, str(target), options)
+    return True
+
+
+def icon_css(codepoints, fonts, banner=''):
+    """fonts: {'fa-solid': 'fa-solid-900.<hash>.woff2', ...} (css/'ден ../fonts/)."""
+    lines = [banner] if banner else []
+    for style, filename in sorted(fonts.items()):
+        family, weight, _ = ICON_STYLES[style]
+        lines.append(f'@font-face{{font-family:"{family}";font-style:normal;font-weight:{weight};'
+                     f'font-display:block;src:url(../fonts/{filename}) format("woff2")}}')
+    lines.append(','.join(f'.{style}' for style in sorted(fonts)) + '{-moz-osx-font-smoothing:grayscale;'
+                 '-webkit-font-smoothing:antialiased;display:inline-block;font-style:normal;font-variant:normal;'
+                 'line-height:1;text-rendering:auto}')
+    for style in sorted(fonts):
+        family, weight, _ = ICON_STYLES[style]
+        lines.append(f'.{style}{{font-family:"{family}";font-weight:{weight}}}')
+    for name, codepoint in sorted(codepoints.items()):
+        lines.append(f'.{name}::before{{content:"\\{codepoint}"}}')
+    return '\n'.join(lines) + '\n'
+
+
+def build_icons(fontawesome_dir, names, static_dir, log):
+    """Манифесттин жазуулары: icons.css жана ар бир стилдин кыскартылган шрифти."""
+    fontawesome_dir, static_dir = Path(fontawesome_dir), Path(static_dir)
+    css_path = next(path for path in (fontawesome_dir / 'css' / 'all.css', fontawesome_dir / 'css' / 'all.min.css')
+                    if path.is_file())
+    source_css = css_path.read_text(encoding='utf-8')
+    available = parse_icon_codepoints(source_css)
+    codepoints = {name: available[name] for name in names if name in available}
+    missing = sorted(set(names) - set(available))
+    if missing:
+        log(f"Font Awesome'до жок иконкалар: {', '.join(missing)}")
+
+    entries, fonts = {}, {}
+    # Стиль шаблондо динамикалык болушу мүмкүн (fa-{% if %}solid{% else %}regular{% endif %}):
+    # ар бир стилдин шрифти ошол эле символдорго чейин кыскартылат
+    for style, (_, _, stem) in sorted(ICON_STYLES.items()):
+        source = fontawesome_dir / 'webfonts' / f'{stem}.woff2'
+        if not source.is_file():
+            continue
+        target = static_dir / 'fonts' / f'{stem}.woff2'
+        target.parent.mkdir(parents=True, exist_ok=True)
+        subsetted = subset_font(source, codepoints.values(), target)
+        data = target.read_bytes()
+        target.unlink()
+        fonts[style] = write_hashed(target.parent, stem, '.woff2', data)
+        entries[f'fonts/{stem}.woff2'] = f'fonts/{fonts[style]}'
+        log(f"{fonts[style]}: {len(data) // 1024} KiB" + ("" if subsetted else " (fontTools жок — толук шрифт)"))
+
+    banner = BANNER_RE.match(source_css)
+    css = icon_css(codepoints, fonts, banner[0].strip() if banner else '').encode()
+    entries['icons.css'] = 'css/' + write_hashed(static_dir / 'css', 'icons', '.css', css)
+    log(f"icons.css: {len(codepoints)} иконка -> {entries['icons.css']}")
+    return entries
+
+
+# --- Файлдар ---
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_hashed(directory, stem, suffix, data):
+    name = f'{stem}.{content_hash(data)}{suffix}'
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    (Path(directory) / name).write_bytes(data)
+    return name
+
+
+def read_manifest(static_dir):
+    try:
+        return json.loads((Path(static_dir) / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(static_dir, entries):
+    """Мурунку курулуштун хештелген файлдары өчүрүлөт, жаңы манифест жазылат."""
+    static_dir = Path(static_dir)
+    for old in set(read_manifest(static_dir).values()) - set(entries.values()):
+        try:
+            os.remove(static_dir / old)
+        except OSError:
+            pass
+    path = static_dir / MANIFEST_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entries, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def build(sources, static_dir, fontawesome_dir=None, extra_icons=(), log=print):
+    """app.css (жана Font Awesome берилсе иконкалар) -> static_dir; манифесттин жазуулары.
+    Font Awesome берилбесе мурунку курулуштун иконкалары сакталат."""
+    tokens = scan_tokens(sources)
+    css, used = compile_css(tokens)
+    entries = {'app.css': 'css/' + write_hashed(Path(static_dir) / 'css', 'app', '.css', css.encode())}
+    log(f"app.css: {len(used)} класс, {len(css.encode()) // 1024} KiB -> {entries['app.css']}")
+    if fontawesome_dir:
+        entries.update(build_icons(fontawesome_dir, icon_names(tokens) | set(extra_icons), static_dir, log))
+    else:
+        entries.update({name: path for name, path in read_manifest(static_dir).items() if name != 'app.css'})
+    write_manifest(static_dir, entries)
+    return entries
@@ -0,0 +1,135 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .metrics import CACHE_REQUESTS
+from .models import User
+
+
+# =========================================================
+# КЭШТЕЛГЕН АУТЕНТИФИКАЦИЯ
+# =========================================================
+# Ар бир API сурамы authtoken_token + config_user JOIN'ин, ар бир HTML
+# сурамы AuthenticationMiddleware аркылуу config_user сабын окуйт.
+# Бул жерде экөө тең кэштен:
+#   auth:user:<pk>     — User объектиси (AUTH_CACHE_TIMEOUT секунд);
+#   auth:token:<hash>  — токендин ээси жана түзүлгөн убактысы.
+# Токендин өзү кэштин ачкычында жок — sha256 гана.
+#
+# Жараксыз кылуу (config/signals.py): User сакталганда (пароль, роль,
+# managed_building, is_active...), чыкканда (logout) жана имарат
+# өчүрүлгөндө (managed_building -> NULL) — колдонуучунун жазуусу; токен
+# өчүрүлгөндө — токендин жазуусу. QuerySet.update() сигналсыз иштейт:
+# андай жерде invalidate_user() өзүнчө чакырылышы керек. Бир нече
+# worker болсо CACHES жалпы (Redis) болушу керек, болбосо башка
+# процесстер жаңыланууну AUTH_CACHE_TIMEOUT'тан кийин гана көрөт.
+
+USER_KEY = 'auth:user:{}'
+TOKEN_KEY = 'auth:token:{}'
+
+
+def auth_cache_timeout():
+    return getattr(settings, 'AUTH_CACHE_TIMEOUT', 60)
+
+
+def _token_key(key):
+    return TOKEN_KEY.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+def _remember_user(user):
+    if user is not None:
+        cache.set(USER_KEY.format(user.pk), user, auth_cache_timeout())
+    return user
+
+
+def cached_user(pk):
+    """User же None (жок болсо кэштелбейт)."""
+    user = cache.get(USER_KEY.format(pk))
+    if user is not None:
+        CACHE_REQUESTS.inc(cache='auth', result='hit')
+        return user
+    CACHE_REQUESTS.inc(cache='auth', result='miss')
+    return _remember_user(User._default_manager.filter(pk=pk).first())
+
+
+async def acached_user(pk):
+    user = await cache.aget(USER_KEY.format(pk))
+    if user is not None:
+        CACHE_REQUESTS.inc(cache='auth', result='hit')
+        return user
+    CACHE_REQUESTS.inc(cache='auth', result='miss')
+    user = await User._default_manager.filter(pk=pk).afirst()
+    if user is not None:
+        await cache.aset(USER_KEY.format(pk), user, auth_cache_timeout())
+    return user
+
+
+def _token_from_cache(key, entry, user):
+    # authenticate() request.auth катары Token кайтарат — базадан окулгандай объект
+    token = Token.from_db(DEFAULT_DB_ALIAS, ['key', 'user_id', 'created'], [key, entry[0], entry[1]])
+    token.user = user
+    return token
+
+
+def cached_token(key):
+    """(Token, User) же None."""
+    entry = cache.get(_token_key(key))
+    if entry is None:
+        token = Token.objects.select_related('user').filter(key=key).first()
+        if token is None:
+            return None
+        cache.set(_token_key(key), (token.user_id, token.created), auth_cache_timeout())
+        return token, _remember_user(token.user)
+    user = cached_user(entry[0])
+    return (_token_from_cache(key, entry, user), user) if user is not None else None
+
+
+async def acached_token(key):
+    entry = await cache.aget(_token_key(key))
+    if entry is None:
+        token = await Token.objects.select_related('user').filter(key=key).afirst()
+        if token is None:
+            return None
+        await cache.aset(_token_key(key), (token.user_id, token.created), auth_cache_timeout())
+        await cache.aset(USER_KEY.format(token.user_id), token.user, auth_cache_timeout())
+        return token, token.user
+    user = await acached_user(entry[0])
+    return (_token_from_cache(key, entry, user), user) if user is not None else None
+
+
+def invalidate_user(*pks):
+    cache.delete_many([USER_KEY.format(pk) for pk in pks])
+
+
+def invalidate_token(key):
+    cache.delete(_token_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        found = cached_token(key)
+        if found is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        token, user = found
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return user, token
+
+
+class CachedModelBackend(ModelBackend):
+    """Сессиядагы колдонуучуну (AuthenticationMiddleware) кэштен алат."""
+
+    def get_user(self, user_id):
+        user = cached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        user = await acached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
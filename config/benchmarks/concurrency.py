@@ -0,0 +1,194 @@
+import asyncio
+import io
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from config.models import Order, Service, User
+
+from .runner import percentile
+
+
+# =========================================================
+# КОНКУРЕНТТҮҮ БЕНЧМАРК: WSGI vs ASGI
+# =========================================================
+# Тармаксыз, бир процессте: `clients` асинхрондук клиент ар бири жооп
+# келээр замат кийинки сурамды жөнөтөт (200 клиент — 200 ачык байланыш).
+# Бир "worker" — бир handler:
+#   * wsgi        — WSGIHandler, `wsgi_threads` thread'тик пул (gunicorn
+#                   sync worker = 1, gthread = --threads); DRF view'лары;
+#   * asgi-sync   — ASGIHandler, ошол эле DRF view'лары (Django аларды
+#                   thread'ке өткөрөт);
+#   * asgi-async  — ASGIHandler, /api/async/ view'лары (config/views.py, 8).
+# Сервердин өзүнүн (uvicorn/gunicorn) HTTP парсингинин чыгымы кирбейт.
+
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+HOST = 'testserver'
+
+
+def endpoints(service_pk, order_pk):
+    """Ар бир режим үчүн бирдей жоопту кайтарган URL'дер (кезек менен сураналат)."""
+    sync = [reverse('service-list'), reverse('service-detail', args=[service_pk]), reverse('building-list'),
+            reverse('order-list'), reverse('order-detail', args=[order_pk])]
+    native = [reverse('async-service-list'), reverse('async-service-detail', args=[service_pk]),
+              reverse('async-building-list'), reverse('async-order-list'),
+              reverse('async-order-detail', args=[order_pk])]
+    return {'wsgi': sync, 'asgi-sync': sync, 'asgi-async': native}
+
+
+def session_cookie(user):
+    client = Client()
+    client.force_login(user)
+    return f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+
+def wsgi_request(handler, path, cookie):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+        'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': HOST, 'HTTP_COOKIE': cookie, 'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(b''),
+        'wsgi.errors': sys.stderr, 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    status = []
+    body = handler(environ, lambda value, headers, exc_info=None: status.append(value))
+    try:
+        b''.join(body)
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_request(handler, path, cookie):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', HOST.encode()), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 0), 'server': (HOST, 80),
+    }
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Клиент ажырабайт; Django жоопту жөнөткөндөн кийин бул күтүүнү токтотот
+        await asyncio.get_running_loop().create_future()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await handler(scope, receive, send)
+    return status
+
+
+def request_function(mode, cookie, wsgi_threads):
+    """(async request(path) -> status, close())"""
+    if mode == 'wsgi':
+        handler = WSGIHandler()
+        pool = ThreadPoolExecutor(max_workers=wsgi_threads, thread_name_prefix='wsgi')
+
+        async def request(path):
+            return await asyncio.get_running_loop().run_in_executor(pool, wsgi_request, handler, path, cookie)
+        return request, pool.shutdown
+
+    handler = ASGIHandler()
+
+    async def request(path):
+        return await asgi_request(handler, path, cookie)
+    return request, lambda: None
+
+
+async def drive(request, paths, clients, seconds):
+    for path in paths:
+        status = await request(path)
+        if status != 200:
+            raise AssertionError(f"{path}: HTTP {status}")
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(index):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.perf_counter()
+            status = await request(path)
+            if status == 200:
+                latencies.append((time.perf_counter() - started) * 1000)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        **{f'p{pct}_ms': round(percentile(latencies, pct), 2) if latencies else None for pct in (50, 95, 99)},
+    }
+
+
+def run(clients=200, seconds=10.0, wsgi_threads=1, modes=MODES, log=print):
+    manager = User.objects.filter(username__startswith='bench_manager_').order_by('pk').first()
+    service = Service.objects.order_by('-rating_count').first()
+    order = Order.objects.filter(building_id=manager.managed_building_id).order_by('-created_at').first()
+    cookie = session_cookie(manager)
+    paths = endpoints(service.pk, order.pk)
+
+    results = {}
+    for mode in modes:
+        request, close = request_function(mode, cookie, wsgi_threads)
+        try:
+            results[mode] = asyncio.run(drive(request, paths[mode], clients, seconds))
+        finally:
+            close()
+        log(format_row(mode, results[mode]))
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'clients': clients,
+            'seconds': seconds,
+            'wsgi_threads': wsgi_threads,
+        },
+        'results': results,
+    }
+
+
+def format_row(mode, result):
+    return (f"{mode:<12} {result['requests_per_second']:>8.1f} req/s  p50 {result['p50_ms'] or 0:>9.2f} ms  "
+            f"p95 {result['p95_ms'] or 0:>9.2f} ms  p99 {result['p99_ms'] or 0:>9.2f} ms  "
+            f"{result['errors']} ката  x{result['requests']}")
+
+
+def compare(old, new):
+    lines = []
+    for mode, result in new['results'].items():
+        before = old['results'].get(mode, {}).get('requests_per_second')
+        if not before:
+            lines.append(f"{mode:<12} (салыштырууга маалымат жок)")
+            continue
+        change = (result['requests_per_second'] - before) / before * 100
+        lines.append(f"{mode:<12} {before:.1f} -> {result['requests_per_second']:.1f} req/s ({change:+.0f}%)")
+    return lines
@@ -0,0 +1,139 @@
+import random
+from contextlib import contextmanager
+from datetime import time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from config.models import Building, Category, Order, OrderHistory, Review, Service, User
+from config.reports import rebuild_rollups
+from config.search import get_search_backend
+
+
+# =========================================================
+# БЕНЧМАРК ҮЧҮН МААЛЫМАТ
+# =========================================================
+# Бардык жазуулар bulk_create менен, BATCH_SIZE боюнча түзүлөт; сигналдар
+# иштебейт, ошондуктан рейтинг, отчёттор жана издөө индекси аягында бир
+# жолу кайра эсептелет. Колдонуучулардын аты "bench_" менен башталат.
+
+BATCH_SIZE = 5000
+PASSWORD = 'bench12345'
+
+# Статус -> (үлүшү, NEW'ден баштап өткөн жолу)
+STATUS_PATHS = {
+    'NEW': (10, ['NEW']),
+    'WAITING_PAYMENT': (10, ['NEW', 'WAITING_PAYMENT']),
+    'PAID': (15, ['NEW', 'WAITING_PAYMENT', 'PAID']),
+    'IN_PROGRESS': (15, ['NEW', 'PAID', 'IN_PROGRESS']),
+    'DONE': (40, ['NEW', 'PAID', 'IN_PROGRESS', 'DONE']),
+    'CANCELLED': (10, ['NEW', 'CANCELLED']),
+}
+
+DEFAULT_VOLUMES = {
+    'buildings': 20,
+    'categories': 12,
+    'services': 300,
+    'clients': 2000,
+    'reviews': 20000,
+    'orders': 1000000,
+}
+
+
+def batched(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def explicit_created_dates():
+    """auto_now_add'ты убактылуу өчүрөт: created_at/change_date бир жылга чачырайт."""
+    fields = [Order._meta.get_field('created_at'), OrderHistory._meta.get_field('change_date'),
+              Review._meta.get_field('created_at')]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def has_data(volumes):
+    return Order.objects.count() >= volumes['orders'] and User.objects.filter(username='bench_admin').exists()
+
+
+def generate(volumes=None, seed=42, log=print):
+    volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(PASSWORD)
+
+    def past(days=365):
+        return now - timedelta(seconds=rng.randrange(days * 24 * 3600))
+
+    with transaction.atomic():
+        buildings = Building.objects.bulk_create(
+            Building(name=f"Имарат {i}", address=f"Бишкек, {i}-көчө") for i in range(volumes['buildings']))
+        categories = Category.objects.bulk_create(
+            Category(name=f"Категория {i}") for i in range(volumes['categories']))
+        services = Service.objects.bulk_create(
+            Service(building=rng.choice(buildings), category=rng.choice(categories),
+                    name=f"Кызмат {i}", description=f"Кызмат {i} боюнча толук сүрөттөмө " * 5,
+                    price=Decimal(rng.randrange(200, 20000, 50)))
+            for i in range(volumes['services']))
+        User.objects.bulk_create([
+            User(username='bench_admin', password=password, role='ADMIN'),
+            *(User(username=f'bench_manager_{b.pk}', password=password, role='MANAGER', managed_building=b)
+              for b in buildings),
+        ])
+        clients = User.objects.bulk_create(
+            User(username=f'bench_user_{i}', password=password, role='USER') for i in range(volumes['clients']))
+    log(f"каталог: {len(buildings)} имарат, {len(services)} кызмат, {len(clients)} кардар")
+
+    with explicit_created_dates():
+        for batch in batched(Review(service=rng.choice(services), user=rng.choice(clients),
+                                    rating=rng.choices(range(1, 6), weights=(1, 1, 3, 6, 9))[0],
+                                    comment="Жакшы кызмат", created_at=past())
+                             for _ in range(volumes['reviews'])):
+            Review.objects.bulk_create(batch)
+        log(f"пикирлер: {volumes['reviews']}")
+
+        statuses = list(STATUS_PATHS)
+        weights = [share for share, _ in STATUS_PATHS.values()]
+        created = 0
+        for size in (min(BATCH_SIZE, volumes['orders'] - start) for start in range(0, volumes['orders'], BATCH_SIZE)):
+            orders = []
+            for _ in range(size):
+                service = rng.choice(services)
+                created_at = past()
+                orders.append(Order(
+                    user=rng.choice(clients), service=service, building_id=service.building_id,
+                    total_price=service.price, prepayment_amount=service.price * Decimal('0.10'),
+                    date=(created_at + timedelta(days=rng.randrange(1, 14))).date(),
+                    time=time(rng.randrange(9, 19)), status=rng.choices(statuses, weights)[0],
+                    created_at=created_at,
+                ))
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                OrderHistory.objects.bulk_create(
+                    OrderHistory(order_id=order.pk, old_status=old, new_status=new,
+                                 change_date=order.created_at + timedelta(hours=step + 1))
+                    for order in orders
+                    for step, (old, new) in enumerate(zip(STATUS_PATHS[order.status][1],
+                                                          STATUS_PATHS[order.status][1][1:]))
+                )
+            created += size
+            if created % (BATCH_SIZE * 20) == 0 or created == volumes['orders']:
+                log(f"заказдар: {created}/{volumes['orders']}")
+
+    with transaction.atomic():
+        Service.rebuild_ratings()
+        rebuild_rollups()
+        get_search_backend().rebuild()
+    log("рейтинг, отчёттор жана издөө индекси кайра эсептелди")
+    return volumes
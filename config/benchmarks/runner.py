@@ -0,0 +1,191 @@
+import json
+import platform
+import time
+
+import django
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from config.models import Building, Order, Service, User
+
+
+# =========================================================
+# БЕНЧМАРК СЦЕНАРИЙЛЕРИ
+# =========================================================
+# Ар бир сценарий Django test client менен (тармаксыз) аткарылат:
+# биринчи сурам сурамдарды санайт (CaptureQueriesContext), калгандары
+# CaptureQueriesContext'сиз убакытты гана өлчөйт. Сценарий `iterations`
+# жолу же `max_seconds` бүткөнчө кайталанат (эң аз дегенде бир жолу).
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Scenario:
+    def __init__(self, name, role, url, method='get', data=None, setup=None, expected=200):
+        self.name = name
+        self.role = role
+        self.url = url            # str же callable(context) -> str
+        self.method = method
+        self.data = data
+        self.setup = setup        # callable(context) — ар бир кайталоонун алдында, убакытка кирбейт
+        self.expected = expected
+
+    def request(self, client, context):
+        url = self.url(context) if callable(self.url) else self.url
+        if self.method == 'get':
+            return client.get(url, self.data)
+        return client.generic(self.method.upper(), url, json.dumps(self.data or {}),
+                              content_type='application/json')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def next_new_order(context):
+    # Статусун өзгөртүү үчүн: менеджердин имаратындагы NEW заказдар кезек менен
+    context['order_pk'] = next(context['new_orders'])
+
+
+def build_context():
+    service = Service.objects.order_by('-rating_count').first()
+    manager = User.objects.filter(username__startswith='bench_manager_').order_by('pk').first()
+    new_orders = iter(Order.objects.filter(building_id=manager.managed_building_id, status='NEW')
+                      .order_by('-pk').values_list('pk', flat=True))
+    return {
+        'users': {
+            'ADMIN': User.objects.get(username='bench_admin'),
+            'MANAGER': manager,
+            'USER': User.objects.filter(role='USER', username__startswith='bench_user_').order_by('pk').first(),
+        },
+        'service': service,
+        'new_orders': new_orders,
+    }
+
+
+def default_scenarios():
+    clear_cache = lambda context: cache.clear()  # noqa: E731
+    scenarios = [
+        Scenario('home', 'USER', reverse('home')),
+        Scenario('home (cold cache)', 'USER', reverse('home'), setup=clear_cache),
+        Scenario('home search', 'USER', reverse('home'), data={'q': 'кызмат 1'}),
+        Scenario('service_detail', 'USER', lambda c: reverse('service_detail', args=[c['service'].pk])),
+        Scenario('service_detail (cold cache)', 'USER', lambda c: reverse('service_detail', args=[c['service'].pk]),
+                 setup=clear_cache),
+    ]
+    for role in ('ADMIN', 'MANAGER', 'USER'):
+        scenarios.append(Scenario(f'dashboard [{role}]', role, reverse('dashboard')))
+    for role in ('ADMIN', 'MANAGER', 'USER'):
+        scenarios.append(Scenario(f'api orders [{role}]', role, reverse('order-list')))
+    scenarios += [
+        Scenario('api services', 'USER', reverse('service-list')),
+        Scenario('api services ?ordering=-rating_avg', 'USER', reverse('service-list'),
+                 data={'ordering': '-rating_avg'}),
+        Scenario('status update (html)', 'MANAGER',
+                 lambda c: reverse('update_status', args=[c['order_pk'], 'WAITING_PAYMENT']),
+                 setup=next_new_order, expected=302),
+        Scenario('status update (api)', 'MANAGER', lambda c: reverse('order-detail', args=[c['order_pk']]),
+                 method='patch', data={'status': 'IN_PROGRESS'}, setup=next_new_order),
+    ]
+    return scenarios
+
+
+def run_scenario(scenario, client, context, iterations=20, max_seconds=30.0):
+    timings = []
+    queries = None
+    started = time.perf_counter()
+    for i in range(iterations):
+        if scenario.setup:
+            try:
+                scenario.setup(context)
+            except StopIteration:
+                break
+        if queries is None:
+            with CaptureQueriesContext(connection) as captured:
+                t0 = time.perf_counter()
+                response = scenario.request(client, context)
+                elapsed = time.perf_counter() - t0
+            queries = len(captured)
+        else:
+            t0 = time.perf_counter()
+            response = scenario.request(client, context)
+            elapsed = time.perf_counter() - t0
+        if response.status_code != scenario.expected:
+            raise AssertionError(f"{scenario.name}: HTTP {response.status_code} (күтүлгөн {scenario.expected})")
+        if response.streaming:
+            b''.join(response.streaming_content)
+        timings.append(elapsed * 1000)
+        if time.perf_counter() - started > max_seconds:
+            break
+    if not timings:
+        return {'iterations': 0}
+    return {
+        'iterations': len(timings),
+        'queries': queries,
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'max_ms': round(max(timings), 2),
+        **{f'p{pct}_ms': round(percentile(timings, pct), 2) for pct in PERCENTILES},
+    }
+
+
+def run(scenarios=None, iterations=20, max_seconds=30.0, only=None, log=print):
+    scenarios = scenarios or default_scenarios()
+    if only:
+        scenarios = [s for s in scenarios if any(part in s.name for part in only)]
+    context = build_context()
+    clients = {}
+    for role, user in context['users'].items():
+        clients[role] = Client()
+        clients[role].force_login(user)
+
+    results = {}
+    for scenario in scenarios:
+        client = clients[scenario.role]
+        # Кэш жылуу болушу үчүн бир жолу (өлчөнбөйт), өзгөртүүчү сценарийлерден башка
+        if scenario.method == 'get' and scenario.setup is None:
+            scenario.request(client, context)
+        results[scenario.name] = run_scenario(scenario, client, context, iterations, max_seconds)
+        log(format_row(scenario.name, results[scenario.name]))
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'orders': Order.objects.count(),
+            'services': Service.objects.count(),
+            'buildings': Building.objects.count(),
+            'iterations': iterations,
+        },
+        'results': results,
+    }
+
+
+def format_row(name, result):
+    if not result.get('iterations'):
+        return f"{name:<40} (аткарылган жок)"
+    return (f"{name:<40} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+            f"p99 {result['p99_ms']:>9.2f} ms  {result['queries']:>3} сурам  x{result['iterations']}")
+
+
+def compare(old, new):
+    """Эки натыйжанын p50/p95 жана сурамдарынын айырмасы (текст саптары)."""
+    lines = []
+    for name, result in new['results'].items():
+        before = old['results'].get(name)
+        if not before or not before.get('iterations') or not result.get('iterations'):
+            lines.append(f"{name:<40} (салыштырууга маалымат жок)")
+            continue
+        parts = []
+        for key in ('p50_ms', 'p95_ms'):
+            change = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            parts.append(f"{key[:-3]} {before[key]:.2f} -> {result[key]:.2f} ms ({change:+.0f}%)")
+        parts.append(f"сурам {before['queries']} -> {result['queries']}")
+        lines.append(f"{name:<40} " + "  ".join(parts))
+    return lines
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .metrics import CACHE_REQUESTS
+from .routers import replicas, sticky_seconds, use_primary
+
+
+# =========================================================
+# КАТАЛОГДУН КЭШИ (версиялуу ачкычтар)
+# =========================================================
+# Бардык ачкычтар "catalog:v<N>:..." түрүндө. Service/Category/Building/Review
+# өзгөргөндө signals.py версияны көбөйтөт, эски жазуулар эч качан окулбайт
+# жана TIMEOUT менен өзү өчөт. Бир нече worker болсо, CACHES'ти бөлүшүлгөн
+# (Redis/файл) бэкендге коюу керек, анткени версия ошол кэште сакталат.
+
+VERSION_KEY = 'catalog:version'
+# Реплика колдонулса: өзгөртүүдөн кийин REPLICA_STICKY_SECONDS бою кэш
+# негизги базадан толтурулат, репликанын эски маалыматы кэштелбеши үчүн
+CHANGED_KEY = 'catalog:recently-changed'
+
+
+def catalog_timeout():
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 600)
+
+
+def catalog_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # add() атомдук: бир эле учурда келген сурамдар бир версияда калат
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 2, None)
+    if replicas():
+        cache.set(CHANGED_KEY, True, sticky_seconds())
+
+
+def invalidate_catalog():
+    # Азыр көбөйтөбүз (ушул транзакциядагы окуулар үчүн) жана commit'тен кийин
+    # дагы бир жолу: commit'ке чейин эски маалыматты окуп кэштеген сурам
+    # ошондо гана эскирген версияда калат.
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version)
+
+
+def catalog_key(name):
+    return f'catalog:v{catalog_version()}:{name}'
+
+
+def cached_catalog(name, builder):
+    """`builder()` натыйжасын учурдагы каталог версиясы боюнча кэштейт."""
+    key = catalog_key(name)
+    value = cache.get(key)
+    if value is None:
+        CACHE_REQUESTS.inc(cache='catalog', result='miss')
+        if replicas() and cache.get(CHANGED_KEY):
+            with use_primary():
+                value = builder()
+        else:
+            value = builder()
+        cache.set(key, value, catalog_timeout())
+    else:
+        CACHE_REQUESTS.inc(cache='catalog', result='hit')
+    return value
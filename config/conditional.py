@@ -0,0 +1,59 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+# =========================================================
+# ШАРТТУУ GET (ETag / Last-Modified)
+# =========================================================
+# Каталог endpoint'тери үчүн: ETag max(updated_at) + саптардын санынан
+# бир агрегат сурам менен эсептелет. If-None-Match / If-Modified-Since
+# дал келсе, 304 кайтарылат жана serializer такыр иштебейт.
+#
+# Тизмелер Last-Modified жөнөтпөйт: сап өчүрүлгөндө max(updated_at)
+# өзгөрбөйт, If-Modified-Since гана жөнөткөн клиент эски 304 алмак.
+# Тизменин ETag'ы саптардын санын камтыйт, ошондуктан өчүрүүнү сезет.
+
+def _etag(request, *parts):
+    # Жооп query параметрлерге (курсор, ordering) жана форматка жараша өзгөрөт
+    raw = '|'.join(str(part) for part in (request.get_full_path(), *parts))
+    return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    updated_field = 'updated_at'
+
+    def _conditional(self, request, last_modified, *parts):
+        etag = _etag(request, request.accepted_renderer.format, self.get_queryset().model._meta.label,
+                     last_modified, *parts)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        return not_modified, etag, timestamp
+
+    def _finalize(self, response, etag, timestamp):
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last=Max(self.updated_field), count=Count('pk'))
+        not_modified, etag, timestamp = self._conditional(request, None, state['last'], state['count'])
+        if not_modified is not None:
+            return not_modified
+        return self._finalize(super().list(request, *args, **kwargs), etag, timestamp)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        row = self.get_queryset().filter(**{self.lookup_field: kwargs[lookup]}).values_list(
+            self.updated_field, flat=True).first()
+        if row is None:
+            return super().retrieve(request, *args, **kwargs)  # 404
+        not_modified, etag, timestamp = self._conditional(request, row)
+        if not_modified is not None:
+            return not_modified
+        return self._finalize(super().retrieve(request, *args, **kwargs), etag, timestamp)
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+# =========================================================
+# ЗАКАЗДЫН СТАТУСУНУН ОКУЯЛАРЫ (SSE үчүн broker)
+# =========================================================
+# workflow.transition / bulk_update_status транзакция commit болгондон
+# кийин окуяларды broker'ге жарыялайт; /orders/events/ (ASGI) аларды
+# жазылуучуларга Server-Sent Events катары жөнөтөт.
+#
+# Жазылуу dashboard() сыяктуу чектелет: ADMIN — баары, MANAGER — өз
+# имараты, USER — өз заказдары. Жазылуучулар ушул ачкыч боюнча
+# сакталат, ошондуктан бир окуя бардык байланыштарды эмес, үч топту гана
+# карайт. Күтүп турган байланыш — бир корутина жана бир asyncio.Queue
+# (thread жок), миңдеген байланыш арзан.
+#
+# InProcessBroker бир процесстин ичинде гана иштейт: бир нече worker
+# болсо, ORDER_EVENTS['BROKER']'ге жалпы broker (мисалы Redis pub/sub
+# менен) жазып, subscribe/publish'ти ушул интерфейс менен ишке ашырыңыз.
+
+DEFAULTS = {
+    'ENABLED': False,     # ASGI деплойдо гана күйгүзүңүз (WSGI'де стрим worker'ди ээлейт)
+    'BROKER': 'config.events.InProcessBroker',
+    'KEEPALIVE': 20,      # секунд: прокси байланышты жаап салбашы үчүн комментарий сабы
+    'QUEUE_SIZE': 100,    # жазылуучу окубай калса — "reload" окуясы
+    'RETRY_MS': 5000,
+}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def events_settings():
+    return {**DEFAULTS, **getattr(settings, 'ORDER_EVENTS', {})}
+
+
+def events_enabled():
+    return bool(events_settings()['ENABLED'])
+
+
+def scope_for(user):
+    """dashboard() менен бирдей чек: ('all',), ('building', id) же ('user', id)."""
+    if user.role == 'ADMIN' or user.is_staff:
+        return ('all',)
+    if user.role == 'MANAGER':
+        return ('building', user.managed_building_id)
+    return ('user', user.pk)
+
+
+def event_scopes(event):
+    return [('all',), ('building', event['building_id']), ('user', event['user_id'])]
+
+
+class Subscription:
+    def __init__(self, broker, scope, order_id=None, queue_size=DEFAULTS['QUEUE_SIZE']):
+        self.broker = broker
+        self.scope = scope
+        self.order_id = order_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def deliver(self, event):
+        # Дайыма subscription'дун event loop'унда чакырылат
+        if self.order_id is not None and event['order'] != self.order_id:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    def __init__(self):
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, scope, order_id=None):
+        """Учурдагы event loop'ко байланган Subscription."""
+        subscription = Subscription(self, scope, order_id, events_settings()['QUEUE_SIZE'])
+        with self.lock:
+            self.subscribers.setdefault(scope, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            group = self.subscribers.get(subscription.scope)
+            if group is not None:
+                group.discard(subscription)
+                if not group:
+                    del self.subscribers[subscription.scope]
+
+    def count(self):
+        with self.lock:
+            return sum(len(group) for group in self.subscribers.values())
+
+    def publish(self, events):
+        """Каалаган thread'тен чакырса болот."""
+        with self.lock:
+            targets = [(subscription, event) for event in events for scope in event_scopes(event)
+                       for subscription in self.subscribers.get(scope, ())]
+        for subscription, event in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Loop жабылып калган (байланыш үзүлгөн) — кийинки close() өчүрөт
+                pass
+
+
+def get_broker():
+    global _broker
+    path = events_settings()['BROKER']
+    with _broker_lock:
+        if _broker is None or _broker.__class__ is not import_string(path):
+            _broker = import_string(path)()
+        return _broker
+
+
+def status_event(order_id, user_id, building_id, old_status, new_status, changed_at=None):
+    from .models import Order
+    return {
+        'order': order_id,
+        'old_status': old_status,
+        'status': new_status,
+        'status_label': str(dict(Order.STATUS_CHOICES).get(new_status, new_status)),
+        'user_id': user_id,
+        'building_id': building_id,
+        'changed_at': (changed_at or timezone.now()).isoformat(),
+    }
+
+
+def publish_on_commit(events):
+    """Транзакция ийгиликтүү бүткөндө гана жарыялайт (артка кайтса — эч нерсе)."""
+    if events:
+        transaction.on_commit(lambda: get_broker().publish(events))
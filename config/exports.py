@@ -0,0 +1,110 @@
+import csv
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Order, OrderHistory
+from .routers import read_alias
+
+
+# =========================================================
+# ЗАКАЗДАРДЫ АГЫМ МЕНЕН ЭКСПОРТТОО (CSV / JSON Lines)
+# =========================================================
+# Саптар values_list(...).iterator(chunk_size=...) менен окулат: моделдин
+# объектилери түзүлбөйт, JOIN'дер бир сурамда, эс тутумда бир эле chunk
+# турат. Натыйжа генератор — StreamingHttpResponse же файлга жазылат,
+# ошондуктан миң сап менен он миллион саптын айырмасы убакытта гана.
+
+CHUNK_SIZE = 2000
+FORMATS = ('csv', 'jsonl')
+
+# (колонканын аты, ORM жолу)
+ORDER_COLUMNS = (
+    ('id', 'pk'),
+    ('created_at', 'created_at'),
+    ('date', 'date'),
+    ('time', 'time'),
+    ('status', 'status'),
+    ('client', 'user__username'),
+    ('client_phone', 'user__phone'),
+    ('service', 'service__name'),
+    ('category', 'service__category__name'),
+    ('building', 'building__name'),
+    ('total_price', 'total_price'),
+    ('prepayment_amount', 'prepayment_amount'),
+    ('comment', 'comment'),
+)
+HISTORY_COLUMNS = (
+    ('id', 'pk'),
+    ('order_id', 'order_id'),
+    ('change_date', 'change_date'),
+    ('old_status', 'old_status'),
+    ('new_status', 'new_status'),
+    ('changed_by', 'changed_by__username'),
+    ('building', 'order__building__name'),
+    ('service', 'order__service__name'),
+)
+EXPORTS = {
+    # kind -> (модель, колонкалар, күн талаасы, имарат талаасы)
+    'orders': (Order, ORDER_COLUMNS, 'created_at', 'building_id'),
+    'history': (OrderHistory, HISTORY_COLUMNS, 'change_date', 'order__building_id'),
+}
+
+
+def export_rows(kind, start=None, end=None, building_id=None, chunk_size=CHUNK_SIZE):
+    """Тандалган саптарды tuple катары бирден берет (колонкалар EXPORTS боюнча)."""
+    model, columns, date_field, building_field = EXPORTS[kind]
+    # Бухгалтерия үчүн бир нече секунд кечиккен реплика жетиштүү
+    queryset = model.objects.using(read_alias())
+    if start:
+        queryset = queryset.filter(**{f'{date_field}__date__gte': start})
+    if end:
+        queryset = queryset.filter(**{f'{date_field}__date__lte': end})
+    if building_id is not None:
+        queryset = queryset.filter(**{building_field: building_id})
+    # pk боюнча: индекс колдонулат жана эки экспорт бирдей иретте болот
+    queryset = queryset.order_by('pk').values_list(*(path for _, path in columns))
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def export_headers(kind):
+    return [name for name, _ in EXPORTS[kind][1]]
+
+
+def _cell(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    return value
+
+
+class _Echo:
+    """csv.writer үчүн буфер: жазылган сапты сактабай кайтарат."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_cell(value) for value in row])
+
+
+def iter_jsonl(headers, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(headers, (_cell(value) for value in row)))) + '\n'
+
+
+def stream_export(kind, fmt, **filters):
+    if fmt not in FORMATS:
+        raise ValueError(f"Белгисиз формат: {fmt}")
+    headers = export_headers(kind)
+    rows = export_rows(kind, **filters)
+    return iter_csv(headers, rows) if fmt == 'csv' else iter_jsonl(headers, rows)
+
+
+def content_type(fmt):
+    return 'text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson; charset=utf-8'
@@ -0,0 +1,273 @@
+import csv
+import json
+import logging
+import os
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import DatabaseError, transaction
+
+from .caching import invalidate_catalog
+from .models import Building, Category, Client, Service
+from .search import get_search_backend
+from .thumbnails import generate_renditions
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# КАТАЛОГДУ ФАЙЛДАН ИМПОРТТОО (CSV / JSON Lines)
+# =========================================================
+# Саптар CHUNK_SIZE боюнча топтолот. Ар бир топ: Python'до текшерүү
+# (full_clean), табигый ачкыч боюнча бар жазуулардын pk'сын бир SELECT
+# менен табуу, анан бир транзакцияда
+# bulk_create(update_conflicts=True, unique_fields=['id']) — жаңылар
+# кошулат, барлары жаңыртылат. Ката кеткен сап өткөрүлүп, анын номери
+# жана себеби отчётко жазылат; файлдын калганы импорттоло берет.
+#
+# bulk_create сигнал жибербейт, ошондуктан издөө индекси, каталогдун
+# кэши жана сүрөттөрдүн варианттары ар бир топтон кийин кол менен жаңыланат.
+
+CHUNK_SIZE = 1000
+
+
+def read_rows(path, fmt=None):
+    """(сап номери, dict) жуптарын берет. Формат файлдын кеңейтүүсүнөн аныкталат."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if fmt == 'csv':
+            # 1-сап — баш сап
+            for lineno, row in enumerate(csv.DictReader(f), start=2):
+                yield lineno, {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        elif fmt in ('jsonl', 'ndjson'):
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    yield lineno, exc
+                    continue
+                yield lineno, row if isinstance(row, dict) else ValueError("JSON объект күтүлгөн")
+        else:
+            raise ValueError(f"Белгисиз формат: {fmt} (csv же jsonl)")
+
+
+def _error_text(exc):
+    if isinstance(exc, ValidationError) and hasattr(exc, 'message_dict'):
+        return "; ".join(f"{field}: {' '.join(errors)}" for field, errors in exc.message_dict.items())
+    if isinstance(exc, ValidationError):
+        return " ".join(exc.messages)
+    return str(exc)
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.errors = []  # [(сап номери, себеби), ...]
+
+    def error(self, lineno, exc):
+        self.errors.append((lineno, _error_text(exc)))
+
+
+class CatalogImporter:
+    model = None
+    key_fields = ()     # табигый ачкыч (файлда id жок)
+    fields = ()         # файлдан окулуучу жөнөкөй талаалар
+    image_field = None
+
+    def __init__(self, images_dir=None, chunk_size=CHUNK_SIZE, dry_run=False):
+        self.images_dir = images_dir or os.getcwd()
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+
+    # --- бир сап ---
+
+    def build(self, row):
+        """Саптан сакталбаган объект; ката болсо ValidationError."""
+        obj = self.model(**{name: row[name] for name in self.fields if row.get(name) not in (None, '')})
+        self.resolve(obj, row)
+        # resolve() байланыштарды алдын ала окулган сөздүктөрдөн текшерди; full_clean
+        # аларды кайра текшерсе ар бир сап үчүн ар бир FK'га бир SELECT кетмек
+        exclude = [*self.relation_fields(), *([self.image_field] if self.image_field else [])]
+        obj.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+        return obj
+
+    def resolve(self, obj, row):
+        pass
+
+    def key(self, obj):
+        return tuple(getattr(obj, self.model._meta.get_field(name).attname) for name in self.key_fields)
+
+    def attach_image(self, obj, row):
+        path = row.get('image')
+        if not self.image_field or not path:
+            return False
+        full_path = os.path.join(self.images_dir, path)
+        if not os.path.isfile(full_path):
+            raise ValidationError({'image': [f"Файл табылган жок: {path}"]})
+        field_file = getattr(obj, self.image_field)
+        with open(full_path, 'rb') as f:
+            # HashedMediaStorage: бирдей сүрөт бир гана жолу сакталат
+            field_file.save(os.path.basename(path), File(f), save=False)
+        return True
+
+    # --- топ ---
+
+    def existing_pks(self, keys):
+        attnames = [self.model._meta.get_field(name).attname for name in self.key_fields]
+        lookup = {f'{attnames[0]}__in': {key[0] for key in keys}}
+        pks = {}
+        for row in self.model.objects.filter(**lookup).order_by('-pk').values_list(*attnames, 'pk'):
+            pks[tuple(row[:-1])] = row[-1]  # дубликаттар болсо эң кичине pk
+        return pks
+
+    def update_fields(self, columns):
+        names = [name for name in self.fields + self.relation_fields() if name in columns]
+        if self.image_field and 'image' in columns:
+            names.append(self.image_field)
+        if any(field.name == 'updated_at' for field in self.model._meta.concrete_fields):
+            names.append('updated_at')
+        return [name for name in names if name not in self.key_fields] or list(self.key_fields)
+
+    def relation_fields(self):
+        return ()
+
+    def import_chunk(self, rows, result):
+        columns = set()
+        objects = {}  # ачкыч -> (сап номери, объект, сап); файлдагы кийинки сап жеңет
+        for lineno, row in rows:
+            if isinstance(row, Exception):
+                result.error(lineno, row)
+                continue
+            try:
+                obj = self.build(row)
+            except (ValidationError, ValueError, TypeError) as exc:
+                result.error(lineno, exc)
+                continue
+            columns.update(row)
+            objects[self.key(obj)] = (lineno, obj, row)
+        if not objects:
+            return
+
+        pks = self.existing_pks(objects)
+        valid = []
+        for key, (lineno, obj, row) in objects.items():
+            obj.pk = pks.get(key)
+            if not self.dry_run:
+                try:
+                    obj._image_attached = self.attach_image(obj, row)
+                except (ValidationError, OSError) as exc:
+                    result.error(lineno, exc)
+                    continue
+            valid.append((lineno, obj))
+        # bulk_create'тен кийин баарында pk болот, ошондуктан азыр санайбыз
+        updated = sum(1 for _, obj in valid if obj.pk is not None)
+        if self.dry_run or not valid:
+            result.created += len(valid) - updated
+            result.updated += updated
+            return
+
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(
+                    [obj for _, obj in valid], batch_size=500, update_conflicts=True,
+                    unique_fields=['id'], update_fields=self.update_fields(columns),
+                )
+                self.after_chunk([obj for _, obj in valid])
+        except DatabaseError as exc:
+            for lineno, _ in valid:
+                result.error(lineno, exc)
+            return
+        result.created += len(valid) - updated
+        result.updated += updated
+        for _, obj in valid:
+            if getattr(obj, '_image_attached', False):
+                image = getattr(obj, self.image_field)
+                try:
+                    generate_renditions(image)
+                except (OSError, ValueError):
+                    logger.warning("Сүрөттүн варианттары түзүлгөн жок: %s", image.name, exc_info=True)
+
+    def after_chunk(self, objects):
+        pass
+
+    def run(self, rows):
+        result = ImportResult()
+        chunk = []
+        for item in rows:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk, result)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk, result)
+        return result
+
+
+class BuildingImporter(CatalogImporter):
+    model = Building
+    key_fields = ('name',)
+    fields = ('name', 'address')
+    image_field = 'image'
+
+    def after_chunk(self, objects):
+        invalidate_catalog()
+
+
+class ServiceImporter(CatalogImporter):
+    """building — имараттын аты же id'си; category — категориянын аты (милдеттүү эмес)."""
+    model = Service
+    key_fields = ('building', 'name')
+    fields = ('name', 'description', 'price')
+    image_field = 'image'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buildings = dict(Building.objects.values_list('name', 'pk'))
+        self.building_ids = set(self.buildings.values())
+        self.categories = dict(Category.objects.values_list('name', 'pk'))
+
+    def relation_fields(self):
+        return ('building', 'category')
+
+    def resolve(self, obj, row):
+        building = str(row.get('building') or '').strip()
+        if building.isdigit() and int(building) in self.building_ids:
+            obj.building_id = int(building)
+        elif building in self.buildings:
+            obj.building_id = self.buildings[building]
+        else:
+            raise ValidationError({'building': [f"Имарат табылган жок: {building or '—'}"]})
+        category = str(row.get('category') or '').strip()
+        if category:
+            if category not in self.categories:
+                raise ValidationError({'category': [f"Категория табылган жок: {category}"]})
+            obj.category_id = self.categories[category]
+
+    def existing_pks(self, keys):
+        pks = {}
+        names = {name for _, name in keys}
+        for building_id, name, pk in (Service.objects.filter(building_id__in={b for b, _ in keys}, name__in=names)
+                                      .order_by('-pk').values_list('building_id', 'name', 'pk')):
+            pks[(building_id, name)] = pk
+        return pks
+
+    def after_chunk(self, objects):
+        # bulk_create'тен кийин SQLite'та жаңы саптардын pk'сы бар (RETURNING)
+        get_search_backend().index([obj.pk for obj in objects if obj.pk])
+        invalidate_catalog()
+
+
+class ClientImporter(CatalogImporter):
+    model = Client
+    key_fields = ('phone',)
+    fields = ('first_name', 'last_name', 'phone', 'email')
+
+
+IMPORTERS = {
+    'buildings': BuildingImporter,
+    'services': ServiceImporter,
+    'clients': ClientImporter,
+}
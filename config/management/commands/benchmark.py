@@ -0,0 +1,68 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from config.benchmarks import concurrency, data, runner
+
+
+class Command(BaseCommand):
+    help = ("home, service_detail, dashboard, API жана статус өзгөртүүнүн убактысын өлчөйт. "
+            "Өзүнчө SQLite базасында иштейт, негизги базага тийбейт.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--db', default='benchmark.sqlite3',
+                            help="Бенчмарктын базасы (--keepdb менен кайра колдонулат)")
+        parser.add_argument('--keepdb', action='store_true', help="Базаны жана түзүлгөн маалыматты сактоо")
+        for name, default in data.DEFAULT_VOLUMES.items():
+            parser.add_argument(f'--{name}', type=int, default=default)
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--max-seconds', type=float, default=30.0, help="Бир сценарийдин убакыт чеги")
+        parser.add_argument('--only', action='append', help="Аталышында ушул сөз бар сценарийлер гана")
+        parser.add_argument('-o', '--output', help="Натыйжаны JSON файлга жазуу")
+        parser.add_argument('--compare', help="Мурунку JSON натыйжа менен салыштыруу")
+        parser.add_argument('--concurrency', type=int, metavar='CLIENTS',
+                            help="Сценарийлердин ордуна WSGI/ASGI өткөрүмдүүлүгү ушунча клиент менен")
+        parser.add_argument('--duration', type=float, default=10.0, help="--concurrency: бир режимдин секунду")
+        parser.add_argument('--wsgi-threads', type=int, default=1, help="--concurrency: WSGI worker'дин thread'тери")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("Бенчмарк SQLite менен гана иштейт")
+        previous = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                previous = json.load(f)
+
+        volumes = {name: options[name] for name in data.DEFAULT_VOLUMES}
+        settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = os.path.abspath(options['db'])
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            if data.has_data(volumes):
+                self.stdout.write(f"Мурунку маалымат колдонулат: {options['db']}")
+            else:
+                if options['keepdb']:
+                    connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=False)
+                    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+                data.generate(volumes, log=self.stdout.write)
+            if options['concurrency']:
+                result = concurrency.run(clients=options['concurrency'], seconds=options['duration'],
+                                         wsgi_threads=options['wsgi_threads'], log=self.stdout.write)
+            else:
+                result = runner.run(iterations=options['iterations'], max_seconds=options['max_seconds'],
+                                    only=options['only'], log=self.stdout.write)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Натыйжа сакталды: {options['output']}"))
+        if previous:
+            compare = concurrency.compare if options['concurrency'] else runner.compare
+            self.stdout.write("\n" + "\n".join(compare(previous, result)))
@@ -0,0 +1,39 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from config.assets import build, sources
+from config.models import Category
+
+
+class Command(BaseCommand):
+    help = "Шаблондордо колдонулган Tailwind класстарынан жана иконкалардан хештелген CSS түзөт (CDN'сиз)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(settings.STATICFILES_DIRS[0]),
+                            help="static папкасы (css/, fonts/ жана css/manifest.json ушул жерге жазылат)")
+        parser.add_argument('--fontawesome', default=os.environ.get('FONTAWESOME_DIR', ''),
+                            help="Font Awesome Free 6 папкасы (css/all.css же all.min.css жана webfonts/*.woff2)")
+        parser.add_argument('--icon', action='append', default=[],
+                            help="Шаблондо жок иконка (fa-...), бир нече жолу; Category.icon'дун маанилери өзү кошулат")
+
+    def handle(self, *args, **options):
+        fontawesome = options['fontawesome']
+        if fontawesome and not any(Path(fontawesome, 'css', name).is_file() for name in ('all.css', 'all.min.css')):
+            raise CommandError(f"{fontawesome}: css/all.css табылган жок")
+
+        # Категориялардын иконкалары шаблондо эмес, базада ({{ service.category.icon }})
+        icons = set(options['icon']) | {Category._meta.get_field('icon').default}
+        try:
+            icons.update(Category.objects.exclude(icon='').values_list('icon', flat=True).distinct())
+        except DatabaseError:
+            pass
+
+        entries = build(sources(settings.BASE_DIR), options['output'], fontawesome or None, icons, log=self.stdout.write)
+        if not fontawesome:
+            self.stdout.write("Font Awesome көрсөтүлгөн жок (--fontawesome / FONTAWESOME_DIR): "
+                              "мурунку курулган иконкалар калды.")
+        self.stdout.write(self.style.SUCCESS(f"{len(entries)} файл -> {options['output']}"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from config.models import Building, Category, Service
+from config.thumbnails import generate_renditions, has_renditions
+
+
+class Command(BaseCommand):
+    help = "Бар болгон сүрөттөр үчүн card/detail/admin варианттарын (WebP + JPEG) түзөт"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Бар болгон варианттарды да кайра түзүү")
+
+    def handle(self, *args, **options):
+        created = failed = 0
+        for model in (Service, Building, Category):
+            for obj in model.objects.exclude(image='').exclude(image__isnull=True).only('pk', 'image', 'image_renditions').iterator():
+                if not options['force'] and has_renditions(obj.image):
+                    continue
+                try:
+                    created += len(generate_renditions(obj.image))
+                except (OSError, ValueError) as exc:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} #{obj.pk} ({obj.image.name}): {exc}")
+        self.stdout.write(self.style.SUCCESS(f"{created} файл түзүлдү, {failed} ката."))
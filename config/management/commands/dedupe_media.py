@@ -0,0 +1,54 @@
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Now
+
+from config.caching import invalidate_catalog
+from config.models import Building, Category, Service
+from config.storage import is_hashed_name
+from config.thumbnails import generate_renditions, record_renditions, rendition_names
+
+
+class Command(BaseCommand):
+    help = "Эски медиа файлдарды мазмунунун хеши боюнча аттарга көчүрөт жана дубликаттарды өчүрөт"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Эч нерсе өзгөртпөй, болчу өзгөрүүлөрдү көрсөтүү")
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        moved = {}
+        stale = {}
+        new_files = {}
+        for model in (Service, Building, Category):
+            for obj in model.objects.exclude(image='').exclude(image__isnull=True).only('pk', 'image', 'image_renditions').iterator():
+                old = obj.image.name
+                if is_hashed_name(old) or not storage.exists(old):
+                    continue
+                if options['dry_run']:
+                    self.stdout.write(f"{model.__name__} #{obj.pk}: {old}")
+                    continue
+                if old not in moved:
+                    with storage.open(old, 'rb') as source:
+                        moved[old] = storage.save(old, File(source, name=posixpath.basename(old)))
+                model.objects.filter(pk=obj.pk).update(image=moved[old], updated_at=Now())
+                stale.setdefault(old, set()).update(obj.image_renditions)
+                obj.image.name = moved[old]
+                new_files.setdefault(moved[old], []).append(obj.image)
+
+        for old in moved:
+            for name in {old, *rendition_names(old), *stale[old]}:
+                if storage.exists(name):
+                    storage.delete(name)
+        # Бир файлды бөлүшкөн саптар: варианттар бир жолу түзүлүп, баарына жазылат
+        for first, *others in new_files.values():
+            created = generate_renditions(first)
+            for field_file in others:
+                record_renditions(field_file, created)
+        if moved:
+            invalidate_catalog()
+        unique = len(set(moved.values()))
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(moved)} файл көчүрүлдү, {len(moved) - unique} дубликат өчүрүлдү."))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from config.exports import CHUNK_SIZE, EXPORTS, FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = "Заказдарды же алардын тарыхын CSV/JSON Lines форматында агым менен экспорттойт"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', nargs='?', default='orders', choices=list(EXPORTS))
+        parser.add_argument('--format', dest='fmt', default='csv', choices=FORMATS)
+        parser.add_argument('--start', help="Биринчи күн (YYYY-MM-DD)")
+        parser.add_argument('--end', help="Акыркы күн (YYYY-MM-DD)")
+        parser.add_argument('--building', type=int, help="Бир гана имараттын заказдары")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('-o', '--output', help="Файлдын жолу; берилбесе stdout")
+
+    def handle(self, *args, **options):
+        filters = {'building_id': options['building'], 'chunk_size': options['chunk_size']}
+        for name in ('start', 'end'):
+            if options[name]:
+                filters[name] = parse_date(options[name])
+                if filters[name] is None:
+                    raise CommandError(f"--{name}: күн YYYY-MM-DD форматында болушу керек")
+        chunks = stream_export(options['kind'], options['fmt'], **filters)
+
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        rows = 0
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            for chunk in chunks:
+                output.write(chunk)
+                rows += 1
+        if options['fmt'] == 'csv':
+            rows -= 1  # баш сап
+        self.stderr.write(self.style.SUCCESS(f"{rows} сап {options['output']} файлына жазылды."))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.importing import CHUNK_SIZE, IMPORTERS, read_rows
+
+
+class Command(BaseCommand):
+    help = "Имараттарды, кызматтарды же кардарларды CSV/JSON Lines файлдан импорттойт (upsert)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(IMPORTERS))
+        parser.add_argument('path', help="CSV же JSONL файлдын жолу")
+        parser.add_argument('--format', dest='fmt', choices=('csv', 'jsonl'),
+                            help="Берилбесе файлдын кеңейтүүсүнөн аныкталат")
+        parser.add_argument('--images-dir', help="image колонкасындагы жолдор ушул папкага салыштырмалуу")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Текшерүү гана, базага жазбоо")
+
+    def handle(self, *args, **options):
+        importer = IMPORTERS[options['kind']](
+            images_dir=options['images_dir'], chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        started = time.monotonic()
+        try:
+            result = importer.run(read_rows(options['path'], options['fmt']))
+        except (OSError, ValueError) as exc:
+            raise CommandError(exc)
+
+        for lineno, message in result.errors:
+            self.stderr.write(f"{lineno}-сап: {message}")
+        summary = (f"{result.created} жаңы, {result.updated} жаңыртылды, {len(result.errors)} ката "
+                   f"({time.monotonic() - started:.1f} сек).")
+        if options['dry_run']:
+            summary = "[dry-run] " + summary
+        style = self.style.WARNING if result.errors else self.style.SUCCESS
+        self.stdout.write(style(summary))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from config.models import Service
+
+
+class Command(BaseCommand):
+    help = "Кызматтардын rating_sum/rating_count/rating_avg талааларын пикирлерден кайра эсептейт"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--service', type=int, action='append', dest='services',
+                            help="Бир гана кызматты кайра эсептөө (бир нече жолу берсе болот)")
+
+    def handle(self, *args, **options):
+        queryset = Service.objects.all()
+        if options['services']:
+            queryset = queryset.filter(pk__in=options['services'])
+        with transaction.atomic():
+            updated = Service.rebuild_ratings(queryset)
+        self.stdout.write(self.style.SUCCESS(f"{updated} кызматтын рейтинги жаңыртылды."))
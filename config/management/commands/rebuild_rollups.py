@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from config.reports import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Күнүмдүк отчёттор таблицасын (OrderDailyRollup) заказдардан кайра эсептейт"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="Биринчи күн (YYYY-MM-DD); берилбесе башынан")
+        parser.add_argument('--end', help="Акыркы күн (YYYY-MM-DD); берилбесе бүгүнгө чейин")
+
+    def handle(self, *args, **options):
+        bounds = {}
+        for name in ('start', 'end'):
+            if options[name]:
+                bounds[name] = parse_date(options[name])
+                if bounds[name] is None:
+                    raise CommandError(f"--{name}: күн YYYY-MM-DD форматында болушу керек")
+        created = rebuild_rollups(**bounds)
+        self.stdout.write(self.style.SUCCESS(f"{created} отчёт сабы түзүлдү."))
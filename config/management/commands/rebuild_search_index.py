@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from config.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Кызматтардын толук тексттик издөө индексин нөлдөн кайра курат"
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Издөө индекси кайра курулду ({type(backend).__name__})."))
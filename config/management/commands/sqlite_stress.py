@@ -0,0 +1,39 @@
+import os
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from config import stress
+
+
+class Command(BaseCommand):
+    help = ("Бир нече процесстен бир SQLite файлына бир учурда жазып, демейки жана "
+            "production (SQLITE_PROFILE) профилдеринин өткөрүү жөндөмүн салыштырат")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--profile', choices=('default', 'production', 'both'), default='both')
+
+    def handle(self, *args, **options):
+        profiles = ['default', 'production'] if options['profile'] == 'both' else [options['profile']]
+        directory = tempfile.mkdtemp(prefix='sqlite-stress-')
+        try:
+            template = os.path.join(directory, 'template.sqlite3')
+            stress.prepare_template(template, options['workers'])
+            results = []
+            for profile in profiles:
+                db_path = os.path.join(directory, f'{profile}.sqlite3')
+                shutil.copyfile(template, db_path)
+                result = stress.run(db_path, profile, options['workers'], options['seconds'])
+                results.append(result)
+                self.stdout.write(
+                    f"{profile:<11} {result['orders_per_second']:>8.1f} заказ/сек  "
+                    f"{result['locked_errors']:>5} 'database is locked'  "
+                    f"p50 {result['p50_ms']:.1f} ms  p95 {result['p95_ms']:.1f} ms")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        if len(results) == 2 and results[0]['orders_per_second']:
+            ratio = results[1]['orders_per_second'] / results[0]['orders_per_second']
+            self.stdout.write(self.style.SUCCESS(f"production / default: x{ratio:.1f}"))
@@ -0,0 +1,29 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config.routers import replicas
+
+
+class Command(BaseCommand):
+    help = ("Жергиликтүү SQLite репликаларын (DATABASE_REPLICA_PATHS) негизги базадан "
+            "sqlite3 backup API менен жаңылайт. Чыныгы репликацияны СУБД өзү жасайт.")
+
+    def handle(self, *args, **options):
+        aliases = replicas()
+        if not aliases:
+            raise CommandError("Реплика жок: DATABASE_REPLICA_PATHS коюлган эмес")
+        primary = settings.DATABASES['default']
+        for alias in aliases:
+            replica = settings.DATABASES[alias]
+            if 'sqlite3' not in primary['ENGINE'] or 'sqlite3' not in replica['ENGINE']:
+                raise CommandError(f"{alias}: SQLite эмес, репликацияны СУБД'нын өзү менен жөндөңүз")
+            source = sqlite3.connect(primary['NAME'])
+            target = sqlite3.connect(replica['NAME'])
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            self.stdout.write(self.style.SUCCESS(f"{alias} <- default ({replica['NAME']})"))
@@ -0,0 +1,302 @@
+import atexit
+import glob
+import ipaddress
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections, transaction
+from django.utils.crypto import constant_time_compare
+
+
+# =========================================================
+# PROMETHEUS МЕТРИКАЛАРЫ (/metrics)
+# =========================================================
+# Ар бир процесс метрикаларды өз эс тутумунда чогултат (сурам учурунда
+# файл да, тармак да жок). METRICS['DIR'] берилсе, процесс аларды
+# FLUSH_INTERVAL секундда бир жолу (жана чыгып жатканда) ушул папкага
+# <pid>-<башталган убакыт>.json катары жазат; /metrics бардык файлдарды
+# жана өз учурдагы маанилерин кошуп чыгарат — ошондо бир нече WSGI
+# worker'дин жалпы маанилери көрүнөт. Деплойдо папканы тазалоо керек
+# (prometheus_client'тин multiprocess режими сыяктуу).
+#
+# /metrics төлөмдөрдүн суммасын жана заказдардын көлөмүн көрсөтөт, ошондуктан
+# TOKEN (Authorization: Bearer) же ALLOWED_IPS (ички тармак, CIDR болот)
+# талап кылынат; экөө тең берилбесе endpoint 404 кайтарат.
+
+DEFAULTS = {
+    'ENABLED': True,
+    'DIR': None,
+    'FLUSH_INTERVAL': 5,
+    'TOKEN': None,
+    'ALLOWED_IPS': (),
+}
+# Метод кардардан келет: башкалары 'other' — ар бир "FOO /path" жаңы серия ачпасын
+HTTP_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250)
+
+
+def metrics_settings():
+    return {**DEFAULTS, **getattr(settings, 'METRICS', {})}
+
+
+def scrape_configured(config):
+    return bool(config['TOKEN'] or config['ALLOWED_IPS'])
+
+
+def scrape_allowed(request, config):
+    token = config['TOKEN']
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    # REMOTE_ADDR гана: X-Forwarded-For'ду кардар өзү жазып коё алат
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in config['ALLOWED_IPS'])
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY[name] = self
+
+    def key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def snapshot(self):
+        with self.lock:
+            return {json.dumps(key, ensure_ascii=False): list(value) if isinstance(value, list) else value
+                    for key, value in self.values.items()}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def inc_on_commit(self, amount=1, **labels):
+        # Транзакция артка кайтса эсептелбейт
+        transaction.on_commit(lambda: self.inc(amount, **labels))
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, help, labels)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        index = bisect_left(self.buckets, value)  # len(buckets) -> +Inf
+        with self.lock:
+            row = self.values.get(key)
+            if row is None:
+                # [bucket_0 ... bucket_n, +Inf, sum] — кумулятивдүү эмес
+                row = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+
+
+REGISTRY = {}
+
+# --- HTTP жана DB ---
+REQUEST_LATENCY = Histogram('http_request_duration_seconds', "Сурамдын убактысы URL аты боюнча",
+                            ('view', 'method', 'status'))
+DB_QUERIES = Histogram('db_queries_per_request', "Бир сурамдагы SQL сурамдардын саны", ('view',),
+                       buckets=QUERY_COUNT_BUCKETS)
+DB_DURATION = Histogram('db_query_duration_seconds', "Бир сурамдагы SQL'дин жалпы убактысы", ('view',))
+CACHE_REQUESTS = Counter('cache_requests_total', "Кэштен окуулар (hit/miss)", ('cache', 'result'))
+
+# --- Бизнес ---
+ORDERS_CREATED = Counter('orders_created_total', "Түзүлгөн заказдар")
+ORDER_TRANSITIONS = Counter('order_status_transitions_total', "Статустун өзгөрүүлөрү",
+                            ('from_status', 'to_status'))
+PAYMENTS_ACCEPTED = Counter('payments_accepted_total', "payment_page'те кабыл алынган взностор")
+PAYMENTS_AMOUNT = Counter('payments_accepted_amount_total', "Кабыл алынган взностордун суммасы (сом)")
+
+
+# --- Процесстердин ортосунда бириктирүү ---
+
+_process_file = None
+_last_flush = 0.0
+_flush_lock = threading.Lock()
+
+
+def snapshot():
+    return {name: metric.snapshot() for name, metric in REGISTRY.items()}
+
+
+def _own_path(directory):
+    global _process_file
+    if _process_file is None or os.path.dirname(_process_file) != directory:
+        _process_file = os.path.join(directory, f'{os.getpid()}-{int(time.time() * 1000)}.json')
+    return _process_file
+
+
+def flush(force=False):
+    """Бул процесстин маанилерин METRICS['DIR']'ге жазат (FLUSH_INTERVAL'дан көп эмес)."""
+    global _last_flush
+    config = metrics_settings()
+    directory = config['DIR']
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < config['FLUSH_INTERVAL']:
+        return
+    if not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        _last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        path = _own_path(directory)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(snapshot(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+    finally:
+        _flush_lock.release()
+
+
+atexit.register(lambda: flush(force=True))
+
+
+def collect():
+    """Бардык процесстердин маанилерин бириктирет: {name: {key: value}}."""
+    snapshots = [snapshot()]
+    directory = metrics_settings()['DIR']
+    if directory:
+        own = _process_file
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            if path == own:
+                continue  # өзүбүздүкү эс тутумдан (жаңыраак)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    merged = {}
+    for data in snapshots:
+        for name, samples in data.items():
+            target = merged.setdefault(name, {})
+            for key, value in samples.items():
+                if isinstance(value, list):
+                    current = target.get(key)
+                    target[key] = [a + b for a, b in zip(current, value)] if current else list(value)
+                else:
+                    target[key] = target.get(key, 0) + value
+    return merged
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(merged=None):
+    """Prometheus text exposition format (0.0.4)."""
+    merged = collect() if merged is None else merged
+    lines = []
+    for name, metric in REGISTRY.items():
+        lines.append(f'# HELP {name} {metric.help}')
+        lines.append(f'# TYPE {name} {metric.type}')
+        for key, value in sorted(merged.get(name, {}).items()):
+            values = json.loads(key)
+            if metric.type == 'counter':
+                lines.append(f'{name}{_labels(metric.labels, values)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + ('+Inf',), value[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f'{name}_bucket{_labels(metric.labels, values, [le])} {cumulative}')
+            lines.append(f'{name}_sum{_labels(metric.labels, values)} {_number(value[-1])}')
+            lines.append(f'{name}_count{_labels(metric.labels, values)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+# --- Middleware ---
+
+class _QueryCounter:
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics_settings()['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        queries = _QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started, queries)
+        return response
+
+    async def __acall__(self, request):
+        # Async ORM сурамдары өз thread'инде, өз байланышында аткарылат —
+        # execute_wrapper аларга бул жерден жетпейт: DB гистограммалары sync сурамдар үчүн гана
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started, None)
+        return response
+
+    def observe(self, request, response, elapsed, queries):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        if view != 'metrics':
+            method = request.method if request.method in HTTP_METHODS else 'other'
+            REQUEST_LATENCY.observe(elapsed, view=view, method=method,
+                                    status=f'{response.status_code // 100}xx')
+            if queries is not None:
+                DB_QUERIES.observe(queries.count, view=view)
+                DB_DURATION.observe(queries.seconds, view=view)
+        flush()
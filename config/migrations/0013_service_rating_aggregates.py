@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_ratings(apps, schema_editor):
+    Service = apps.get_model('config', 'Service')
+    Review = apps.get_model('config', 'Review')
+    reviews = Review.objects.filter(service=OuterRef('pk')).order_by().values('service')
+    Service.objects.update(
+        rating_sum=Coalesce(Subquery(reviews.annotate(s=Sum('rating')).values('s')), 0),
+        rating_count=Coalesce(Subquery(reviews.annotate(c=Count('pk')).values('c')), 0),
+        rating_avg=Coalesce(Subquery(reviews.annotate(a=Avg('rating')).values('a'), output_field=FloatField()), 0.0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('config', '0012_alter_building_options_alter_category_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='rating_avg',
+            field=models.FloatField(db_index=True, default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS config_service_fts USING fts5("
+    "name, description, category, building, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+SQLITE_FILL = (
+    "INSERT INTO config_service_fts (rowid, name, description, category, building) "
+    "SELECT s.id, s.name, s.description, COALESCE(c.name, ''), COALESCE(b.name, '') "
+    "FROM config_service s "
+    "LEFT JOIN config_category c ON c.id = s.category_id "
+    "LEFT JOIN config_building b ON b.id = s.building_id"
+)
+
+POSTGRES_CREATE = (
+    "CREATE TABLE IF NOT EXISTS config_service_search ("
+    "service_id bigint PRIMARY KEY REFERENCES config_service(id) ON DELETE CASCADE, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS config_service_search_gin ON config_service_search USING GIN (document)",
+)
+POSTGRES_FILL = (
+    "INSERT INTO config_service_search (service_id, document) "
+    "SELECT s.id, "
+    "setweight(to_tsvector('simple', s.name), 'A') || "
+    "setweight(to_tsvector('simple', COALESCE(c.name, '')), 'B') || "
+    "setweight(to_tsvector('simple', COALESCE(b.name, '')), 'C') || "
+    "setweight(to_tsvector('simple', s.description), 'D') "
+    "FROM config_service s "
+    "LEFT JOIN config_category c ON c.id = s.category_id "
+    "LEFT JOIN config_building b ON b.id = s.building_id"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        statements = (SQLITE_CREATE, SQLITE_FILL)
+    elif vendor == 'postgresql':
+        statements = POSTGRES_CREATE + (POSTGRES_FILL,)
+    else:
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS config_service_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP TABLE IF EXISTS config_service_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('config', '0014_order_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
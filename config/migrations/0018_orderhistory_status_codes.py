@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+# Мурунку жазуулардагы текст түрүндөгү статустар (кыргызча/орусча) -> коддор
+LABEL_TO_CODE = {
+    'Жаңы': 'NEW',
+    'Жаңы (Төлөм күтүлүүдө)': 'NEW',
+    'Ожидания': 'NEW',
+    'Төлөм күтүлүүдө': 'WAITING_PAYMENT',
+    'Төлөндү': 'PAID',
+    'Взнос төлөндү': 'PAID',
+    'Аткарылууда': 'IN_PROGRESS',
+    'В процессе': 'IN_PROGRESS',
+    'Аяктады': 'DONE',
+    'Выполнено': 'DONE',
+    'Жокко чыгарылды': 'CANCELLED',
+}
+
+
+def labels_to_codes(apps, schema_editor):
+    OrderHistory = apps.get_model('config', 'OrderHistory')
+    for field in ('old_status', 'new_status'):
+        for label, code in LABEL_TO_CODE.items():
+            OrderHistory.objects.filter(**{field: label}).update(**{field: code})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('config', '0017_mediaasset'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderhistory',
+            name='new_status',
+            field=models.CharField(choices=[('NEW', 'Жаңы'), ('WAITING_PAYMENT', 'Төлөм күтүлүүдө'), ('PAID', 'Төлөндү'), ('IN_PROGRESS', 'Аткарылууда'), ('DONE', 'Аяктады'), ('CANCELLED', 'Жокко чыгарылды')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='orderhistory',
+            name='old_status',
+            field=models.CharField(choices=[('NEW', 'Жаңы'), ('WAITING_PAYMENT', 'Төлөм күтүлүүдө'), ('PAID', 'Төлөндү'), ('IN_PROGRESS', 'Аткарылууда'), ('DONE', 'Аяктады'), ('CANCELLED', 'Жокко чыгарылды')], max_length=50),
+        ),
+        migrations.RunPython(labels_to_codes, migrations.RunPython.noop),
+    ]
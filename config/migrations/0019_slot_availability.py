@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('config', '0018_orderhistory_status_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookedSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('capacity', models.PositiveSmallIntegerField()),
+                ('booked', models.PositiveSmallIntegerField(default=0)),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booked_slots', to='config.building')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booked_slots', to='config.service')),
+            ],
+            options={
+                'verbose_name': 'Брондолгон убакыт',
+                'verbose_name_plural': 'Брондолгон убакыттар',
+            },
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='slot',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='config.bookedslot'),
+        ),
+        migrations.CreateModel(
+            name='SlotCapacity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Дүйшөмбү'), (1, 'Шейшемби'), (2, 'Шаршемби'), (3, 'Бейшемби'), (4, 'Жума'), (5, 'Ишемби'), (6, 'Жекшемби')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('slot_minutes', models.PositiveSmallIntegerField(default=60)),
+                ('capacity', models.PositiveSmallIntegerField(default=1, help_text='Бир убакытта канча бригада иштей алат')),
+                ('building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_capacities', to='config.building')),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='slot_capacities', to='config.service')),
+            ],
+            options={
+                'verbose_name': 'Иш графиги',
+                'verbose_name_plural': 'Иш графиктери',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='bookedslot',
+            constraint=models.UniqueConstraint(fields=('building', 'service', 'date', 'time'), name='bookedslot_unique_slot'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookedslot',
+            constraint=models.CheckConstraint(condition=models.Q(('booked__lte', models.F('capacity'))), name='bookedslot_booked_within_capacity'),
+        ),
+        migrations.AddIndex(
+            model_name='slotcapacity',
+            index=models.Index(fields=['building', 'weekday'], name='slotcapacity_building_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='slotcapacity',
+            constraint=models.CheckConstraint(condition=models.Q(('end_time__gt', models.F('start_time'))), name='slotcapacity_end_after_start'),
+        ),
+        migrations.AddConstraint(
+            model_name='slotcapacity',
+            constraint=models.CheckConstraint(condition=models.Q(('slot_minutes__gt', 0)), name='slotcapacity_slot_minutes_positive'),
+        ),
+    ]
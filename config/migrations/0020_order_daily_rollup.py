@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Order = apps.get_model('config', 'Order')
+    OrderDailyRollup = apps.get_model('config', 'OrderDailyRollup')
+    groups = (
+        Order.objects.annotate(day=TruncDate('created_at'))
+        .values('day', 'building_id', 'service_id', 'status')
+        .annotate(n=Count('pk'), revenue=Sum('total_price'), prepayment=Sum('prepayment_amount'))
+        .order_by()
+    )
+    OrderDailyRollup.objects.bulk_create(
+        [OrderDailyRollup(day=row['day'], building_id=row['building_id'], service_id=row['service_id'],
+                          status=row['status'], orders=row['n'], revenue=row['revenue'] or 0,
+                          prepayment=row['prepayment'] or 0) for row in groups],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('config', '0019_slot_availability'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('NEW', 'Жаңы'), ('WAITING_PAYMENT', 'Төлөм күтүлүүдө'), ('PAID', 'Төлөндү'), ('IN_PROGRESS', 'Аткарылууда'), ('DONE', 'Аяктады'), ('CANCELLED', 'Жокко чыгарылды')], max_length=20)),
+                ('orders', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('prepayment', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('building', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='config.building')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='config.service')),
+            ],
+            options={
+                'verbose_name': 'Күнүмдүк отчёт',
+                'verbose_name_plural': 'Күнүмдүк отчёттор',
+                'indexes': [models.Index(fields=['building', 'day'], name='rollup_building_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'building', 'service', 'status'), name='rollup_unique_grain')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('config', '0020_order_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='building',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
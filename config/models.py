@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models import Avg
+from django.db.models import Avg, Case, Count, F, FloatField, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Cast, Coalesce, Now
+
+from .caching import invalidate_catalog
 
 
 # 1. User модели
@@ -25,6 +29,9 @@ class Category(models.Model):
     name = models.CharField(max_length=100)
     icon = models.CharField(max_length=50, default="fa-tools")
     image = models.ImageField(upload_to='categories/', null=True, blank=True)
+    # config/thumbnails.py: түзүлгөн варианттардын аттары (API'де URL катары көрсөтүлөт)
+    image_renditions = models.JSONField(default=list, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Категория"
@@ -38,6 +45,9 @@ class Building(models.Model):
     name = models.CharField(max_length=255)
     address = models.TextField()
     image = models.ImageField(upload_to='buildings/', null=True, blank=True)
+    # config/thumbnails.py: түзүлгөн варианттардын аттары (API'де URL катары көрсөтүлөт)
+    image_renditions = models.JSONField(default=list, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Имарат"
@@ -54,10 +64,53 @@ class Service(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image = models.ImageField(upload_to='services/', null=True, blank=True)
+    # config/thumbnails.py: түзүлгөн варианттардын аттары (API'де URL катары көрсөтүлөт)
+    image_renditions = models.JSONField(default=list, blank=True, editable=False)
+    # ETag/Last-Modified үчүн; queryset.update() аны өзү койбойт, ошондуктан кол менен жаңыланат
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # Рейтинг пикирлерден ар бир жазууда жаңыланат (Review.save / post_delete)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_avg = models.FloatField(default=0.0, editable=False, db_index=True)
 
     def get_average_rating(self):
-        avg = self.reviews.aggregate(Avg('rating'))['rating__avg']
-        return round(avg, 1) if avg else 0.0
+        return round(self.rating_avg, 1) if self.rating_count else 0.0
+
+    @classmethod
+    def apply_rating_delta(cls, service_id, sum_delta, count_delta):
+        # Бир UPDATE менен: SET-тин оң жагы эски маанилерди көрөт
+        new_sum = F('rating_sum') + sum_delta
+        new_count = F('rating_count') + count_delta
+        cls.objects.filter(pk=service_id).update(
+            updated_at=Now(),
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating_avg=Case(
+                When(rating_count__gt=-count_delta, then=Cast(new_sum, FloatField()) / new_count),
+                default=0.0,
+                output_field=FloatField(),
+            ),
+        )
+
+    @classmethod
+    def rebuild_ratings(cls, queryset=None):
+        # Рейтингди пикирлерден нөлдөн кайра эсептөө (rebuild_ratings командасы)
+        reviews = Review.objects.filter(service=OuterRef('pk')).order_by().values('service')
+        rating_sum = Coalesce(Subquery(reviews.annotate(s=Sum('rating')).values('s')), 0)
+        rating_count = Coalesce(Subquery(reviews.annotate(c=Count('pk')).values('c')), 0)
+        queryset = cls.objects.all() if queryset is None else queryset
+        updated = queryset.update(
+            updated_at=Now(),
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating_avg=Coalesce(
+                Subquery(reviews.annotate(a=Avg('rating')).values('a'), output_field=FloatField()), 0.0
+            ),
+        )
+        # update() сигналсыз — кэштелген service:<pk> барактары эски рейтингди көрсөтпөсүн
+        invalidate_catalog()
+        return updated
 
     class Meta:
         verbose_name = "Кызмат"
@@ -86,6 +139,9 @@ class Order(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='NEW')
     comment = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Брондолгон убакыт (config/slots.py); жокко чыгарылганда бошотулат
+    slot = models.ForeignKey('BookedSlot', on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name='orders', editable=False)
 
     def save(self, *args, **kwargs):
         # Бааны автоматтык түрдө кызматтан алуу
@@ -97,11 +153,70 @@ class Order(models.Model):
             from decimal import Decimal
             self.prepayment_amount = self.total_price * Decimal('0.10')
 
-        super().save(*args, **kwargs)
+        # Күнүмдүк отчёттор (OrderDailyRollup) ушул эле транзакцияда жаңыланат
+        old_state = getattr(self, '_rollup_state', None)
+        if self.pk is None:
+            old_state = None
+        with transaction.atomic():
+            if old_state is None and self.pk is not None:
+                # .only()/defer менен окулган же Order(pk=...) — эски абалы базадан
+                # (сап жок болсо жаңы заказ катары эсептелет)
+                old_state = self.stored_rollup_state(kwargs.get('using'))
+            super().save(*args, **kwargs)
+            new_state = self.saved_rollup_state(old_state, kwargs.get('update_fields'))
+            if old_state != new_state:
+                if old_state is not None:
+                    OrderDailyRollup.apply(old_state, -1)
+                OrderDailyRollup.apply(new_state, 1)
+        self._rollup_state = new_state
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(name in field_names for name in cls.ROLLUP_FIELDS):
+            instance._rollup_state = instance.rollup_state()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None and not set(self.ROLLUP_FIELDS) & self.get_deferred_fields():
+            self._rollup_state = self.rollup_state()
+
+    ROLLUP_FIELDS = ('created_at', 'building_id', 'service_id', 'status', 'total_price', 'prepayment_amount')
+
+    def rollup_state(self):
+        return (timezone.localdate(self.created_at), self.building_id, self.service_id, self.status,
+                self.total_price, self.prepayment_amount)
+
+    def saved_rollup_state(self, old_state, update_fields=None):
+        # update_fields берилсе, жазылбаган талаалар (мисалы, эстеги жаңы статус) базада
+        # эски бойдон калат — rollup'ка да эски мааниси кирет
+        state = self.rollup_state()
+        if old_state is None or update_fields is None:
+            return state
+        saved = {self._meta.get_field(name).attname for name in update_fields}
+        return tuple(new if field in saved else old
+                     for field, old, new in zip(self.ROLLUP_FIELDS, old_state, state))
+
+    def stored_rollup_state(self, using=None):
+        stored = (type(self)._base_manager.db_manager(using or self._state.db).select_for_update()
+                  .only(*self.ROLLUP_FIELDS).filter(pk=self.pk).first())
+        return stored.rollup_state() if stored is not None else None
+
+    def sync_rollup_state(self):
+        # save()'сиз өзгөртүлгөндө (workflow.transition) кийинки save() эки жолу эсептебеши үчүн
+        if getattr(self, '_rollup_state', None) is not None:
+            self._rollup_state = self.rollup_state()
 
     class Meta:
         verbose_name = "Заказ"
         verbose_name_plural = "Заказдар"
+        # Ролго жараша dashboard / API тизмелери: фильтр + created_at боюнча сорттоо
+        indexes = [
+            models.Index(fields=['building', 'created_at'], name='order_building_created_idx'),
+            models.Index(fields=['user', 'created_at'], name='order_user_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='order_status_created_idx'),
+        ]
 
 
 # 6. Review модели
@@ -116,18 +231,47 @@ class Review(models.Model):
         verbose_name = "Пикир"
         verbose_name_plural = "Пикирлер"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'service_id' in field_names and 'rating' in field_names:
+            instance._rating_state = (instance.service_id, instance.rating)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Пикир жана кызматтын рейтинги бир транзакцияда жаңыланат
+        adding = self._state.adding
+        old_state = getattr(self, '_rating_state', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Service.apply_rating_delta(self.service_id, self.rating, 1)
+            elif old_state is None:
+                Service.rebuild_ratings(Service.objects.filter(pk=self.service_id))
+            elif old_state[0] == self.service_id:
+                if old_state[1] != self.rating:
+                    Service.apply_rating_delta(self.service_id, self.rating - old_state[1], 0)
+            else:
+                Service.apply_rating_delta(old_state[0], -old_state[1], -1)
+                Service.apply_rating_delta(self.service_id, self.rating, 1)
+        self._rating_state = (self.service_id, self.rating)
+
 
 # 7. OrderHistory модели
 class OrderHistory(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='history_logs')
-    old_status = models.CharField(max_length=50)
-    new_status = models.CharField(max_length=50)
+    # Статустун коддору сакталат; текст get_old_status_display / get_new_status_display менен
+    old_status = models.CharField(max_length=50, choices=Order.STATUS_CHOICES)
+    new_status = models.CharField(max_length=50, choices=Order.STATUS_CHOICES)
     changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     change_date = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "Заказ тарыхы"
         verbose_name_plural = "Заказ тарыхы"
+        indexes = [
+            models.Index(fields=['order', 'change_date'], name='orderhistory_order_date_idx'),
+        ]
 
 
 # 8. Client модели
@@ -139,4 +283,116 @@ class Client(models.Model):
 
     class Meta:
         verbose_name = "Кардар"
-        verbose_name_plural = "Кардарлар"
\ No newline at end of file
+        verbose_name_plural = "Кардарлар"
+
+# 9. MediaAsset модели
+class MediaAsset(models.Model):
+    # HashedMediaStorage сактаган файл: аты мазмундун хешинен, баштапкы аты метамаалымат
+    name = models.CharField(max_length=255, unique=True)
+    original_name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Медиа файл"
+        verbose_name_plural = "Медиа файлдар"
+
+    def __str__(self): return self.original_name
+
+
+
+# 10. SlotCapacity модели (иш графиги)
+class SlotCapacity(models.Model):
+    WEEKDAY_CHOICES = [
+        (0, 'Дүйшөмбү'), (1, 'Шейшемби'), (2, 'Шаршемби'), (3, 'Бейшемби'),
+        (4, 'Жума'), (5, 'Ишемби'), (6, 'Жекшемби'),
+    ]
+    building = models.ForeignKey(Building, on_delete=models.CASCADE, related_name='slot_capacities')
+    # Бош болсо — имараттын бардык кызматтары үчүн; кызматка өзүнчө график болсо, ал артыкчылыктуу
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, null=True, blank=True,
+                                related_name='slot_capacities')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    slot_minutes = models.PositiveSmallIntegerField(default=60)
+    capacity = models.PositiveSmallIntegerField(default=1, help_text="Бир убакытта канча бригада иштей алат")
+
+    class Meta:
+        verbose_name = "Иш графиги"
+        verbose_name_plural = "Иш графиктери"
+        indexes = [models.Index(fields=['building', 'weekday'], name='slotcapacity_building_day_idx')]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(end_time__gt=models.F('start_time')),
+                                   name='slotcapacity_end_after_start'),
+            models.CheckConstraint(condition=models.Q(slot_minutes__gt=0), name='slotcapacity_slot_minutes_positive'),
+        ]
+
+    def __str__(self): return f"{self.building} / {self.get_weekday_display()} {self.start_time}-{self.end_time}"
+
+
+# 11. BookedSlot модели (брондолгон убакыттар)
+class BookedSlot(models.Model):
+    building = models.ForeignKey(Building, on_delete=models.CASCADE, related_name='booked_slots')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='booked_slots')
+    date = models.DateField()
+    time = models.TimeField()
+    capacity = models.PositiveSmallIntegerField()
+    booked = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Брондолгон убакыт"
+        verbose_name_plural = "Брондолгон убакыттар"
+        constraints = [
+            # (building, service, date) боюнча диапазон сурамдары да ушул индексти колдонот
+            models.UniqueConstraint(fields=['building', 'service', 'date', 'time'], name='bookedslot_unique_slot'),
+            models.CheckConstraint(condition=models.Q(booked__lte=models.F('capacity')),
+                                   name='bookedslot_booked_within_capacity'),
+        ]
+
+    def __str__(self): return f"{self.building} / {self.service} {self.date} {self.time} ({self.booked}/{self.capacity})"
+
+
+
+# 12. OrderDailyRollup модели (отчёттор үчүн күнүмдүк жыйынтыктар)
+class OrderDailyRollup(models.Model):
+    # Бир сап = бир күн (created_at боюнча) x имарат x кызмат x статус
+    day = models.DateField()
+    building = models.ForeignKey(Building, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='+')
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    orders = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    prepayment = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Күнүмдүк отчёт"
+        verbose_name_plural = "Күнүмдүк отчёттор"
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'building', 'service', 'status'], name='rollup_unique_grain'),
+        ]
+        indexes = [models.Index(fields=['building', 'day'], name='rollup_building_day_idx')]
+
+    @classmethod
+    def apply(cls, state, sign):
+        """state = Order.rollup_state(); sign = +1 (кошуу) же -1 (алып салуу)."""
+        day, building_id, service_id, status, total_price, prepayment = state
+        cls.add(day, building_id, service_id, status, sign, sign * (total_price or 0), sign * (prepayment or 0))
+
+    @classmethod
+    def add(cls, day, building_id, service_id, status, orders, revenue, prepayment):
+        key = {'day': day, 'building_id': building_id, 'service_id': service_id, 'status': status}
+        with transaction.atomic():
+            # building NULL болсо unique иштебейт, ошондуктан биринчи сапты гана жаңылайбыз
+            pk = cls.objects.filter(**key).order_by('pk').values_list('pk', flat=True).first()
+            if pk is None:
+                # Жок саптан алып салуу — мисалы кызмат каскад менен өчүрүлүп жатканда
+                if orders < 0:
+                    return
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(orders=orders, revenue=revenue, prepayment=prepayment, **key)
+                    return
+                except IntegrityError:
+                    pk = cls.objects.filter(**key).values_list('pk', flat=True).first()
+            cls.objects.filter(pk=pk).update(
+                orders=F('orders') + orders, revenue=F('revenue') + revenue, prepayment=F('prepayment') + prepayment)
@@ -0,0 +1,88 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.http import urlencode
+from rest_framework.pagination import CursorPagination
+
+
+# =========================================================
+# КУРСОР (KEYSET) ПАГИНАЦИЯСЫ
+# =========================================================
+# OFFSET колдонулбайт: кийинки бет "WHERE created_at < <курсор>" менен
+# индекстен окулат, ошондуктан N-бет 1-бет сыяктуу эле арзан.
+# ?page_size= опционалдуу, API_MAX_PAGE_SIZE менен чектелет.
+
+class DefaultCursorPagination(CursorPagination):
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+
+
+class OrderCursorPagination(DefaultCursorPagination):
+    # (created_at, id) — бир эле убакыттагы заказдар id боюнча ажыратылат
+    ordering = ('-created_at', '-id')
+
+
+class OrderHistoryCursorPagination(DefaultCursorPagination):
+    ordering = ('-change_date', '-id')
+
+
+# --- Async view'лар үчүн (DRF пагинациясы sync ORM'ду колдонот) ---
+
+def page_size(request):
+    default = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 50
+    try:
+        size = int(request.GET.get('page_size', default))
+    except ValueError:
+        size = default
+    return min(max(size, 1), DefaultCursorPagination.max_page_size)
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, model, fields):
+    """ValueError — курсор бузук болсо."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Курсор туура эмес") from exc
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValueError("Курсор туура эмес")
+    try:
+        return [model._meta.get_field(name).to_python(value) for name, value in zip(fields, values)]
+    except Exception as exc:
+        raise ValueError("Курсор туура эмес") from exc
+
+
+def _after(fields, values):
+    # (a, b) < (x, y)  ->  a < x OR (a = x AND b < y)
+    condition = Q()
+    for index, name in enumerate(fields):
+        condition |= Q(**dict(zip(fields[:index], values[:index])), **{f'{name}__lt': values[index]})
+    return condition
+
+
+async def apaginate(request, queryset, ordering):
+    """Кемүүчү `ordering` боюнча keyset барагы: (объекттер, кийинки беттин URL'и же None).
+
+    Жооп DRF'тин курсор пагинациясынын формасында ({'next', 'results'}), бирок
+    артка (previous) шилтемеси жок. Курсор бузук болсо ValueError.
+    """
+    fields = [name.lstrip('-') for name in ordering]
+    size = page_size(request)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        queryset = queryset.filter(_after(fields, decode_cursor(cursor, queryset.model, fields)))
+    rows = [obj async for obj in queryset.order_by(*ordering)[:size + 1]]
+    next_url = None
+    if len(rows) > size:
+        rows = rows[:size]
+        params = {**request.GET.dict(), 'cursor': encode_cursor([getattr(rows[-1], name) for name in fields])}
+        next_url = request.build_absolute_uri(f'{request.path}?{urlencode(params)}')
+    return rows, next_url
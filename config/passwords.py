@@ -0,0 +1,36 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+
+# =========================================================
+# ПАРОЛДУ ХЕШТӨӨ (ASGI үчүн өзүнчө пул)
+# =========================================================
+# PBKDF2 бир паролго ондогон миллисекунд CPU алат. Event loop'то
+# чакырылса бардык байланыштар токтойт; ар бир сурам өз thread'инде
+# хештесе (sync view ASGI'де), каттоонун толкуну бардык ядролорду ээлейт.
+# Бул жерде хештөө PASSWORD_HASH_WORKERS thread'тен ашпайт (hashlib
+# PBKDF2 учурунда GIL'ди бошотот, ошондуктан thread'тер параллелдүү).
+
+_executor = None
+_lock = threading.Lock()
+
+
+def hash_workers():
+    return getattr(settings, 'PASSWORD_HASH_WORKERS', None) or os.cpu_count() or 1
+
+
+def hash_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=hash_workers(), thread_name_prefix='password-hash')
+        return _executor
+
+
+async def amake_password(password):
+    return await asyncio.get_running_loop().run_in_executor(hash_executor(), make_password, password)
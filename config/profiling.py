@@ -0,0 +1,176 @@
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# СУРАМДАРДЫ ПРОФИЛДӨӨ (опционалдуу middleware)
+# =========================================================
+# PROFILING['ENABLED'] = False болсо middleware __init__'те MiddlewareNotUsed
+# чыгарат: Django аны чынжырдан алып салат, патчтар да орнотулбайт —
+# өчүк абалда эч кандай кошумча чыгым жок.
+#
+# Күйүк абалда ар бир сурам үчүн:
+#   * SQL: connection.execute_wrapper менен саны жана жалпы убактысы;
+#     параметрсиз бирдей SQL DUPLICATE_QUERY_THRESHOLD жолдон көп
+#     кайталанса — N+1 катары белгиленет;
+#   * шаблондор: Template.render (ичкилери эки жолу эсептелбейт);
+#   * DRF: serializer.data (to_representation);
+#   * Server-Timing баш сабы (браузердин DevTools'унда көрүнөт);
+#   * SLOW_REQUEST_MS'тен жай сурамдар JSON катары логго;
+#   * PROFILE_SAMPLE_RATE үлүшүндөгү сурамдар cProfile менен PROFILE_DIR'ге.
+
+DEFAULTS = {
+    'ENABLED': False,
+    'SLOW_REQUEST_MS': 500,
+    'DUPLICATE_QUERY_THRESHOLD': 5,
+    'PROFILE_SAMPLE_RATE': 0.0,
+    'PROFILE_DIR': None,
+}
+
+_current = ContextVar('request_profile', default=None)
+_patched = False
+
+
+def profiling_settings():
+    return {**DEFAULTS, **getattr(settings, 'PROFILING', {})}
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.sql_counts = Counter()
+        self.timers = Counter()   # 'template' / 'serializer' -> секунд
+        self.depth = Counter()    # ичкиленген чакыруулар эки жолу эсептелбеши үчүн
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.sql_counts[sql] += 1
+
+    def duplicates(self, threshold):
+        return [(sql, count) for sql, count in self.sql_counts.most_common() if count >= threshold]
+
+
+def timed(kind, func):
+    """`func`'ту учурдагы профилдин `kind` таймери менен ороп берет."""
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        profile.depth[kind] += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.depth[kind] -= 1
+            if not profile.depth[kind]:
+                profile.timers[kind] += time.perf_counter() - started
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def install_patches():
+    global _patched
+    if _patched:
+        return
+    from django.template.base import Template
+    Template.render = timed('template', Template.render)
+    try:
+        from rest_framework.serializers import BaseSerializer
+    except ImportError:
+        pass
+    else:
+        BaseSerializer.data = property(timed('serializer', BaseSerializer.data.fget))
+    _patched = True
+
+
+def server_timing(profile, total):
+    parts = [f'db;dur={profile.sql_seconds * 1000:.1f};desc="{profile.queries} queries"']
+    for kind, seconds in sorted(profile.timers.items()):
+        parts.append(f'{kind};dur={seconds * 1000:.1f}')
+    parts.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(parts)
+
+
+def _profile_path(directory, request):
+    slug = re.sub(r'[^\w]+', '-', request.path).strip('-')[:80] or 'root'
+    return os.path.join(directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{request.method}-{slug}.prof')
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.config = profiling_settings()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_patches()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        sampler = None
+        if self.config['PROFILE_DIR'] and random.random() < self.config['PROFILE_SAMPLE_RATE']:
+            sampler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                # Wrapper DatabaseWrapper'ге коюлат, DB байланышы кийин ачылса да иштейт
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                if sampler:
+                    sampler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if sampler:
+                        sampler.disable()
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = server_timing(profile, total)
+        self.report(request, response, profile, total)
+        if sampler:
+            os.makedirs(self.config['PROFILE_DIR'], exist_ok=True)
+            sampler.dump_stats(_profile_path(self.config['PROFILE_DIR'], request))
+        return response
+
+    def report(self, request, response, profile, total):
+        duplicates = profile.duplicates(self.config['DUPLICATE_QUERY_THRESHOLD'])
+        slow = total * 1000 >= self.config['SLOW_REQUEST_MS']
+        if not (slow or duplicates):
+            return
+        user = getattr(request, 'user', None)
+        record = {
+            'event': 'slow_request' if slow else 'duplicate_queries',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'total_ms': round(total * 1000, 1),
+            'db_ms': round(profile.sql_seconds * 1000, 1),
+            'queries': profile.queries,
+            **{f'{kind}_ms': round(seconds * 1000, 1) for kind, seconds in profile.timers.items()},
+            'duplicates': [{'sql': sql[:500], 'count': count} for sql, count in duplicates],
+        }
+        logger.warning(json.dumps(record, ensure_ascii=False), extra={'profile': record})
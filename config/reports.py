@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+from .metrics import CACHE_REQUESTS
+from .models import Order, OrderDailyRollup
+
+
+# =========================================================
+# ОТЧЁТТОР (күнүмдүк жыйынтыктардан гана окулат)
+# =========================================================
+# OrderDailyRollup Order.save(), workflow.transition() жана заказ
+# өчүрүлгөндө жаңыланат. `manage.py rebuild_rollups` аны config_order'дон
+# нөлдөн кайра эсептейт (түнкү backfill).
+
+PAID_STATUSES = ('PAID', 'IN_PROGRESS', 'DONE')
+
+GROUP_FIELDS = {
+    'day': ('day',),
+    'status': ('status',),
+    'building': ('building_id', 'building__name'),
+    'service': ('service_id', 'service__name'),
+    'category': ('service__category_id', 'service__category__name'),
+}
+
+
+def order_groups(orders):
+    """Заказдарды rollup'тун деңгээлинде топтоо (бир GROUP BY сурамы)."""
+    return (
+        orders.annotate(day=TruncDate('created_at'))
+        .values('day', 'building_id', 'service_id', 'status')
+        .annotate(n=Count('pk'), revenue=Sum('total_price'), prepayment=Sum('prepayment_amount'))
+        .order_by()
+    )
+
+
+def move_status(order_ids, old_status, new_status):
+    """Статусу өзгөргөн заказдарды rollup'та эски статустан жаңысына жылдырат."""
+    for row in order_groups(Order.objects.filter(pk__in=order_ids)):
+        key = (row['day'], row['building_id'], row['service_id'])
+        OrderDailyRollup.add(*key, old_status, -row['n'], -row['revenue'], -row['prepayment'])
+        OrderDailyRollup.add(*key, new_status, row['n'], row['revenue'], row['prepayment'])
+
+
+def rebuild_rollups(start=None, end=None):
+    orders = Order.objects.all()
+    rollups = OrderDailyRollup.objects.all()
+    if start:
+        orders = orders.filter(created_at__date__gte=start)
+        rollups = rollups.filter(day__gte=start)
+    if end:
+        orders = orders.filter(created_at__date__lte=end)
+        rollups = rollups.filter(day__lte=end)
+    with transaction.atomic():
+        rollups.delete()
+        rows = OrderDailyRollup.objects.bulk_create(
+            (
+                OrderDailyRollup(day=row['day'], building_id=row['building_id'], service_id=row['service_id'],
+                                 status=row['status'], orders=row['n'], revenue=row['revenue'] or 0,
+                                 prepayment=row['prepayment'] or 0)
+                for row in order_groups(orders).iterator(chunk_size=2000)
+            ),
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+def order_report(start, end, group_by='day', building_id=None):
+    rollups = OrderDailyRollup.objects.filter(day__range=(start, end))
+    if building_id is not None:
+        rollups = rollups.filter(building_id=building_id)
+    fields = GROUP_FIELDS[group_by]
+    rows = (
+        rollups.values(*fields)
+        .annotate(
+            order_count=Sum('orders'),
+            revenue_total=Sum('revenue', filter=~Q(status='CANCELLED'), default=0),
+            prepayment_total=Sum('prepayment', filter=Q(status__in=PAID_STATUSES), default=0),
+        )
+        .filter(order_count__gt=0)
+        .order_by(fields[0])
+    )
+    return list(rows)
+
+
+def order_totals(building_id=None):
+    """home.html статистикасы үчүн: бардык убакыттагы заказдар статус боюнча."""
+    rollups = OrderDailyRollup.objects.all()
+    if building_id is not None:
+        rollups = rollups.filter(building_id=building_id)
+    return dict(rollups.values('status').annotate(n=Sum('orders')).values_list('status', 'n').order_by())
+
+
+def cached_order_totals():
+    # Башкы бет ар бир сурамда отчёт окубашы үчүн кыска мөөнөткө кэштелет
+    totals = cache.get('reports:order_totals')
+    if totals is None:
+        CACHE_REQUESTS.inc(cache='order_totals', result='miss')
+        totals = order_totals()
+        cache.set('reports:order_totals', totals, getattr(settings, 'STATISTICS_CACHE_TIMEOUT', 60))
+    else:
+        CACHE_REQUESTS.inc(cache='order_totals', result='hit')
+    return totals
@@ -0,0 +1,146 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# =========================================================
+# НЕГИЗГИ БАЗА ЖАНА READ-РЕПЛИКАЛАР
+# =========================================================
+# Каталог (кызматтар, категориялар, имараттар, пикирлер) жана отчёттор
+# репликадан окулат; заказдар, колдонуучулар, сессиялар жана бардык
+# жазуулар — негизги базадан.
+#
+# Сурамдын ичинде бир жолу жазуу болсо (же сурам POST/PUT/PATCH/DELETE
+# болсо), ошол сурамдын калган окуулары негизги базага өтөт жана
+# REPLICA_STICKY_SECONDS бою cookie менен кийинки сурамдар да ошол жакта
+# калат: create_order -> payment_page, статус өзгөртүү -> dashboard
+# репликанын кечигүүсүн көрбөйт.
+
+READ_REPLICA_MODELS = {
+    'config.building', 'config.category', 'config.service', 'config.review',
+    'config.orderdailyrollup', 'config.mediaasset', 'config.slotcapacity',
+}
+STICKY_COOKIE = 'db_primary'
+
+_pinned = ContextVar('db_pinned_to_primary', default=False)
+_wrote = ContextVar('db_wrote', default=False)
+
+
+def _same_database(a, b):
+    return all(a.get(key) == b.get(key) for key in ('ENGINE', 'NAME', 'HOST', 'PORT'))
+
+
+def replicas():
+    # Негизги базанын өзүн көрсөткөн реплика (мисалы тесттердеги TEST MIRROR)
+    # өзүнчө байланыш ачпайт — ал 'default' катары эле колдонулат.
+    primary = connections[DEFAULT_DB_ALIAS].settings_dict
+    return [alias for alias in getattr(settings, 'DATABASE_REPLICAS', [])
+            if alias in settings.DATABASES and not _same_database(connections[alias].settings_dict, primary)]
+
+
+def sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+
+def pinned_to_primary():
+    return _pinned.get() or _wrote.get()
+
+
+def read_alias():
+    """Окуу үчүн база: реплика, же жазуудан кийин / реплика жок болсо негизги база."""
+    aliases = replicas()
+    if not aliases or pinned_to_primary():
+        return DEFAULT_DB_ALIAS
+    return random.choice(aliases)
+
+
+@contextmanager
+def use_primary():
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower in READ_REPLICA_MODELS:
+            return read_alias()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Мындан ары ушул сурамдын (же команданын) окуулары негизги базадан
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика негизги базанын көчүрмөсү: объекттер бир эле маалымат
+        allowed = {DEFAULT_DB_ALIAS, *replicas()}
+        return obj1._state.db in allowed and obj2._state.db in allowed
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replicas()
+
+
+class ReplicaStickinessMiddleware:
+    """Сурамдын ичинде жана жазуудан кийин REPLICA_STICKY_SECONDS бою негизги базада калуу."""
+
+    UNSAFE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replicas():
+            return self.get_response(request)
+        tokens = self._enter(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = self._exit(tokens)
+        return self._finish(request, response, wrote)
+
+    async def __acall__(self, request):
+        if not replicas():
+            return await self.get_response(request)
+        tokens = self._enter(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = self._exit(tokens)
+        return self._finish(request, response, wrote)
+
+    def _enter(self, request):
+        pinned = request.method in self.UNSAFE_METHODS or self._cookie_active(request)
+        return _pinned.set(pinned), _wrote.set(False)
+
+    def _exit(self, tokens):
+        wrote = _wrote.get()
+        _pinned.reset(tokens[0])
+        _wrote.reset(tokens[1])
+        return wrote
+
+    def _finish(self, request, response, wrote):
+        if wrote or request.method in self.UNSAFE_METHODS:
+            seconds = sticky_seconds()
+            response.set_cookie(STICKY_COOKIE, str(int(time.time()) + seconds), max_age=seconds,
+                                httponly=True, samesite='Lax')
+        return response
+
+    def _cookie_active(self, request):
+        try:
+            return int(request.COOKIES.get(STICKY_COOKIE, 0)) >= time.time()
+        except ValueError:
+            return False
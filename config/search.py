@@ -0,0 +1,181 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, When
+from django.utils.module_loading import import_string
+
+from .models import Service
+
+
+# =========================================================
+# КЫЗМАТТАРДЫ ИЗДӨӨ (толук тексттик индекс)
+# =========================================================
+# Индекске кызматтын аты, сүрөттөмөсү, категориясынын жана имаратынын
+# аты кирет. Индекс signals.py аркылуу save/delete учурунда жаңыланат,
+# толугу менен `manage.py rebuild_search_index` менен кайра курулат.
+
+# Unicode \w кириллицаны (кыргыз тамгалары ң, ө, ү кошо) сөз катары кабыл алат
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query.lower())[:10]
+
+
+def service_documents(queryset):
+    """(id, name, description, category, building) кортеждери бир JOIN менен."""
+    return queryset.order_by().values_list(
+        'id', 'name', 'description', 'category__name', 'building__name'
+    ).iterator(chunk_size=2000)
+
+
+class BaseSearchBackend:
+    def index(self, service_ids):
+        raise NotImplementedError
+
+    def remove(self, service_ids):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def ranked_ids(self, query, limit, queryset=None):
+        raise NotImplementedError
+
+    def restrict(self, column, queryset):
+        """queryset'тин фильтри (категория ж.б.) индекстин сурамына: LIMIT андан кийин
+        колдонулат, болбосо категориянын ичиндеги натыйжалар жалпы топ-N'ден тышта калат."""
+        if queryset is None or not queryset.query.where:
+            return '', []
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        return f' AND {column} IN ({sql})', list(params)
+
+    def search(self, query, queryset=None, limit=50):
+        """Рейтинг боюнча иреттелген Service queryset кайтарат."""
+        ids = self.ranked_ids(query, limit, queryset) if tokenize(query) else []
+        queryset = Service.objects.all() if queryset is None else queryset
+        if not ids:
+            return queryset.none()
+        rank = Case(*[When(pk=pk, then=pos) for pos, pk in enumerate(ids)], output_field=IntegerField())
+        return queryset.filter(pk__in=ids).order_by(rank)
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """SQLite FTS5: unicode61 токенизатору кириллицанын чоң/кичине тамгасын бириктирет,
+    prefix индекси type-ahead үчүн `сөз*` сурамдарын тездетет."""
+
+    table = 'config_service_fts'
+    # bm25 салмактары: аты > категория > имарат > сүрөттөмө
+    weights = (10.0, 1.0, 4.0, 2.0)
+
+    def index(self, service_ids):
+        rows = [
+            (pk, name, description, category or '', building or '')
+            for pk, name, description, category, building
+            in service_documents(Service.objects.filter(pk__in=service_ids))
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(pk,) for pk in service_ids])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, name, description, category, building) '
+                f'VALUES (%s, %s, %s, %s, %s)', rows)
+
+    def remove(self, service_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(pk,) for pk in service_ids])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, name, description, category, building) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                ((pk, n, d, c or '', b or '') for pk, n, d, c, b in service_documents(Service.objects.all())))
+
+    def ranked_ids(self, query, limit, queryset=None):
+        # Ар бир сөз префикс катары: "кра"* "оң"* (AND)
+        match = ' '.join('"%s"*' % token for token in tokenize(query))
+        bm25 = 'bm25(%s, %s)' % (self.table, ', '.join(str(w) for w in self.weights))
+        restrict, params = self.restrict('rowid', queryset)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s{restrict} ORDER BY {bm25} LIMIT %s',
+                [match, *params, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """PostgreSQL tsvector + GIN индекси. 'simple' конфигурациясы стемминг кылбайт,
+    ошондуктан кыргызча/орусча тексттер бирдей токенделет."""
+
+    table = 'config_service_search'
+    document_sql = (
+        "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'C') || setweight(to_tsvector('simple', %s), 'D')"
+    )
+
+    def _upsert(self, cursor, rows):
+        cursor.executemany(
+            f'INSERT INTO {self.table} (service_id, document) VALUES (%s, {self.document_sql}) '
+            f'ON CONFLICT (service_id) DO UPDATE SET document = EXCLUDED.document',
+            [(pk, n, c or '', b or '', d) for pk, n, d, c, b in rows])
+
+    def index(self, service_ids):
+        with connection.cursor() as cursor:
+            self._upsert(cursor, service_documents(Service.objects.filter(pk__in=service_ids)))
+
+    def remove(self, service_ids):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE service_id = ANY(%s)', [list(service_ids)])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {self.table}')
+            self._upsert(cursor, service_documents(Service.objects.all()))
+
+    def ranked_ids(self, query, limit, queryset=None):
+        tsquery = ' & '.join('%s:*' % token for token in tokenize(query))
+        restrict, params = self.restrict('service_id', queryset)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT service_id FROM {self.table}, to_tsquery('simple', %s) q "
+                f"WHERE document @@ q{restrict} ORDER BY ts_rank(document, q) DESC LIMIT %s",
+                [tsquery, *params, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """Индекси жок базалар үчүн запастык вариант (мурунку icontains издөө)."""
+
+    def index(self, service_ids):
+        pass
+
+    def remove(self, service_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, query, queryset=None, limit=50):
+        queryset = Service.objects.all() if queryset is None else queryset
+        for token in tokenize(query):
+            queryset = queryset.filter(Q(name__icontains=token) | Q(description__icontains=token))
+        return queryset[:limit]
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    path = getattr(settings, 'SERVICE_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, LikeSearchBackend)()
+
+
+def search_services(query, queryset=None, limit=50):
+    return get_search_backend().search(query, queryset=queryset, limit=limit)
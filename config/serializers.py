@@ -1,5 +1,9 @@
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from .models import User, Building, Service, Order, OrderHistory
+from .models import User, Building, Category, Service, Order, OrderHistory
+from .slots import SlotUnavailable, move_slot, slot_changed, slot_state
+from .thumbnails import FORMATS, get_renditions, rendition_url
 
 
 # ==========================================
@@ -13,23 +17,32 @@ class RegisterSerializer(serializers.ModelSerializer):
         model = User
         fields = ('phone', 'first_name', 'last_name', 'email', 'password')
 
-    # Телефон номерин текшерүү (Validation)
-    def validate_phone(self, value):
-        if User.objects.filter(phone=value).exists():
-            raise serializers.ValidationError("Бул телефон номери менен колдонуучу мурун катталган!")
-        return value
+    # Телефондун уникалдуулугун базанын UNIQUE чектөөсү текшерет (phone жана
+    # username=phone): мурунку exists() + INSERT жарышта экөө тең өтүп кетчү.
+    def build_user(self, password_hash):
+        data = self.validated_data
+        return User(
+            username=data['phone'],
+            phone=data['phone'],
+            first_name=data.get('first_name', ''),
+            last_name=data.get('last_name', ''),
+            email=data.get('email', ''),
+            password=password_hash,
+            role='USER',
+        )
 
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data['phone'],
-            phone=validated_data['phone'],
-            first_name=validated_data.get('first_name', ''),
-            last_name=validated_data.get('last_name', ''),
-            email=validated_data.get('email', ''),
-            password=validated_data['password'],
-            role='USER'
-        )
-        return user
+        return save_new_user(self.build_user(make_password(validated_data['password'])))
+
+
+def save_new_user(user):
+    """Бир INSERT; телефон бош эмес болсо ValidationError."""
+    try:
+        with transaction.atomic():
+            user.save(force_insert=True)
+    except IntegrityError:
+        raise serializers.ValidationError({'phone': ["Бул телефон номери менен колдонуучу мурун катталган!"]})
+    return user
 
 
 # ==========================================
@@ -42,15 +55,45 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
+class RenditionsField(serializers.Field):
+    """{'card': {'webp': url, 'jpg': url}, ...} — клиент керектүү өлчөмдү тандайт."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'image')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, image):
+        if not image:
+            return None
+        request = self.context.get('request')
+        build = request.build_absolute_uri if request else (lambda url: url)
+        return {
+            rendition: {fmt: build(rendition_url(image, rendition, fmt)) for fmt in FORMATS}
+            for rendition in get_renditions()
+        }
+
+
 class BuildingSerializer(serializers.ModelSerializer):
+    image_renditions = RenditionsField()
+
     class Meta:
         model = Building
         fields = '__all__'
 
 
+class CategorySerializer(serializers.ModelSerializer):
+    image_renditions = RenditionsField()
+
+    class Meta:
+        model = Category
+        fields = '__all__'
+
+
 class ServiceSerializer(serializers.ModelSerializer):
     # Бааны $ менен чыгаруучу талаа
     price_display = serializers.SerializerMethodField()
+    image_renditions = RenditionsField()
 
     class Meta:
         model = Service
@@ -69,25 +112,35 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = ('id', 'date', 'time', 'status', 'comment', 'created_at', 'user', 'service', 'building')
 
+    def update(self, instance, validated_data):
+        # Өзгөргөн талааларды гана жазабыз: статус workflow.transition аркылуу шарттуу UPDATE менен өзгөрөт
+        before = slot_state(instance)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if validated_data:
+            try:
+                with transaction.atomic():
+                    instance.save(update_fields=list(validated_data))
+                    if slot_changed(instance, before):
+                        move_slot(instance)
+            except SlotUnavailable as exc:
+                raise serializers.ValidationError({'time': [str(exc)]})
+        return instance
+
 
 class OrderHistorySerializer(serializers.ModelSerializer):
     order = serializers.PrimaryKeyRelatedField(read_only=True)
-    old_status = serializers.SerializerMethodField()
-    new_status = serializers.SerializerMethodField()
+    # Базада коддор сакталат, текст окуу учурунда чыгарылат
+    old_status = serializers.CharField(source='get_old_status_display', read_only=True)
+    new_status = serializers.CharField(source='get_new_status_display', read_only=True)
+    old_status_code = serializers.CharField(source='old_status', read_only=True)
+    new_status_code = serializers.CharField(source='new_status', read_only=True)
 
     class Meta:
         model = OrderHistory
-        fields = ('id', 'order', 'old_status', 'new_status', 'change_date')
-
-    STATUS_DISPLAY = {
-        'NEW': 'Ожидания',
-        'PENDING': 'Ожидания',
-        'IN_PROGRESS': 'В процессе',
-        'DONE': 'Выполнено',
-    }
+        fields = ('id', 'order', 'old_status', 'new_status', 'old_status_code', 'new_status_code', 'change_date')
 
-    def get_old_status(self, obj):
-        return self.STATUS_DISPLAY.get(obj.old_status, obj.old_status)
 
-    def get_new_status(self, obj):
-        return self.STATUS_DISPLAY.get(obj.new_status, obj.new_status)
\ No newline at end of file
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
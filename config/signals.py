@@ -0,0 +1,161 @@
+import logging
+
+from django.contrib.auth.signals import user_logged_out
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user
+from .models import BookedSlot, Building, Category, Order, OrderDailyRollup, Review, Service, User
+from .caching import invalidate_catalog
+from .metrics import ORDERS_CREATED
+from .search import get_search_backend
+from .thumbnails import generate_renditions, has_renditions
+
+logger = logging.getLogger(__name__)
+
+
+# Пикир өчүрүлгөндө (каскад менен да) кызматтын рейтингин азайтуу.
+# post_delete Collector.delete() транзакциясынын ичинде чакырылат.
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    Service.apply_rating_delta(instance.service_id, -instance.rating, -1)
+
+
+# =========================================================
+# ИЗДӨӨ ИНДЕКСИН ЖАҢЫЛОО
+# =========================================================
+
+def _name_changed(update_fields):
+    return update_fields is None or 'name' in update_fields
+
+
+@receiver(post_save, sender=Service)
+def service_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is None or {'name', 'description', 'category', 'building'} & set(update_fields):
+        get_search_backend().index([instance.pk])
+
+
+@receiver(post_delete, sender=Service)
+def service_deleted(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Building)
+def catalog_group_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Категория/имараттын аты индекстелген кызматтардын документине кирет
+    if raw or created or not _name_changed(update_fields):
+        return
+    service_ids = list(instance.services.values_list('pk', flat=True))
+    if service_ids:
+        get_search_backend().index(service_ids)
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance, **kwargs):
+    # on_delete=SET_NULL сигналсыз UPDATE жасайт, ошондуктан id'лерди алдын ала сактайбыз
+    instance._search_service_ids = list(instance.services.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    service_ids = getattr(instance, '_search_service_ids', None)
+    if service_ids:
+        get_search_backend().index(service_ids)
+
+
+# =========================================================
+# КАТАЛОГДУН КЭШИН ЖАРАКСЫЗ КЫЛУУ
+# =========================================================
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Building)
+@receiver(post_delete, sender=Building)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def catalog_changed(sender, **kwargs):
+    invalidate_catalog()
+
+
+
+# =========================================================
+# СҮРӨТТӨРДҮН ВАРИАНТТАРЫ
+# =========================================================
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Building)
+def image_saved(sender, instance, raw=False, **kwargs):
+    # Жаңы жүктөлгөн файлдын аты жаңы болот, ошондуктан варианттары али жок
+    if raw or not instance.image or has_renditions(instance.image):
+        return
+    try:
+        generate_renditions(instance.image)
+    except (OSError, ValueError):
+        logger.warning("Сүрөттүн варианттары түзүлгөн жок: %s", instance.image.name, exc_info=True)
+
+
+
+# =========================================================
+# УБАКЫТТЫН БРОНУ
+# =========================================================
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    # Өчүрүлгөн заказдын орду бошойт (жокко чыгарылгандардыкы мурунтан бошотулган)
+    if instance.slot_id:
+        BookedSlot.objects.filter(pk=instance.slot_id).update(booked=F('booked') - 1)
+
+
+
+# =========================================================
+# КҮНҮМДҮК ОТЧЁТТОР
+# =========================================================
+
+@receiver(post_delete, sender=Order)
+def order_deleted_rollup(sender, instance, **kwargs):
+    # Каскад менен өчүрүлгөндө да (колдонуучу/кызмат) ошол эле транзакцияда
+    OrderDailyRollup.apply(instance.rollup_state(), -1)
+
+
+@receiver(post_save, sender=Order)
+def order_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ORDERS_CREATED.inc_on_commit()
+
+
+
+# =========================================================
+# АУТЕНТИФИКАЦИЯНЫН КЭШИ
+# =========================================================
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Пароль, роль, managed_building, is_active — баары save() аркылуу
+    invalidate_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def user_logged_out_cache(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(pre_delete, sender=Building)
+def building_deleting(sender, instance, **kwargs):
+    # managed_building on_delete=SET_NULL сигналсыз UPDATE менен тазаланат
+    invalidate_user(*instance.managers.values_list('pk', flat=True))
@@ -0,0 +1,139 @@
+from collections import defaultdict
+from datetime import date as date_cls, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import BookedSlot, Order, SlotCapacity
+
+
+# =========================================================
+# БОШ УБАКЫТТАР (slot availability)
+# =========================================================
+# Иш графиги (SlotCapacity) ар бир күн үчүн убакыттарды берет, ал эми
+# BookedSlot ар бир (имарат, кызмат, күн, убакыт) үчүн бир сап: канча
+# бронь бар жана канчага чейин болот. Бош убакыттар эки сурам менен
+# эсептелет (график + диапазондогу брондор), заказдардын тарыхы окулбайт.
+# Брондоо шарттуу `UPDATE ... SET booked = booked + 1 WHERE booked < capacity`
+# менен атомдук: эки кардар акыркы орунду бир учурда ала албайт.
+
+MAX_DAYS = 31
+# Булар өзгөрсө заказ башка BookedSlot'ко тиешелүү болот
+SLOT_FIELDS = ('date', 'time', 'service_id', 'building_id')
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+def _capacity_by_weekday(building_id, service_id):
+    rows = SlotCapacity.objects.filter(building_id=building_id).filter(
+        Q(service_id=service_id) | Q(service__isnull=True))
+    specific, general = defaultdict(list), defaultdict(list)
+    for row in rows:
+        (specific if row.service_id else general)[row.weekday].append(row)
+    # Кызматка өзүнчө график коюлган күндөрдө жалпы график колдонулбайт
+    return {day: specific.get(day) or general.get(day) for day in range(7) if specific.get(day) or general.get(day)}
+
+
+def _slot_times(window):
+    step = timedelta(minutes=window.slot_minutes)
+    current = datetime.combine(date_cls.min, window.start_time)
+    end = datetime.combine(date_cls.min, window.end_time)
+    while current + step <= end:
+        yield current.time()
+        current += step
+
+
+def slot_capacity(building_id, service_id, day, time, calendar=None):
+    """Графикте бул убакыт бар болсо анын сыйымдуулугу, болбосо None.
+    Имаратка график коюлбаса, чектөө жок (мурунку жүрүм-турум) — False."""
+    calendar = _capacity_by_weekday(building_id, service_id) if calendar is None else calendar
+    if not calendar:
+        return False
+    for window in calendar.get(day.weekday(), []):
+        if time in _slot_times(window):
+            return window.capacity
+    return None
+
+
+def free_slots(building_id, service_id, start, days=14):
+    """[(date, time, free), ...] — `start` күнүнөн баштап `days` күн ичиндеги бош убакыттар."""
+    days = max(1, min(days, MAX_DAYS))
+    end = start + timedelta(days=days - 1)
+    calendar = _capacity_by_weekday(building_id, service_id)
+    if not calendar:
+        return []
+    booked = {
+        (row['date'], row['time']): row['booked']
+        for row in BookedSlot.objects.filter(
+            building_id=building_id, service_id=service_id, date__range=(start, end)
+        ).values('date', 'time', 'booked')
+    }
+    now = timezone.localtime()
+    result = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day < now.date():
+            continue
+        for window in calendar.get(day.weekday(), []):
+            for time in _slot_times(window):
+                if day == now.date() and time <= now.time():
+                    continue
+                free = window.capacity - booked.get((day, time), 0)
+                if free > 0:
+                    result.append((day, time, free))
+    result.sort()
+    return result
+
+
+def reserve_slot(order):
+    """Заказ үчүн убакытты атомдук түрдө брондойт. График жок болсо эч нерсе кылбайт."""
+    capacity = slot_capacity(order.building_id, order.service_id, order.date, order.time)
+    if capacity is False:
+        return None
+    if capacity is None:
+        raise SlotUnavailable("Тандалган убакыт иш графигине кирбейт")
+    with transaction.atomic():
+        slot, _ = BookedSlot.objects.get_or_create(
+            building_id=order.building_id, service_id=order.service_id, date=order.date, time=order.time,
+            defaults={'capacity': capacity},
+        )
+        updated = BookedSlot.objects.filter(pk=slot.pk, booked__lt=capacity).update(
+            booked=F('booked') + 1, capacity=capacity)
+        if not updated:
+            raise SlotUnavailable("Бул убакытта бош бригада жок, башка убакыт тандаңыз")
+        Order.objects.filter(pk=order.pk).update(slot=slot)
+    order.slot = slot
+    return slot
+
+
+def release_slots(order_ids):
+    """Заказдардын брондорун бошотот (жокко чыгарылганда)."""
+    with transaction.atomic():
+        counts = (Order.objects.filter(pk__in=order_ids, slot__isnull=False)
+                  .values('slot').annotate(n=Count('pk')).order_by())
+        for row in counts:
+            BookedSlot.objects.filter(pk=row['slot']).update(booked=F('booked') - row['n'])
+        if counts:
+            Order.objects.filter(pk__in=order_ids).update(slot=None)
+
+
+def slot_state(order):
+    return {field: getattr(order, field) for field in SLOT_FIELDS}
+
+
+def slot_changed(order, before):
+    """before: заказ өзгөрө электеги slot_state()."""
+    return before != slot_state(order)
+
+
+def move_slot(order):
+    """Сакталган заказдын эски бронун бошотуп, жаңы убакытты брондойт — бир транзакцияда:
+    жаңы убакытта орун жок болсо SlotUnavailable, чакырган транзакция артка кайтат."""
+    with transaction.atomic():
+        release_slots([order.pk])
+        order.slot = None
+        if order.status != 'CANCELLED':
+            reserve_slot(order)
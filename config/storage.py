@@ -0,0 +1,58 @@
+import hashlib
+import posixpath
+import re
+
+from django.core.files.storage import FileSystemStorage
+
+
+# =========================================================
+# МАЗМУНУНУН ХЕШИ БОЮНЧА САКТАЛУУЧУ МЕДИА
+# =========================================================
+# services/Снимок.png -> services/3f/3fa2...e9.png
+# Бирдей файл эки жолу жүктөлсө, диске бир гана жолу жазылат. Файлдын аты
+# мазмуну менен гана өзгөрөт, ошондуктан аны CDN/прокси түбөлүк кэштей алат.
+# Баштапкы (кириллица) аты MediaAsset таблицасында метамаалымат катары калат.
+
+HASHED_NAME_RE = re.compile(r'^[0-9a-f]{64}(\.[\w-]+)+$')
+CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(content):
+    """SHA-256, файлды эс тутумга толук жүктөбөй, бөлүк-бөлүк окуйт."""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.match(posixpath.basename(name)))
+
+
+class HashedMediaStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        # Хештелген аттан алынган файлдар (мисалы <hash>.card.webp) ошол бойдон сакталат
+        if is_hashed_name(name):
+            return super().save(name, content, max_length=max_length)
+
+        original_name = posixpath.basename(getattr(content, 'name', None) or name)
+        directory, filename = posixpath.split(name.replace('\\', '/'))
+        ext = posixpath.splitext(filename)[1].lower()
+        digest = content_hash(content)
+        hashed = posixpath.join(directory, digest[:2], digest + ext)
+
+        if not self.exists(hashed):
+            hashed = super().save(hashed, content, max_length=max_length)
+        self._record(hashed, original_name, content)
+        return hashed
+
+    def _record(self, name, original_name, content):
+        from .models import MediaAsset
+        MediaAsset.objects.get_or_create(
+            name=name, defaults={'original_name': original_name[:255], 'size': content.size or 0})
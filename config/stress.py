@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import time
+
+
+# =========================================================
+# SQLITE ЖАЗУУ СТРЕСС-ТЕСТИ
+# =========================================================
+# Ар бир worker — өзүнчө процесс (WSGI worker'лер сыяктуу), өз Django
+# байланышы менен. Бир итерация — бир "заказ": кызматты окуп заказ түзүү
+# (+ күнүмдүк отчёт), статусун PAID кылуу (+ тарых) жана пикир калтыруу
+# (+ кызматтын рейтинги). Ар бир профиль бир эле даярдалган базанын
+# көчүрмөсүндө иштейт. Модулдагы импорттор функциялардын ичинде, анткени
+# spawn'дин баласы django.setup()'ка чейин бул модулду импорттойт.
+
+STRESS_USERS = 'stress_'
+
+
+def _setup_django(db_path, profile):
+    os.environ['SQLITE_PATH'] = db_path
+    os.environ['SQLITE_PROFILE'] = profile
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'servic.settings')
+    import django
+    django.setup()
+
+
+def prepare(db_path, workers):
+    """Миграциялар + бир имарат, бир кызмат жана ар бир worker үчүн колдонуучу."""
+    _setup_django(db_path, 'default')
+    from django.core.management import call_command
+    from config.models import Building, Category, Service, User
+
+    call_command('migrate', verbosity=0)
+    building = Building.objects.create(name="Стресс", address="-")
+    category = Category.objects.create(name="Стресс")
+    Service.objects.create(building=building, category=category, name="Стресс", description="-", price=1000)
+    User.objects.bulk_create(User(username=f'{STRESS_USERS}{i}', role='USER') for i in range(workers))
+
+
+def worker(db_path, profile, seconds, index, start, results):
+    _setup_django(db_path, profile)
+    from django.db import OperationalError, connection, transaction
+    from config.models import Order, Review, Service, User
+    from config.workflow import transition
+
+    user = User.objects.get(username=f'{STRESS_USERS}{index}')
+    connection.close()
+    start.wait()
+    done, errors, latencies = 0, 0, []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                service = Service.objects.get(name="Стресс")
+                order = Order.objects.create(user=user, service=service, building_id=service.building_id,
+                                             date='2030-01-01', time='10:00', status='WAITING_PAYMENT')
+            transition(order, 'PAID', user)
+            Review.objects.create(service=service, user=user, rating=5, comment="ok")
+        except OperationalError:
+            errors += 1
+            continue
+        done += 1
+        latencies.append(time.perf_counter() - started)
+    results.put((done, errors, latencies))
+
+
+def run(db_path, profile, workers, seconds):
+    ctx = multiprocessing.get_context('spawn')
+    start = ctx.Barrier(workers + 1, timeout=120)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(db_path, profile, seconds, i, start, results))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    # Баары django.setup() бүтүргөнчө күтөбүз, анан бир учурда баштайбыз
+    start.wait()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    done = sum(item[0] for item in collected)
+    errors = sum(item[1] for item in collected)
+    latencies = sorted(value for item in collected for value in item[2])
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        'profile': profile,
+        'workers': workers,
+        'seconds': seconds,
+        'orders': done,
+        'orders_per_second': round(done / seconds, 1),
+        'locked_errors': errors,
+        'p50_ms': round(pct(50), 1),
+        'p95_ms': round(pct(95), 1),
+    }
+
+
+def prepare_template(db_path, workers):
+    ctx = multiprocessing.get_context('spawn')
+    process = ctx.Process(target=prepare, args=(db_path, workers))
+    process.start()
+    process.join()
+    if process.exitcode:
+        raise RuntimeError("Стресс-тесттин базасы даярдалган жок")
@@ -0,0 +1,36 @@
+import json
+import os
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+from config.assets import MANIFEST_NAME
+
+register = template.Library()
+
+_manifest = {'mtime': None, 'entries': {}}
+
+
+def manifest():
+    """css/manifest.json (build_css); файл өзгөргөндө кайра окулат."""
+    path = finders.find(MANIFEST_NAME)
+    if not path:
+        return {}
+    try:
+        mtime = (path, os.stat(path).st_mtime)
+        if _manifest['mtime'] != mtime:
+            with open(path, encoding='utf-8') as fh:
+                _manifest.update(mtime=mtime, entries=json.load(fh))
+    except (OSError, ValueError):
+        return {}
+    return _manifest['entries']
+
+
+@register.simple_tag
+def built_static(name):
+    """build_css түзгөн файлдын URL'и (ManifestStaticFilesStorage сыяктуу: жок болсо ката)."""
+    path = manifest().get(name)
+    if not path:
+        raise ValueError(f"{MANIFEST_NAME}'да '{name}' жок: manage.py build_css иштетиңиз")
+    return static(path)
@@ -0,0 +1,23 @@
+from django import template
+from django.utils.html import format_html
+
+from config.thumbnails import rendition_url as _rendition_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def rendition_url(image, rendition, fmt='jpg'):
+    return _rendition_url(image, rendition, fmt)
+
+
+@register.simple_tag
+def picture(image, rendition, css_class='', alt=''):
+    """<picture>: WebP булагы + JPEG fallback, lazy-loading менен."""
+    if not image:
+        return ''
+    return format_html(
+        '<picture><source srcset="{}" type="image/webp">'
+        '<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async"></picture>',
+        _rendition_url(image, rendition, 'webp'), _rendition_url(image, rendition, 'jpg'), alt, css_class,
+    )
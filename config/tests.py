@@ -1,3 +1,1443 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time as time_module
+from datetime import date, time
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import Sum
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import (
+    User, Building, Category, Service, Review, Order, OrderHistory, MediaAsset, SlotCapacity, BookedSlot,
+    OrderDailyRollup, Client,
+)
+from . import assets
+from .authentication import CachedModelBackend, CachedTokenAuthentication
+from .benchmarks.data import generate
+from .benchmarks.runner import compare as compare_benchmarks, run as run_benchmark
+from .pagination import OrderCursorPagination
+from .events import get_broker, scope_for, status_event
+from .metrics import flush as flush_metrics, render as render_metrics
+from .profiling import ProfilingMiddleware
+from . import routers
+from .reports import rebuild_rollups
+from .search import get_search_backend, search_services
+from .slots import free_slots
+from .storage import is_hashed_name
+from .thumbnails import DEFAULT_RENDITIONS, rendition_name, rendition_names, rendition_url
+from .views import serve_media
+from .workflow import ConcurrentTransitionError, bulk_update_status, transition
+
+
+class CatalogFixtureMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.building = Building.objects.create(name="Ала-Тоо", address="Бишкек")
+        cls.category = Category.objects.create(name="Сантехника")
+        cls.service = Service.objects.create(
+            category=cls.category, building=cls.building,
+            name="Кран оңдоо", description="Суу кранын оңдоо", price=500,
+        )
+        cls.user = User.objects.create_user(username="aibek", password="pass12345", role='USER')
+
+    def setUp(self):
+        super().setUp()
+        # Тесттердин ортосунда DB артка кайтат, кэш болсо кайтпайт
+        cache.clear()
+
+
+class QueryBudgetMixin:
+    """Тизме endpoint'тери үчүн сурамдардын саны саптардын санынан көз каранды эместигин текшерет."""
+
+    def assertMaxQueries(self, url, max_queries, add_rows, extra_rows=5):
+        self.client.get(url)  # аутентификациянын кэши жылуу болсун
+        add_rows(1)
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        add_rows(extra_rows)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertLessEqual(len(many), max_queries, "\n".join(q['sql'] for q in many.captured_queries))
+        self.assertEqual(len(few), len(many), "Сурамдардын саны саптардын санына жараша өсүп жатат (N+1)")
+
+
+# =========================================================
+# 1. РЕЙТИНГ (Service.rating_*)
+# =========================================================
+
+class ServiceRatingTests(CatalogFixtureMixin, TestCase):
+    def assertRating(self, service, rating_sum, rating_count, rating_avg):
+        service.refresh_from_db()
+        self.assertEqual(service.rating_sum, rating_sum)
+        self.assertEqual(service.rating_count, rating_count)
+        self.assertAlmostEqual(service.rating_avg, rating_avg)
+
+    def test_create_edit_delete_keep_aggregates(self):
+        first = Review.objects.create(service=self.service, user=self.user, rating=5, comment="Мыкты")
+        Review.objects.create(service=self.service, user=self.user, rating=2, comment="Начар")
+        self.assertRating(self.service, 7, 2, 3.5)
+
+        first = Review.objects.get(pk=first.pk)
+        first.rating = 4
+        first.save()
+        self.assertRating(self.service, 6, 2, 3.0)
+
+        first.delete()
+        self.assertRating(self.service, 2, 1, 2.0)
+
+        Review.objects.all().delete()
+        self.assertRating(self.service, 0, 0, 0.0)
+
+    def test_moving_review_between_services(self):
+        other = Service.objects.create(building=self.building, name="Жарык", description="-", price=100)
+        review = Review.objects.create(service=self.service, user=self.user, rating=4, comment="Жакшы")
+        review.service = other
+        review.save()
+        self.assertRating(self.service, 0, 0, 0.0)
+        self.assertRating(other, 4, 1, 4.0)
+
+    def test_rebuild_ratings_command(self):
+        Review.objects.create(service=self.service, user=self.user, rating=3, comment="Орто")
+        Service.objects.update(rating_sum=0, rating_count=0, rating_avg=0)
+        call_command('rebuild_ratings', stdout=StringIO())
+        self.assertRating(self.service, 3, 1, 3.0)
+
+    def test_rebuild_ratings_invalidates_catalog_cache(self):
+        Review.objects.create(service=self.service, user=self.user, rating=3, comment="Орто")
+        self.client.force_login(self.user)
+        url = reverse('service_detail', args=[self.service.pk])
+        self.assertContains(self.client.get(url), "3.0")
+        Review.objects.update(rating=5)  # сигналсыз: кэш да, рейтинг да эски
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_ratings', stdout=StringIO())
+        self.assertContains(self.client.get(url), "5.0")
+
+    def test_detail_page_renders_rating_without_aggregate_query(self):
+        Review.objects.create(service=self.service, user=self.user, rating=5, comment="Мыкты")
+        self.client.force_login(self.user)
+        with self.assertNumQueries(4):  # сессия, колдонуучу, кызмат, пикирлер
+            response = self.client.get(reverse('service_detail', args=[self.service.pk]))
+        self.assertContains(response, "(1 пикир)")
+
+
+# =========================================================
+# 2. ИНДЕКСТЕР (EXPLAIN QUERY PLAN)
+# =========================================================
+
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN форматы SQLite үчүн гана")
+class OrderIndexPlanTests(CatalogFixtureMixin, TestCase):
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_dashboard_querysets_use_composite_indexes(self):
+        self.assertUsesIndex(
+            Order.objects.filter(building=self.building).order_by('-created_at'), 'order_building_created_idx')
+        self.assertUsesIndex(
+            Order.objects.filter(user=self.user).order_by('-created_at'), 'order_user_created_idx')
+        self.assertUsesIndex(
+            Order.objects.filter(status='NEW').order_by('-created_at'), 'order_status_created_idx')
+
+    def test_order_history_uses_composite_index(self):
+        self.assertUsesIndex(
+            OrderHistory.objects.filter(order_id=1).order_by('-change_date'), 'orderhistory_order_date_idx')
+
+
+# =========================================================
+# 3. API ПАГИНАЦИЯСЫ (курсор)
+# =========================================================
+
+class OrderCursorPaginationTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(7):
+            Order.objects.create(user=cls.user, service=cls.service, building=cls.building,
+                                 date='2026-03-01', time='10:00')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_pages_walk_all_orders_newest_first(self):
+        url = reverse('order-list') + '?page_size=3'
+        seen = []
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['results']), 3)
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        expected = list(Order.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(OrderCursorPagination, 'max_page_size', 2):
+            data = self.client.get(reverse('order-list') + '?page_size=1000').json()
+        self.assertEqual(len(data['results']), 2)
+
+
+
+# =========================================================
+# 4. N+1 ЖОК ТИЗМЕЛЕР
+# =========================================================
+
+class OrderListQueryTests(QueryBudgetMixin, CatalogFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user(username="admin", password="pass12345", role='ADMIN')
+        self.client.force_login(self.admin)
+
+    def add_orders(self, count):
+        Order.objects.bulk_create(
+            Order(user=self.user, service=self.service, building=self.building,
+                  date='2026-03-01', time='10:00') for _ in range(count))
+
+    def test_order_api_list(self):
+        self.assertMaxQueries(reverse('order-list'), 3, self.add_orders)
+
+    def test_dashboard(self):
+        self.assertMaxQueries(reverse('dashboard'), 3, self.add_orders)
+
+
+# =========================================================
+# 5. ИЗДӨӨ (FTS5)
+# =========================================================
+
+@skipUnless(connection.vendor == 'sqlite', "FTS5 индекси SQLite үчүн")
+class ServiceSearchTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.electric = Service.objects.create(
+            building=cls.building, name="Электр зымдарын алмаштыруу",
+            description="Кран жанындагы розетка", price=900,
+        )
+
+    def test_prefix_and_case_insensitive_cyrillic(self):
+        self.assertEqual(list(search_services("КРА")), [self.service, self.electric])
+        self.assertEqual(list(search_services("электр")), [self.electric])
+        self.assertEqual(list(search_services("сантех")), [self.service])  # категориянын аты
+
+    def test_index_follows_saves_and_deletes(self):
+        self.building.name = "Жибек Жолу"
+        self.building.save()
+        self.assertEqual(set(search_services("жибек")), {self.service, self.electric})
+
+        self.electric.delete()
+        self.assertEqual(list(search_services("электр")), [])
+
+    def test_home_and_api_search(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('home'), {'q': 'электр'})
+        self.assertEqual(list(response.context['services']), [self.electric])
+
+        data = self.client.get(reverse('service-search'), {'q': 'кр'}).json()
+        self.assertEqual([row['id'] for row in data], [self.service.pk, self.electric.pk])
+
+    def test_limit_applies_after_queryset_filter(self):
+        Service.objects.bulk_create([
+            Service(building=self.building, name="Кран", description="Кран кран", price=100) for _ in range(3)])
+        get_search_backend().rebuild()
+        in_category = Service.objects.filter(category=self.category)
+        self.assertEqual(list(search_services("кран", queryset=in_category, limit=2)), [self.service])
+
+        self.client.force_login(self.user)
+        with mock.patch('config.views.search_services', lambda q, queryset: search_services(q, queryset, limit=2)):
+            response = self.client.get(reverse('home'), {'q': 'кран', 'category': self.category.pk})
+        self.assertEqual(list(response.context['services']), [self.service])
+
+
+
+# =========================================================
+# 6. КАТАЛОГДУН КЭШИ
+# =========================================================
+
+class CatalogCacheTests(CatalogFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_home_served_from_cache_until_catalog_changes(self):
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(1):  # сессия гана (колдонуучу кэштен)
+            self.client.get(reverse('home'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(building=self.building, name="Эшик орнотуу", description="-", price=300)
+        self.assertContains(self.client.get(reverse('home')), "Эшик орнотуу")
+
+    def test_arbitrary_query_params_share_cache_entry(self):
+        self.client.get(reverse('home'))
+        for params in ({'category': 'abc'}, {'sort': 'x' * 50}, {'category': '1 OR 1', 'sort': 'price'}):
+            with self.assertNumQueries(1):  # сессия гана: кызматтар ошол эле жазуудан
+                self.client.get(reverse('home'), params)
+
+    def test_review_invalidates_service_detail(self):
+        url = reverse('service_detail', args=[self.service.pk])
+        self.assertContains(self.client.get(url), "(0 пикир)")
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        Review.objects.create(service=self.service, user=self.user, rating=5, comment="Мыкты")
+        self.assertContains(self.client.get(url), "(1 пикир)")
+
+
+# =========================================================
+# 7. ШАРТТУУ GET (ETag / Last-Modified)
+# =========================================================
+
+class ConditionalGetTests(CatalogFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_list_answers_304_without_serializing(self):
+        url = reverse('service-list')
+        first = self.client.get(url)
+        self.assertIn('ETag', first)
+        self.assertNotIn('Last-Modified', first)
+        with mock.patch('config.serializers.ServiceSerializer.to_representation') as serialize:
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        serialize.assert_not_called()
+
+    def test_etag_changes_after_write(self):
+        url = reverse('service-detail', args=[self.service.pk])
+        etag = self.client.get(url)['ETag']
+        Review.objects.create(service=self.service, user=self.user, rating=4, comment="Жакшы")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_not_modified_only_by_etag_after_delete(self):
+        other = Service.objects.create(building=self.building, name="Жарык", description="-", price=100)
+        url = reverse('service-list')
+        first = self.client.get(url)
+        since = http_date(time_module.time() + 60)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+        other.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'], HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+
+        detail = self.client.get(reverse('service-detail', args=[self.service.pk]))
+        self.assertIn('Last-Modified', detail)
+
+    def test_category_and_building_lists(self):
+        for name in ('category-list', 'building-list'):
+            etag = self.client.get(reverse(name))['ETag']
+            self.assertEqual(self.client.get(reverse(name), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+
+# =========================================================
+# 8. СҮРӨТТӨРДҮН ВАРИАНТТАРЫ
+# =========================================================
+
+def make_png(size=(1600, 900)):
+    buffer = BytesIO()
+    Image.new('RGBA', size, (200, 80, 20, 255)).save(buffer, 'PNG')
+    return SimpleUploadedFile('Снимок экрана.png', buffer.getvalue(), content_type='image/png')
+
+
+class ThumbnailTests(CatalogFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_upload_generates_renditions(self):
+        self.service.image = make_png()
+        self.service.save()
+        storage = self.service.image.storage
+        for name in rendition_names(self.service.image.name):
+            self.assertTrue(storage.exists(name), name)
+        with storage.open(rendition_name(self.service.image.name, 'card', 'jpg')) as card:
+            self.assertEqual(Image.open(card).size, (800, 448))
+
+    def test_template_tag_and_serializer(self):
+        self.service.image = make_png()
+        self.service.save()
+        html = Template("{% load media_tags %}{% picture service.image 'card' %}").render(
+            Context({'service': self.service}))
+        self.assertRegex(html, r'\.card\.[0-9a-f]{8}\.webp')
+        self.assertRegex(html, r'\.card\.[0-9a-f]{8}\.jpg')
+
+        self.client.force_login(self.user)
+        data = self.client.get(reverse('service-detail', args=[self.service.pk])).json()
+        self.assertRegex(data['image_renditions']['detail']['webp'], r'\.detail\.[0-9a-f]{8}\.webp$')
+
+    def test_backfill_command(self):
+        self.service.image = make_png()
+        self.service.save()
+        storage = self.service.image.storage
+        for name in rendition_names(self.service.image.name):
+            storage.delete(name)
+        # Жазуусу жок эски сап (миграциядан мурунку сүрөт)
+        Service.objects.filter(pk=self.service.pk).update(image_renditions=[])
+        call_command('build_thumbnails', stdout=StringIO())
+        self.assertTrue(storage.exists(rendition_name(self.service.image.name, 'admin', 'webp')))
+        self.assertCountEqual(Service.objects.get(pk=self.service.pk).image_renditions,
+                              rendition_names(self.service.image.name))
+
+    def test_urls_come_from_record_and_change_with_spec(self):
+        self.service.image = make_png()
+        self.service.save()
+        image = Service.objects.get(pk=self.service.pk).image
+        card = rendition_name(image.name, 'card', 'jpg')
+        self.assertTrue(is_hashed_name(card))
+        with mock.patch.object(image.storage, 'exists', side_effect=AssertionError):
+            self.assertEqual(rendition_url(image, 'card'), image.storage.url(card))
+
+        # Өлчөм өзгөрсө — жаңы ат; кайра түзүлгөнчө оригинал берилет (эски immutable URL эмес)
+        renditions = {**DEFAULT_RENDITIONS, 'card': {'size': (400, 224), 'crop': True}}
+        with override_settings(IMAGE_RENDITIONS=renditions):
+            resized = rendition_name(image.name, 'card', 'jpg')
+            self.assertNotEqual(resized, card)
+            self.assertEqual(rendition_url(image, 'card'), image.url)
+            call_command('build_thumbnails', stdout=StringIO())
+            image = Service.objects.get(pk=self.service.pk).image
+            self.assertEqual(rendition_url(image, 'card'), image.storage.url(resized))
+            with image.storage.open(resized) as fh:
+                self.assertEqual(Image.open(fh).size, (400, 224))
+
+
+# =========================================================
+# 9. ХЕШ БОЮНЧА САКТАЛУУЧУ МЕДИА
+# =========================================================
+
+class HashedMediaStorageTests(CatalogFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_identical_uploads_share_one_file(self):
+        other = Service.objects.create(building=self.building, name="Жарык", description="-", price=100)
+        self.service.image = make_png()
+        self.service.save()
+        other.image = make_png()
+        other.save()
+
+        self.assertEqual(self.service.image.name, other.image.name)
+        self.assertTrue(is_hashed_name(self.service.image.name))
+        self.assertEqual(MediaAsset.objects.get(name=other.image.name).original_name, 'Снимок экрана.png')
+
+    def test_hashed_media_is_served_immutable(self):
+        self.service.image = make_png()
+        self.service.save()
+        # Тесттерде DEBUG=False, ошондуктан view'ду түз чакырабыз
+        response = serve_media(RequestFactory().get(self.service.image.url), self.service.image.name)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_dedupe_media_command(self):
+        storage = self.service.image.storage
+        os.makedirs(storage.path('services'))
+        content = make_png().read()
+        for name in ('services/a.png', 'services/a_hWyvFDv.png'):
+            with open(storage.path(name), 'wb') as fh:
+                fh.write(content)
+        other = Service.objects.create(building=self.building, name="Жарык", description="-", price=100)
+        Service.objects.filter(pk=self.service.pk).update(image='services/a.png')
+        Service.objects.filter(pk=other.pk).update(image='services/a_hWyvFDv.png')
+
+        call_command('dedupe_media', stdout=StringIO())
+
+        names = set(Service.objects.values_list('image', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertTrue(is_hashed_name(names.pop()))
+        self.assertFalse(storage.exists('services/a_hWyvFDv.png'))
+
+
+# =========================================================
+# 10. КӨП ЗАКАЗДЫН СТАТУСУН ӨЗГӨРТҮҮ
+# =========================================================
+
+class BulkStatusTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_building = Building.objects.create(name="Дордой", address="Бишкек")
+        cls.manager = User.objects.create_user(username="manager", password="pass12345", role='MANAGER',
+                                               managed_building=cls.building)
+        cls.orders = [
+            Order.objects.create(user=cls.user, service=cls.service, building=cls.building,
+                                 date='2026-03-01', time='10:00')
+            for _ in range(4)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.manager)
+
+    def test_api_updates_all_and_writes_history_in_few_queries(self):
+        ids = [order.pk for order in self.orders]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('order-bulk-status'), {'ids': ids, 'status': 'IN_PROGRESS'},
+                                        content_type='application/json')
+        self.assertEqual(response.json(), {'updated': 4})
+        self.assertEqual(set(Order.objects.values_list('status', flat=True)), {'IN_PROGRESS'})
+        self.assertEqual(OrderHistory.objects.filter(new_status='IN_PROGRESS', changed_by=self.manager).count(), 4)
+        writes = [q['sql'] for q in queries.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))
+                  and 'config_orderdailyrollup' not in q['sql']]
+        self.assertEqual(len(writes), 2)
+
+    def test_foreign_building_rejects_whole_batch(self):
+        foreign = Order.objects.create(user=self.user, service=self.service, building=self.other_building,
+                                       date='2026-03-01', time='10:00')
+        response = self.client.post(reverse('order-bulk-status'),
+                                    {'ids': [self.orders[0].pk, foreign.pk], 'status': 'DONE'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Order.objects.filter(status='DONE').exists())
+        self.assertFalse(OrderHistory.objects.exists())
+
+    def test_dashboard_multi_select(self):
+        response = self.client.post(reverse('dashboard_bulk_status'),
+                                    {'orders': [self.orders[0].pk, self.orders[1].pk], 'status': 'IN_PROGRESS'})
+        self.assertRedirects(response, reverse('dashboard'))
+        self.assertEqual(Order.objects.filter(status='IN_PROGRESS').count(), 2)
+
+    def test_disallowed_transition_rejects_whole_batch(self):
+        Order.objects.filter(pk=self.orders[0].pk).update(status='IN_PROGRESS')
+        response = self.client.post(reverse('order-bulk-status'),
+                                    {'ids': [order.pk for order in self.orders], 'status': 'DONE'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.filter(status='DONE').exists())
+
+
+# =========================================================
+# 11. СТАТУСТАРДЫН АБАЛДАР МАШИНАСЫ
+# =========================================================
+
+class OrderTransitionTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.manager = User.objects.create_user(username="manager", password="pass12345", role='MANAGER',
+                                               managed_building=cls.building)
+
+    def setUp(self):
+        super().setUp()
+        self.order = Order.objects.create(user=self.user, service=self.service, building=self.building,
+                                          date='2026-03-01', time='10:00', status='WAITING_PAYMENT')
+
+    def test_history_records_codes(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse('payment_page', args=[self.order.pk]))
+        log = OrderHistory.objects.get(order=self.order)
+        self.assertEqual((log.old_status, log.new_status), ('WAITING_PAYMENT', 'PAID'))
+        self.assertEqual(log.get_new_status_display(), 'Төлөндү')
+
+    def test_url_status_outside_table_is_rejected(self):
+        self.client.force_login(self.manager)
+        self.client.get(reverse('update_status', args=[self.order.pk, 'DONE']))
+        self.client.get(reverse('update_status', args=[self.order.pk, 'HACKED']))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'WAITING_PAYMENT')
+        self.assertFalse(OrderHistory.objects.exists())
+
+    def test_stale_transition_is_not_applied_twice(self):
+        stale = Order.objects.get(pk=self.order.pk)
+        transition(self.order, 'PAID', self.manager)
+        with self.assertRaises(ConcurrentTransitionError):
+            transition(stale, 'CANCELLED', self.manager)
+        self.assertEqual(Order.objects.get(pk=self.order.pk).status, 'PAID')
+        self.assertEqual(OrderHistory.objects.count(), 1)
+
+    def test_api_update_uses_transition_table(self):
+        self.client.force_login(self.manager)
+        url = reverse('order-detail', args=[self.order.pk])
+        response = self.client.patch(url, {'status': 'DONE'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(url, {'status': 'PAID'}, content_type='application/json')
+        self.assertEqual(response.json()['status'], 'PAID')
+        data = self.client.get(reverse('orderhistory-list')).json()['results']
+        self.assertEqual(data[0]['new_status_code'], 'PAID')
+
+
+# =========================================================
+# 12. БОШ УБАКЫТТАР ЖАНА БРОНДОО
+# =========================================================
+
+class SlotAvailabilityTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.day = date(2030, 1, 7)  # дүйшөмбү
+        SlotCapacity.objects.create(building=cls.building, weekday=0, start_time=time(9), end_time=time(12),
+                                    slot_minutes=60, capacity=2)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def book(self, at='09:00'):
+        return self.client.post(reverse('create_order'), {
+            'service': self.service.pk, 'building': self.building.pk, 'date': self.day.isoformat(), 'time': at,
+        })
+
+    def test_free_slots_in_two_queries(self):
+        with self.assertNumQueries(2):
+            slots = free_slots(self.building.pk, self.service.pk, self.day, days=14)
+        mondays = [slot for slot in slots if slot[0] == self.day]
+        self.assertEqual(mondays, [(self.day, time(9), 2), (self.day, time(10), 2), (self.day, time(11), 2)])
+        self.assertEqual(len(slots), 6)  # эки дүйшөмбү x 3 убакыт
+
+    def test_capacity_is_enforced(self):
+        self.book()
+        self.book()
+        response = self.book()
+        self.assertIn("бош бригада жок", " ".join(str(m) for m in response.context['messages']))
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(BookedSlot.objects.get().booked, 2)
+
+        data = self.client.get(reverse('slot-availability'), {
+            'building': self.building.pk, 'service': self.service.pk, 'start': self.day.isoformat(), 'days': 1,
+        }).json()
+        self.assertEqual([slot['time'] for slot in data['slots']], ['10:00', '11:00'])
+
+    def test_time_outside_calendar_is_rejected(self):
+        response = self.book('13:30')
+        self.assertIn("иш графигине кирбейт", " ".join(str(m) for m in response.context['messages']))
+        self.assertFalse(Order.objects.exists())
+
+    def test_cancel_releases_slot(self):
+        self.book()
+        order = Order.objects.get()
+        transition(order, 'CANCELLED')
+        self.assertEqual(BookedSlot.objects.get().booked, 0)
+        self.assertIsNone(Order.objects.get().slot)
+
+    def booked(self):
+        return dict(BookedSlot.objects.values_list('time', 'booked'))
+
+    def test_editing_order_moves_reservation(self):
+        self.book()
+        self.book()
+        self.book('10:00')
+        order = Order.objects.get(time=time(10))
+        url = reverse('order-detail', args=[order.pk])
+
+        response = self.client.patch(url, {'time': '09:00'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('time', response.json())
+        self.assertEqual(self.booked(), {time(9): 2, time(10): 1})
+        self.assertEqual(Order.objects.get(pk=order.pk).time, time(10))
+
+        response = self.client.patch(url, {'time': '11:00'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.booked(), {time(9): 2, time(10): 0, time(11): 1})
+        self.assertEqual(Order.objects.get(pk=order.pk).slot.time, time(11))
+
+        # HTML форма: кызмат өзгөрсө бронь жаңы (имарат, кызмат) сабына өтөт
+        other = Service.objects.create(building=self.building, name="Жарык", description="-", price=100)
+        response = self.client.post(reverse('order_edit', args=[order.pk]), {
+            'service': other.pk, 'building': self.building.pk, 'status': order.status})
+        self.assertEqual(response.status_code, 302)
+        slot = Order.objects.get(pk=order.pk).slot
+        self.assertEqual((slot.service_id, slot.time, slot.booked), (other.pk, time(11), 1))
+        self.assertEqual(BookedSlot.objects.get(service=self.service, time=time(11)).booked, 0)
+
+
+# =========================================================
+# 13. КҮНҮМДҮК ОТЧЁТТОР
+# =========================================================
+
+class OrderRollupTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user(username="admin", password="pass12345", role='ADMIN')
+        cls.manager = User.objects.create_user(username="manager", password="pass12345", role='MANAGER',
+                                               managed_building=cls.building)
+
+    def create_order(self, **kwargs):
+        return Order.objects.create(user=self.user, service=self.service, building=self.building,
+                                    date='2026-03-01', time='10:00', **kwargs)
+
+    def snapshot(self):
+        return sorted(OrderDailyRollup.objects.filter(orders__gt=0)
+                      .values_list('day', 'building_id', 'service_id', 'status', 'orders', 'revenue', 'prepayment'))
+
+    def test_incremental_rollups_match_rebuild(self):
+        first = self.create_order()
+        second = self.create_order(status='WAITING_PAYMENT')
+        self.create_order(total_price=1000)
+        transition(second, 'PAID')
+        bulk_update_status(self.admin, [first.pk, second.pk], 'CANCELLED')
+        second.refresh_from_db()
+        second.comment = "Кардар баш тартты"
+        second.save()
+        Order.objects.get(total_price=1000).delete()
+
+        incremental = self.snapshot()
+        self.assertEqual([(row[3], row[4], row[5]) for row in incremental], [('CANCELLED', 2, 1000)])
+        rebuild_rollups()
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_stale_instance_save_after_transition(self):
+        order = self.create_order()
+        transition(order, 'IN_PROGRESS')
+        order.comment = "Уста жолдо"
+        order.save()
+        self.assertEqual([(row[3], row[4]) for row in self.snapshot()], [('IN_PROGRESS', 1)])
+
+    def test_save_without_snapshot_moves_existing_row(self):
+        order = self.create_order()
+        deferred = Order.objects.only('pk', 'status').get(pk=order.pk)
+        deferred.status = 'PAID'
+        deferred.save(update_fields=['status'])
+        self.assertEqual([(row[3], row[4]) for row in self.snapshot()], [('PAID', 1)])
+
+        rebuilt = Order(pk=order.pk, user=self.user, service=self.service, building=self.building,
+                        date=order.date, time=order.time, created_at=order.created_at, status='DONE')
+        rebuilt.save()
+        incremental = self.snapshot()
+        self.assertEqual([(row[3], row[4]) for row in incremental], [('DONE', 1)])
+        rebuild_rollups()
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_status_change_through_edit_form_counts_once(self):
+        order = self.create_order(total_price=100)
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('order_edit', args=[order.pk]), {
+            'service': self.service.pk, 'building': self.building.pk, 'status': 'IN_PROGRESS'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Order.objects.get(pk=order.pk).status, 'IN_PROGRESS')
+        incremental = self.snapshot()
+        self.assertEqual([(row[3], row[4], row[5]) for row in incremental], [('IN_PROGRESS', 1, 100)])
+        self.assertFalse(OrderDailyRollup.objects.filter(orders__lt=0).exists())
+        rebuild_rollups()
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_reports_api_reads_rollups_only(self):
+        self.create_order()
+        self.create_order(status='PAID')
+        other = Building.objects.create(name="Манас", address="Ош")
+        Order.objects.create(user=self.user, service=self.service, building=other, date='2026-03-01', time='10:00')
+        url = reverse('order-reports')
+        params = {'group_by': 'status'}
+
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get(url, params).json()['rows']
+        self.assertFalse([q for q in queries.captured_queries if 'config_order"' in q['sql']])
+        self.assertEqual({row['status']: row['order_count'] for row in rows}, {'NEW': 2, 'PAID': 1})
+
+        self.client.force_login(self.manager)
+        rows = self.client.get(url, params).json()['rows']
+        self.assertEqual({row['status']: row['order_count'] for row in rows}, {'NEW': 1, 'PAID': 1})
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_home_statistics(self):
+        self.create_order(status='PAID')
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['statistics'][0][:2], (1, "Заказдар"))
+
+
+# =========================================================
+# 14. АГЫМ МЕНЕН ЭКСПОРТТОО
+# =========================================================
+
+class OrderExportTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user(username="admin", password="pass12345", role='ADMIN')
+        cls.other = Building.objects.create(name="Манас", address="Ош")
+        cls.manager = User.objects.create_user(username="manager", password="pass12345", role='MANAGER',
+                                               managed_building=cls.other)
+        cls.order = Order.objects.create(user=cls.user, service=cls.service, building=cls.building,
+                                         date='2026-03-01', time='10:00', comment='Ашкана, "эски" кран')
+        Order.objects.create(user=cls.user, service=cls.service, building=cls.other, date='2026-03-02', time='11:00')
+        transition(cls.order, 'CANCELLED', cls.admin)
+
+    def export(self, name, **params):
+        response = self.client.get(reverse('order-export', args=name.split('.')), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_has_joined_columns(self):
+        self.client.force_login(self.admin)
+        rows = list(csv.DictReader(StringIO(self.export('orders.csv'))))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['service'], "Кран оңдоо")
+        self.assertEqual(rows[0]['category'], "Сантехника")
+        self.assertEqual(rows[0]['comment'], 'Ашкана, "эски" кран')
+
+    def test_jsonl_history_and_filters(self):
+        self.client.force_login(self.admin)
+        lines = self.export('history.jsonl', building=self.building.pk).splitlines()
+        self.assertEqual([json.loads(line)['new_status'] for line in lines], ['CANCELLED'])
+        self.assertEqual(self.export('orders.jsonl', start='2999-01-01'), '')
+
+    def test_manager_is_limited_to_own_building(self):
+        self.client.force_login(self.manager)
+        rows = list(csv.DictReader(StringIO(self.export('orders.csv'))))
+        self.assertEqual([row['building'] for row in rows], ["Манас"])
+        response = self.client.get(reverse('order-export', args=['orders', 'csv']), {'building': self.building.pk})
+        self.assertEqual(response.status_code, 403)
+
+    def test_command_writes_file(self):
+        path = os.path.join(tempfile.mkdtemp(), 'orders.jsonl')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        call_command('export_orders', '--format', 'jsonl', '--output', path, '--chunk-size', '1', stderr=StringIO())
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+
+# =========================================================
+# 15. КАТАЛОГДУ ИМПОРТТОО
+# =========================================================
+
+class ImportCatalogTests(CatalogFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        override = override_settings(MEDIA_ROOT=os.path.join(self.tmp, 'media'))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_catalog', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_services_upsert_with_images_and_row_errors(self):
+        with open(os.path.join(self.tmp, 'tap.png'), 'wb') as f:
+            f.write(make_png().read())
+        path = self.write('services.csv', (
+            "building,category,name,description,price,image\n"
+            "Ала-Тоо,Сантехника,Кран оңдоо,Жаңы сүрөттөмө,650,tap.png\n"
+            f"{self.building.pk},Сантехника,Душ орнотуу,Душ кабина,1200,\n"
+            "Белгисиз,Сантехника,Эшик,-,300,\n"
+            "Ала-Тоо,Сантехника,Мунай,-,акча,\n"
+        ))
+        out, err = self.run_import('services', path, '--images-dir', self.tmp)
+        self.assertIn("1 жаңы, 1 жаңыртылды, 2 ката", out)
+        self.assertIn("4-сап", err)
+        self.assertIn("5-сап", err)
+
+        self.service.refresh_from_db()
+        self.assertEqual((self.service.description, self.service.price), ("Жаңы сүрөттөмө", 650))
+        self.assertTrue(is_hashed_name(self.service.image.name))
+        self.assertEqual(Service.objects.count(), 2)
+        self.assertEqual(list(search_services('душ')), [Service.objects.get(name="Душ орнотуу")])
+
+    def test_service_relations_are_not_queried_per_row(self):
+        rows = "".join(f"Ала-Тоо,Сантехника,Кызмат {i},-,{100 + i},\n" for i in range(200))
+        path = self.write('services.csv', "building,category,name,description,price,image\n" + rows)
+        with CaptureQueriesContext(connection) as queries:
+            out, _ = self.run_import('services', path)
+        self.assertIn("200 жаңы, 0 жаңыртылды, 0 ката", out)
+        # Имараттар жана категориялар бир гана жолу окулат (ServiceImporter.__init__)
+        relations = [q['sql'] for q in queries.captured_queries
+                     if 'FROM "config_building"' in q['sql'] or 'FROM "config_category"' in q['sql']]
+        self.assertEqual(len(relations), 2, relations)
+        self.assertLess(len(queries), 15)
+
+    def test_clients_import_in_chunked_queries(self):
+        lines = [json.dumps({'first_name': f"Кардар {i}", 'last_name': "Уулу", 'phone': f"+99670000{i:04d}",
+                             'email': f"c{i}@example.kg"}) for i in range(2000)]
+        lines.append('{"first_name": "Ката", "phone": "1", "email": "emes"}')
+        path = self.write('clients.jsonl', "\n".join(lines))
+        with CaptureQueriesContext(connection) as queries:
+            out, err = self.run_import('clients', path)
+        self.assertIn("2000 жаңы, 0 жаңыртылды, 1 ката", out)
+        self.assertIn("2001-сап", err)
+        self.assertLess(len(queries), 30)
+
+        Client.objects.filter(phone="+996700000000").update(first_name="Эски")
+        out, _ = self.run_import('clients', path, '--chunk-size', '500')
+        self.assertIn("0 жаңы, 2000 жаңыртылды", out)
+        self.assertEqual(Client.objects.count(), 2000)
+        self.assertEqual(Client.objects.get(phone="+996700000000").first_name, "Кардар 0")
+
+
+# =========================================================
+# 16. БЕНЧМАРК
+# =========================================================
+
+class BenchmarkSmokeTests(TestCase):
+    def test_generator_and_scenarios_run(self):
+        volumes = {'buildings': 2, 'categories': 2, 'services': 6, 'clients': 5, 'reviews': 20, 'orders': 300}
+        generate(volumes, log=lambda message: None)
+        self.assertEqual(Order.objects.count(), 300)
+        self.assertGreater(OrderHistory.objects.count(), 300)
+        self.assertEqual(OrderDailyRollup.objects.aggregate(n=Sum('orders'))['n'], 300)
+
+        result = run_benchmark(iterations=2, log=lambda line: None)
+        for name, row in result['results'].items():
+            self.assertGreater(row['iterations'], 0, name)
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+        self.assertEqual(compare_benchmarks(result, result)[0].count('+0%'), 2)
+
+
+# =========================================================
+# 17. ПРОФИЛДӨӨ MIDDLEWARE
+# =========================================================
+
+PROFILING_ON = {'ENABLED': True, 'SLOW_REQUEST_MS': 10 ** 6, 'DUPLICATE_QUERY_THRESHOLD': 3}
+
+
+class ProfilingMiddlewareTests(CatalogFixtureMixin, TestCase):
+    def test_disabled_middleware_is_not_used(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: None)
+
+    @override_settings(PROFILING=PROFILING_ON)
+    def test_server_timing_header(self):
+        self.client.force_login(self.user)
+        header = self.client.get(reverse('home'))['Server-Timing']
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('template;dur=', header)
+        header = self.client.get(reverse('service-list'))['Server-Timing']
+        self.assertIn('serializer;dur=', header)
+
+    @override_settings(PROFILING=PROFILING_ON)
+    def test_n_plus_one_is_logged(self):
+        for i in range(3):
+            Service.objects.create(category=self.category, building=self.building, name=f"Кызмат {i}",
+                                   description="-", price=100)
+
+        def view(request):
+            names = [service.category.name for service in Service.objects.all()]  # N+1
+            return HttpResponse(", ".join(names))
+
+        with self.assertLogs('config.profiling', 'WARNING') as logs:
+            ProfilingMiddleware(view)(RequestFactory().get('/n-plus-one/'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['event'], 'duplicate_queries')
+        self.assertEqual(record['duplicates'][0]['count'], 4)
+        self.assertIn('config_category', record['duplicates'][0]['sql'])
+
+    @override_settings(PROFILING={**PROFILING_ON, 'SLOW_REQUEST_MS': 0, 'PROFILE_SAMPLE_RATE': 1.0})
+    def test_slow_request_is_logged_and_sampled(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with override_settings(PROFILING={**settings.PROFILING, 'PROFILE_DIR': directory}):
+            with self.assertLogs('config.profiling', 'WARNING') as logs:
+                ProfilingMiddleware(lambda request: HttpResponse('ok'))(RequestFactory().get('/slow/'))
+        self.assertEqual(json.loads(logs.records[0].getMessage())['event'], 'slow_request')
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+
+# =========================================================
+# 18. МЕТРИКАЛАР (/metrics)
+# =========================================================
+
+def metric_value(text, sample):
+    for line in text.splitlines():
+        if line.startswith(sample + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+class MetricsTests(CatalogFixtureMixin, TestCase):
+    def scrape(self):
+        with override_settings(METRICS={'ALLOWED_IPS': ['127.0.0.0/8']}):
+            response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_request_latency_and_business_counters(self):
+        before = self.scrape()
+        self.client.force_login(self.user)
+        self.client.get(reverse('home'))
+        order = Order.objects.create(user=self.user, service=self.service, building=self.building,
+                                     date='2026-03-01', time='10:00', status='WAITING_PAYMENT')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('payment_page', args=[order.pk]))
+        text = self.scrape()
+
+        home = 'http_request_duration_seconds_count{view="home",method="GET",status="2xx"}'
+        self.assertEqual(metric_value(text, home) - metric_value(before, home), 1)
+        self.assertIn('db_queries_per_request_bucket{view="home",le="+Inf"}', text)
+        transitions = 'order_status_transitions_total{from_status="WAITING_PAYMENT",to_status="PAID"}'
+        self.assertEqual(metric_value(text, transitions) - metric_value(before, transitions), 1)
+        self.assertEqual(metric_value(text, 'payments_accepted_total') - metric_value(before, 'payments_accepted_total'), 1)
+        self.assertIn('cache_requests_total{cache="catalog",result="miss"}', text)
+
+    def test_unknown_methods_share_one_label(self):
+        self.client.generic('FOO', reverse('home'))
+        self.client.generic('BAR', reverse('home'))
+        text = self.scrape()
+        self.assertNotIn('method="FOO"', text)
+        self.assertNotIn('method="BAR"', text)
+        self.assertIn('http_request_duration_seconds_count{view="home",method="other",', text)
+
+    def test_other_worker_files_are_aggregated(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, '99999-1.json'), 'w') as f:
+            json.dump({'orders_created_total': {'[]': 40}}, f)
+        with override_settings(METRICS={'DIR': directory, 'TOKEN': 'secret'}):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+            before = metric_value(render_metrics(), 'orders_created_total')
+            with self.captureOnCommitCallbacks(execute=True):
+                Order.objects.create(user=self.user, service=self.service, date='2026-03-01', time='10:00')
+            text = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret').content.decode()
+            flush_metrics(force=True)
+            self.assertEqual(len(os.listdir(directory)), 2)
+        self.assertEqual(metric_value(text, 'orders_created_total'), before + 1)
+        self.assertGreaterEqual(before, 40)
+
+    def test_endpoint_requires_token_or_allowed_ip(self):
+        url = reverse('metrics')
+        with override_settings(METRICS={}):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        with override_settings(METRICS={'ALLOWED_IPS': ['10.0.0.0/8']}):
+            self.assertEqual(self.client.get(url).status_code, 401)
+            self.assertEqual(self.client.get(url, REMOTE_ADDR='10.1.2.3').status_code, 200)
+            self.assertEqual(self.client.get(url, HTTP_X_FORWARDED_FOR='10.1.2.3').status_code, 401)
+        with override_settings(METRICS={'TOKEN': 'secret'}):
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+
+# =========================================================
+# 19. SQLITE PRODUCTION ПРОФИЛИ
+# =========================================================
+
+@skipUnless(connection.vendor == 'sqlite', "SQLite гана")
+class SQLiteProfileTests(TestCase):
+    def test_pragmas_applied_on_new_connection(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wrapper = type(connections['default'])({
+            **connection.settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3'),
+            'OPTIONS': settings.SQLITE_PRODUCTION_OPTIONS,
+        }, alias='sqlite-profile')
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            pragmas = {}
+            for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size'):
+                cursor.execute(f'PRAGMA {name}')
+                pragmas[name] = cursor.fetchone()[0]
+        self.assertEqual(pragmas['journal_mode'], 'wal')
+        self.assertEqual(pragmas['synchronous'], 1)  # NORMAL
+        self.assertEqual(pragmas['busy_timeout'], settings.SQLITE_PRODUCTION_OPTIONS['timeout'] * 1000)
+        self.assertLess(pragmas['cache_size'], 0)  # KiB менен
+        self.assertGreater(pragmas['mmap_size'], 0)
+        self.assertEqual(wrapper.transaction_mode, 'IMMEDIATE')
+
+
+# =========================================================
+# 20. READ-РЕПЛИКАЛАР
+# =========================================================
+
+@mock.patch('config.routers.replicas', return_value=['replica1'])
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = routers.PrimaryReplicaRouter()
+        token = routers._wrote.set(False)
+        self.addCleanup(routers._wrote.reset, token)
+
+    def test_catalog_reads_go_to_replica_until_write(self, _):
+        self.assertEqual(self.router.db_for_read(Service), 'replica1')
+        self.assertEqual(self.router.db_for_read(Order), 'default')
+        with routers.use_primary():
+            self.assertEqual(self.router.db_for_read(Service), 'default')
+        self.assertEqual(self.router.db_for_read(Service), 'replica1')
+        self.assertEqual(self.router.db_for_write(Service), 'default')
+        self.assertEqual(self.router.db_for_read(Service), 'default')
+        self.assertFalse(self.router.allow_migrate('replica1', 'config'))
+
+    def test_middleware_sticks_to_primary_after_write(self, _):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Service))
+            if request.GET.get('write'):
+                self.router.db_for_write(Order)
+            return HttpResponse()
+
+        middleware = routers.ReplicaStickinessMiddleware(view)
+        factory = RequestFactory()
+        self.assertNotIn(routers.STICKY_COOKIE, middleware(factory.get('/')).cookies)
+        response = middleware(factory.get('/?write=1'))
+        cookie = response.cookies[routers.STICKY_COOKIE].value
+        self.assertIn(routers.STICKY_COOKIE, middleware(factory.post('/')).cookies)
+
+        request = factory.get('/')
+        request.COOKIES[routers.STICKY_COOKIE] = cookie
+        middleware(request)
+        self.assertEqual(seen, ['replica1', 'replica1', 'default', 'default'])
+        # Сурамдан кийин абал калбайт
+        self.assertEqual(self.router.db_for_read(Service), 'replica1')
+
+
+# =========================================================
+# 21. ASYNC API (ASGI)
+# =========================================================
+
+class AsyncApiTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = User.objects.create_user(username="nurlan", password="pass12345", role='USER')
+        cls.orders = [Order.objects.create(user=cls.user, service=cls.service, date='2026-03-01', time=f'1{i}:00')
+                      for i in range(3)]
+        cls.foreign = Order.objects.create(user=cls.other, service=cls.service, date='2026-03-01', time='10:00')
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(reverse('async-service-list'))
+        self.assertEqual(response.status_code, 403)
+        response = await self.async_client.post(reverse('async-service-list'))
+        self.assertEqual(response.status_code, 405)
+
+    async def test_catalog_matches_drf_serializers(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('async-service-detail', args=[self.service.pk]))
+        self.assertEqual(response.json()['name'], "Кран оңдоо")
+        self.assertEqual(response.json()['price_display'], "$500.00")
+        response = await self.async_client.get(reverse('async-building-list'))
+        self.assertEqual([row['name'] for row in response.json()['results']], ["Ала-Тоо"])
+        response = await self.async_client.get(reverse('async-service-detail', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_orders_are_scoped_and_paginated(self):
+        await self.async_client.aforce_login(self.user)
+        url, seen = f"{reverse('async-order-list')}?page_size=2", []
+        while url:
+            data = (await self.async_client.get(url)).json()
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(seen, [order.pk for order in reversed(self.orders)])
+        response = await self.async_client.get(reverse('async-order-detail', args=[self.foreign.pk]))
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(f"{reverse('async-order-list')}?cursor=бузук")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_token_authentication(self):
+        token = await Token.objects.acreate(user=self.other)
+        response = await self.async_client.get(reverse('async-order-detail', args=[self.foreign.pk]),
+                                               headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(response.json()['user']['id'], self.other.pk)
+
+
+# =========================================================
+# 22. СТАТУСТУН ОКУЯЛАРЫ (SSE)
+# =========================================================
+
+@override_settings(ORDER_EVENTS={'ENABLED': True})
+class OrderEventsTests(CatalogFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_building = Building.objects.create(name="Манас", address="Бишкек")
+        cls.manager = User.objects.create_user(username="manager", password="pass12345", role='MANAGER',
+                                               managed_building=cls.building)
+        cls.stranger = User.objects.create_user(username="manager2", password="pass12345", role='MANAGER',
+                                                managed_building=cls.other_building)
+        cls.order = Order.objects.create(user=cls.user, service=cls.service, building=cls.building,
+                                         date='2026-03-01', time='10:00')
+
+    def test_transitions_reach_scoped_subscribers_after_commit(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        broker = get_broker()
+
+        async def subscribe():
+            return [broker.subscribe(scope_for(user)) for user in (self.user, self.manager, self.stranger)]
+
+        subscriptions = loop.run_until_complete(subscribe())
+        self.addCleanup(lambda: [subscription.close() for subscription in subscriptions])
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(self.order, 'PAID', self.manager)
+            bulk_update_status(self.manager, [self.order.pk], 'IN_PROGRESS')
+
+        async def drain(subscription):
+            await asyncio.sleep(0)
+            return [subscription.queue.get_nowait()['status'] for _ in range(subscription.queue.qsize())]
+
+        received = [loop.run_until_complete(drain(subscription)) for subscription in subscriptions]
+        self.assertEqual(received, [['PAID', 'IN_PROGRESS'], ['PAID', 'IN_PROGRESS'], []])
+
+    async def test_stream_requires_login_and_sends_events(self):
+        self.assertEqual((await self.async_client.get(reverse('order_events'))).status_code, 403)
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(f"{reverse('order_events')}?order={self.order.pk}")
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+
+        broker = get_broker()
+        foreign = status_event(self.order.pk + 1, self.user.pk, self.building.pk, 'NEW', 'PAID')
+        broker.publish([foreign, status_event(self.order.pk, self.user.pk, self.building.pk, 'NEW', 'PAID')])
+        chunk = (await anext(stream)).decode()
+        self.assertTrue(chunk.startswith('event: status\n'))
+        self.assertEqual(json.loads(chunk.split('data: ', 1)[1])['order'], self.order.pk)
+        # Кардар ажыраганда ASGI handler стримди токтотот -> жазылуу өчөт
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(broker.count(), 0)
+
+    def test_disabled_or_wsgi_stream_returns_no_content(self):
+        url = f"{reverse('order_events')}?order={self.order.pk}"
+        self.client.force_login(self.user)
+        async_to_sync(self.async_client.aforce_login)(self.user)
+        with override_settings(ORDER_EVENTS={'ENABLED': False}):
+            response = async_to_sync(self.async_client.get)(url)
+            self.assertEqual(response.status_code, 204)
+            html = self.client.get(reverse('order_detail', args=[self.order.pk])).content.decode()
+            self.assertNotIn('EventSource', html)
+        # Күйгүзүлгөн болсо да WSGI'ден келген сурамга стрим ачылбайт
+        self.assertEqual(self.client.get(url).status_code, 204)
+        self.assertEqual(get_broker().count(), 0)
+        self.assertIn('EventSource', self.client.get(reverse('dashboard')).content.decode())
+
+
+# =========================================================
+# 23. АУТЕНТИФИКАЦИЯНЫН КЭШИ
+# =========================================================
+
+class CachedAuthenticationTests(CatalogFixtureMixin, TestCase):
+    def authenticate(self, key):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {key}')
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_token_served_from_cache_and_invalidated(self):
+        token = Token.objects.create(user=self.user)
+        self.authenticate(token.key)
+        with self.assertNumQueries(0):
+            user, auth = self.authenticate(token.key)
+        self.assertEqual((user.pk, auth.key, auth.user_id), (self.user.pk, token.key, self.user.pk))
+
+        self.user.role = 'MANAGER'
+        self.user.managed_building = self.building
+        self.user.save()
+        user, _ = self.authenticate(token.key)
+        self.assertEqual((user.role, user.managed_building_id), ('MANAGER', self.building.pk))
+
+        token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token.key)
+
+    def test_session_user_invalidated_on_password_change_and_logout(self):
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.user.pk).password, self.user.password)
+        self.user.set_password('new-pass-123')
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(backend.get_user(self.user.pk).password, self.user.password)
+
+        self.client.force_login(self.user)
+        self.client.post(reverse('logout'))
+        with self.assertNumQueries(1):
+            backend.get_user(self.user.pk)
+
+    def test_sessions_from_previous_backend_stay_signed_in(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['user'].pk, self.user.pk)
+
+        self.client.logout()
+        response = self.client.post(reverse('signup'), {
+            'username': 'jany', 'password1': 'Kuchtuu-parol-77', 'password2': 'Kuchtuu-parol-77'})
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'config.authentication.CachedModelBackend')
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_warm_html_request_without_queries(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('home')).status_code, 200)
+
+
+# =========================================================
+# 24. КАТТОО
+# =========================================================
+
+class RegistrationTests(TestCase):
+    payload = {'phone': '+996700123456', 'first_name': "Айбек", 'password': 'secret123'}
+
+    def test_single_insert_and_duplicate_rejected_by_constraint(self):
+        url = reverse('register')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, self.payload, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        statements = [q['sql'].split()[0] for q in queries.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertEqual(statements, ['INSERT'])
+        user = User.objects.get(phone=self.payload['phone'])
+        self.assertEqual((user.username, user.role), (self.payload['phone'], 'USER'))
+        self.assertTrue(user.check_password('secret123'))
+
+        response = self.client.post(url, self.payload, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('phone', response.json())
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+    async def test_async_register_hashes_off_loop(self):
+        url = reverse('async-register')
+        threads = []
+
+        def recording_make_password(password):
+            threads.append(threading.current_thread().name)
+            return make_password(password)
+
+        with mock.patch('config.passwords.make_password', recording_make_password):
+            response = await self.async_client.post(url, self.payload, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith('password-hash'))
+        user = await User.objects.aget(phone=self.payload['phone'])
+        self.assertTrue(user.check_password('secret123'))
+        response = await self.async_client.post(url, self.payload, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.post(url, {'phone': '1', 'password': '1'}, content_type='application/json')
+        self.assertIn('password', response.json())
+
+
+# =========================================================
+# 25. ЖЕРГИЛИКТҮҮ CSS (build_css)
+# =========================================================
+
+FAKE_FONTAWESOME_CSS = (
+    '.fa-globe::before{content:"\\f0ac"}\n'
+    '.fa-moon::before,.fa-moon-o::before{content:"\\f186"}\n'
+    '.fa-tools::before{content:"\\f7d9"}\n'
+    '.fa-unused::before{content:"\\f000"}\n'
+)
+
+
+def copy_font(source, codepoints, target):
+    shutil.copyfile(source, target)
+    return False
+
+
+class BuildCssTests(TestCase):
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+
+    def test_compiles_only_known_utilities_in_order(self):
+        css, used = assets.compile_css({
+            'btn', 'card', 'p-4', 'pt-2', 'md:grid-cols-3', 'dark:hover:bg-slate-800', 'bg-white/80',
+            'min-h-[calc(100vh-80px)]', 'group-hover:scale-110', 'placeholder:text-slate-400', 'animate-ping',
+        })
+        self.assertNotIn('btn', used)
+        self.assertNotIn('.card', css)
+        self.assertIn('.dark .dark\\:hover\\:bg-slate-800:hover{background-color:#1e293b}', css)
+        self.assertIn('.bg-white\\/80{background-color:rgb(255 255 255 / 0.8)}', css)
+        self.assertIn('{min-height:calc(100vh - 80px)}', css)
+        self.assertIn('.group:hover .group-hover\\:scale-110{', css)
+        self.assertIn('.placeholder\\:text-slate-400::placeholder{color:#94a3b8}', css)
+        self.assertIn('@keyframes ping', css)
+        # pt-2 p-4'тү жеңет; экрандык эрежелер эң аягында
+        self.assertLess(css.index('.p-4{'), css.index('.pt-2{'))
+        self.assertLess(css.index('.dark .dark'), css.index('@media (min-width:768px){\n.md\\:grid-cols-3'))
+
+    def test_build_writes_hashed_files_and_icon_subset(self):
+        fontawesome = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, fontawesome)
+        os.makedirs(os.path.join(fontawesome, 'css'))
+        os.makedirs(os.path.join(fontawesome, 'webfonts'))
+        with open(os.path.join(fontawesome, 'css', 'all.css'), 'w') as fh:
+            fh.write(FAKE_FONTAWESOME_CSS)
+        for font in ('fa-solid-900', 'fa-brands-400', 'fa-regular-400'):
+            with open(os.path.join(fontawesome, 'webfonts', f'{font}.woff2'), 'wb') as fh:
+                fh.write(font.encode())
+        stale = os.path.join(self.output, 'css', 'app.000000000000.css')
+        os.makedirs(os.path.dirname(stale))
+        open(stale, 'w').close()
+        with open(os.path.join(self.output, 'css', 'manifest.json'), 'w') as fh:
+            json.dump({'app.css': 'css/app.000000000000.css'}, fh)
+
+        out = StringIO()
+        with mock.patch('config.assets.subset_font', copy_font):
+            call_command('build_css', output=self.output, fontawesome=fontawesome, stdout=out)
+
+        manifest = assets.read_manifest(self.output)
+        self.assertEqual(set(manifest), {'app.css', 'icons.css', 'fonts/fa-solid-900.woff2',
+                                         'fonts/fa-regular-400.woff2', 'fonts/fa-brands-400.woff2'})
+        for path in manifest.values():
+            self.assertTrue(os.path.exists(os.path.join(self.output, path)))
+            self.assertRegex(path, r'\.[0-9a-f]{12}\.')
+        self.assertFalse(os.path.exists(stale))
+        with open(os.path.join(self.output, manifest['icons.css'])) as fh:
+            icons = fh.read()
+        self.assertIn('.fa-globe::before{content:"\\f0ac"}', icons)
+        self.assertIn('.fa-tools::before{content:"\\f7d9"}', icons)  # Category.icon'дун демейкиси
+        self.assertNotIn('fa-unused', icons)
+        self.assertIn(f"url(../{manifest['fonts/fa-solid-900.woff2']})", icons)
+        self.assertIn('fa-message-slash', out.getvalue())
+
+    def test_base_template_uses_only_built_assets(self):
+        manifest = assets.read_manifest(settings.STATICFILES_DIRS[0])
+        html = self.client.get(reverse('login')).content.decode()
+        self.assertIn(f'href="/static/{manifest["app.css"]}"', html)
+        self.assertIn(f'href="/static/{manifest["icons.css"]}"', html)
+        # Оффлайн киоскулар: тышкы CDN жок
+        self.assertNotIn('cdn.tailwindcss.com', html)
+        self.assertNotIn('cdnjs.cloudflare.com', html)
+
+        with override_settings(STATICFILES_DIRS=[self.output]):
+            with self.assertRaisesMessage(ValueError, 'build_css'):
+                self.client.get(reverse('login'))
+
+    def test_committed_icons_cover_templates(self):
+        manifest = assets.read_manifest(settings.STATICFILES_DIRS[0])
+        for path in manifest.values():
+            self.assertTrue(os.path.exists(os.path.join(settings.STATICFILES_DIRS[0], path)), path)
+        with open(os.path.join(settings.STATICFILES_DIRS[0], manifest['icons.css'])) as fh:
+            icons = fh.read()
+        for name in ('fa-globe', 'fa-moon', 'fa-tools'):
+            self.assertIn(f'.{name}::before', icons)
+
+    def test_committed_build_is_current(self):
+        manifest = assets.read_manifest(settings.STATICFILES_DIRS[0])
+        if 'app.css' not in manifest:
+            self.skipTest("build_css ишке киргизилген эмес")
+        css, _ = assets.compile_css(assets.scan_tokens(assets.sources(settings.BASE_DIR)))
+        self.assertEqual(manifest['app.css'], f'css/app.{assets.content_hash(css.encode())}.css',
+                         "Шаблондор өзгөрдү: manage.py build_css")
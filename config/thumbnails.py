@@ -0,0 +1,118 @@
+import hashlib
+import json
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models.functions import Now
+from PIL import Image, ImageOps
+
+from .caching import invalidate_catalog
+
+
+# =========================================================
+# СҮРӨТТӨРДҮН КИЧИРЕЙТИЛГЕН ВАРИАНТТАРЫ (renditions)
+# =========================================================
+# Жүктөлгөн сүрөттүн жанына ар бир өлчөм үчүн WebP жана JPEG (fallback)
+# файлдары сакталат: services/foo.png -> services/foo.card.<spec>.webp, ...jpg
+# crop=True болсо сүрөт так ошол өлчөмгө кесилет (карточкалар үчүн).
+#
+# <spec> — өлчөмдүн жана форматтын жөндөөлөрүнүн кыска хеши: варианттар
+# immutable кэштелет (config/storage.py), ошондуктан IMAGE_RENDITIONS же
+# сапат өзгөрсө файлдын аты да өзгөрөт. Түзүлгөн аттар моделдин
+# image_renditions талаасына жазылат — URL storage.exists()'сиз курулат.
+
+DEFAULT_RENDITIONS = {
+    # home.html карточкасы: h-56 (224px), 2x экран үчүн
+    'card': {'size': (800, 448), 'crop': True},
+    'detail': {'size': (1200, 1200), 'crop': False},
+    'admin': {'size': (160, 120), 'crop': True},
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def get_renditions():
+    return getattr(settings, 'IMAGE_RENDITIONS', DEFAULT_RENDITIONS)
+
+
+def spec_hash(rendition, fmt):
+    pil_format, options = FORMATS[fmt]
+    spec = json.dumps([get_renditions()[rendition], pil_format, options], sort_keys=True, default=str)
+    return hashlib.sha256(spec.encode()).hexdigest()[:8]
+
+
+def rendition_name(name, rendition, fmt):
+    stem, _ = posixpath.splitext(name)
+    return f'{stem}.{rendition}.{spec_hash(rendition, fmt)}.{fmt}'
+
+
+def rendition_names(name):
+    return [rendition_name(name, rendition, fmt) for rendition in get_renditions() for fmt in FORMATS]
+
+
+def recorded_renditions(field_file):
+    """generate_renditions жазган аттар (мисалы Service.image_renditions)."""
+    return getattr(field_file.instance, f'{field_file.field.name}_renditions', None) or []
+
+
+def record_renditions(field_file, names):
+    instance = field_file.instance
+    field = f'{field_file.field.name}_renditions'
+    setattr(instance, field, names)
+    if instance.pk is not None:
+        # update() сигналсыз: post_save кайра иштебейт; ETag жана кэш жаңы URL'дерди көрсүн
+        type(instance)._base_manager.filter(pk=instance.pk).update(**{field: names, 'updated_at': Now()})
+        invalidate_catalog()
+
+
+def has_renditions(field_file):
+    return set(rendition_names(field_file.name)) <= set(recorded_renditions(field_file))
+
+
+def _render(image, spec):
+    if spec.get('crop'):
+        return ImageOps.fit(image, spec['size'], Image.LANCZOS)
+    image = image.copy()
+    image.thumbnail(spec['size'], Image.LANCZOS)
+    return image
+
+
+def generate_renditions(field_file):
+    """Бардык өлчөмдөрдү түзөт; түзүлгөн файлдардын аттарын кайтарат."""
+    storage = field_file.storage
+    with storage.open(field_file.name, 'rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    if image.mode not in ('RGB', 'L'):
+        # JPEG тунуктукту билбейт: ак фонго коёбуз
+        background = Image.new('RGB', image.size, 'white')
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+
+    created = []
+    for rendition, spec in get_renditions().items():
+        rendered = _render(image, spec)
+        for fmt, (pil_format, options) in FORMATS.items():
+            buffer = BytesIO()
+            rendered.save(buffer, pil_format, **options)
+            name = rendition_name(field_file.name, rendition, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            created.append(storage.save(name, ContentFile(buffer.getvalue())))
+    record_renditions(field_file, created)
+    return created
+
+
+def rendition_url(field_file, rendition, fmt='jpg'):
+    """Вариант түзүлгөн болсо анын URL'и, болбосо оригиналдын URL'и."""
+    if not field_file:
+        return ''
+    name = rendition_name(field_file.name, rendition, fmt)
+    if name in recorded_renditions(field_file):
+        return field_file.storage.url(name)
+    return field_file.url
@@ -1,8 +1,8 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
-    api_root, UserViewSet, ManagerViewSet, ClientViewSet,
-    BuildingViewSet, ServiceViewSet, OrderViewSet, OrderHistoryViewSet,
+    api_root, serve_media, UserViewSet, ManagerViewSet, ClientViewSet,
+    BuildingViewSet, CategoryViewSet, ServiceViewSet, OrderViewSet, OrderHistoryViewSet,
     home, service_detail, signup, RegisterView
 )
 from . import views
@@ -21,6 +21,7 @@ router.register(r'users', UserViewSet, basename='user')
 router.register(r'managers', ManagerViewSet, basename='manager')
 router.register(r'clients', ClientViewSet, basename='client')
 router.register(r'buildings', BuildingViewSet, basename='building')
+router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'services', ServiceViewSet, basename='service')
 router.register(r'orders', OrderViewSet, basename='order')
 router.register(r'orderhistories', OrderHistoryViewSet, basename='orderhistory')
@@ -53,6 +54,7 @@ urlpatterns = [
     # HTML ИНТЕРФЕЙС (ПАНЕЛЬ ЖАНА БАШКАРУУ)
     # ===================
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/bulk-status/', views.dashboard_bulk_status, name='dashboard_bulk_status'),
     path('clients/', views.clients_view, name='clients'),
     path('buildings/', views.buildings_view, name='buildings'),
 
@@ -66,6 +68,9 @@ urlpatterns = [
     # ТӨЛӨМ БАРАГЫ
     path('order/<int:pk>/payment/', views.payment_page, name='payment_page'),
 
+    # Статустун өзгөрүүлөрү (Server-Sent Events, ASGI)
+    path('orders/events/', views.order_events, name='order_events'),
+
     # Кардарлар
     path('clients/add/', views.client_create, name='client_create'),
     path('client/<int:pk>/', views.client_detail, name='client_detail'),
@@ -76,6 +81,9 @@ urlpatterns = [
     # ===================
     path('api/', api_root, name='api-root'),
     path('api/register/', RegisterView.as_view(), name='register'),
+    path('api/slots/', views.slot_availability, name='slot-availability'),
+    path('api/reports/', views.order_reports, name='order-reports'),
+    re_path(r'^api/exports/(?P<kind>orders|history)\.(?P<fmt>csv|jsonl)$', views.export_orders, name='order-export'),
     path('api/', include(router.urls)),
 
     # ===================
@@ -88,5 +96,5 @@ urlpatterns = [
 
 # Сүрөттөр (media) үчүн жол
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media)]
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
@@ -1,11 +1,16 @@
-from django.db.models import Q, Avg
+import asyncio
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
 from django.contrib.auth.decorators import login_required
-from rest_framework import viewsets, permissions, generics
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import viewsets, permissions, generics, filters
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.permissions import AllowAny
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
 
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
@@ -13,30 +18,51 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_time
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from django.views.static import serve as static_serve
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 
 # Моделдер жана Сериализаторлор
 from .models import User, Building, Service, Order, OrderHistory, Client, Category, Review
 from .serializers import (
-    UserSerializer, BuildingSerializer, ServiceSerializer,
-    OrderSerializer, OrderHistorySerializer, RegisterSerializer
+    UserSerializer, BuildingSerializer, CategorySerializer, ServiceSerializer,
+    OrderSerializer, OrderHistorySerializer, RegisterSerializer, BulkStatusSerializer, save_new_user,
+)
+from .pagination import OrderCursorPagination, OrderHistoryCursorPagination, apaginate
+from .search import search_services
+from .caching import cached_catalog, catalog_timeout, catalog_version
+from .conditional import ConditionalGetMixin
+from .storage import is_hashed_name
+from .slots import MAX_DAYS, SlotUnavailable, free_slots, move_slot, reserve_slot, slot_changed, slot_state
+from .reports import GROUP_FIELDS, cached_order_totals, order_report
+from .exports import content_type as export_content_type, stream_export
+from .authentication import acached_token
+from .passwords import amake_password
+from .events import events_enabled, events_settings, get_broker, scope_for
+from .metrics import (
+    PAYMENTS_ACCEPTED, PAYMENTS_AMOUNT, metrics_settings, render as render_metrics, scrape_allowed, scrape_configured,
+)
+from .workflow import (
+    ConcurrentTransitionError, TransitionError, TransitionPermissionError,
+    bulk_update_status, can_manage_order, can_manage_orders, transition,
 )
 
 # =========================================================
 # 1. АВТОРИЗАЦИЯ ЖАНА РЕГИСТРАЦИЯ (HTML & API)
 # =========================================================
 
-# Бул жерде ListCreateAPIView колдонобуз, ошондо API аркылуу катталгандарды GET менен көрсө болот
-class RegisterView(generics.ListCreateAPIView):
-    queryset = User.objects.all()
+# POST гана: колдонуучулардын тизмеси /api/users/ (аутентификация менен, барактар боюнча).
+# Роль 'USER' жана пароль RegisterSerializer'де бир INSERT менен жазылат.
+class RegisterView(generics.CreateAPIView):
     permission_classes = (AllowAny,)
     serializer_class = RegisterSerializer
 
-    # Катталгандан кийин колдонуучунун ролун автоматтык түрдө 'USER' кылабыз
-    def perform_create(self, serializer):
-        user = serializer.save()
-        user.role = 'USER'
-        user.save()
-
 
 class SignUpForm(UserCreationForm):
     class Meta:
@@ -51,7 +77,8 @@ def signup(request):
             user = form.save(commit=False) # Маалыматты убактылуу кармайбыз
             user.role = 'USER'             # Ролун бекитебиз
             user.save()                    # Эми базага "тарс" деп сактайбыз
-            login(request, user)
+            # Бир нече backend бар (settings 7.1): сессияга кэштелген backend жазылат
+            login(request, user, backend='config.authentication.CachedModelBackend')
             messages.success(request, "Каттоо ийгиликтүү өттү! Кош келиңиз.")
             return redirect('home')
         else:
@@ -85,24 +112,55 @@ class ReviewForm(forms.ModelForm):
 
 @login_required
 def home(request):
-    categories = Category.objects.all()
-    services = Service.objects.all().prefetch_related('reviews')
-
-    search_query = request.GET.get('search')
-    if search_query:
-        services = services.filter(Q(name__icontains=search_query) | Q(description__icontains=search_query))
+    categories = cached_catalog('categories', lambda: list(Category.objects.all()))
+    services = Service.objects.all()
 
-    category_id = request.GET.get('category')
+    # Кэштин ачкычы ушул маанилерден турат: каалаган ?category=/?sort= жаңы жазуу түзбөсүн
+    category_id = request.GET.get('category', '')
+    category_id = category_id if category_id.isdigit() else ''
     if category_id:
         services = services.filter(category_id=category_id)
 
-    return render(request, 'home.html', {'categories': categories, 'services': services})
+    # home.html формасы 'q' жөнөтөт; эски 'search' шилтемелери да иштей берет
+    search_query = (request.GET.get('q') or request.GET.get('search') or '').strip()
+    if search_query:
+        # Толук тексттик индекс, натыйжалар рейтинги (bm25/ts_rank) боюнча иреттелет
+        services = search_services(search_query, queryset=services)
+    else:
+        sort = request.GET.get('sort')
+        sort = sort if sort in ('rating',) else ''
+        if sort == 'rating':
+            # Рейтинг боюнча сорттоо сакталган rating_avg индексин колдонот
+            services = services.order_by('-rating_avg', '-rating_count')
+        services = cached_catalog(f'services:{category_id}:{sort}', lambda: list(services))
+
+    return render(request, 'home.html', {
+        'categories': categories, 'services': services, 'search_query': search_query,
+        'catalog_version': catalog_version(), 'cache_timeout': catalog_timeout(),
+        'statistics': home_statistics(),
+    })
+
+
+def home_statistics():
+    # Заказдардын саны config_order'дон эмес, күнүмдүк отчёттордон окулат
+    totals = cached_order_totals()
+    services, buildings = cached_catalog(
+        'counts', lambda: (Service.objects.count(), Building.objects.count()))
+    return [
+        (sum(totals.values()), "Заказдар", 'text-blue-600'),
+        (totals.get('DONE', 0), "Аткарылган", 'text-emerald-500'),
+        (services, "Кызматтар", 'text-amber-500'),
+        (buildings, "Имараттар", 'text-purple-500'),
+    ]
 
 
 @login_required
 def service_detail(request, pk):
-    service = get_object_or_404(Service, pk=pk)
-    reviews = service.reviews.all().order_by('-created_at')
+    def load():
+        service = get_object_or_404(Service.objects.select_related('category', 'building'), pk=pk)
+        return service, list(service.reviews.select_related('user').order_by('-created_at'))
+
+    service, reviews = cached_catalog(f'service:{pk}', load)
 
     if request.method == "POST":
         form = ReviewForm(request.POST)
@@ -141,19 +199,28 @@ def create_order(request):
         comment = request.POST.get('comment', '')
 
         service = get_object_or_404(Service, id=service_id)
-
-        order = Order.objects.create(
-            user=request.user,
-            service=service,
-            building=get_object_or_404(Building, id=building_id),
-            date=request.POST.get('date') or timezone.now().date(),
-            time=request.POST.get('time') or timezone.now().time(),
-            comment=comment,
-            status='WAITING_PAYMENT'
-        )
-
-        messages.info(request, f"Заказ түзүлдү. Активдештирүү үчүн {order.prepayment_amount} сом взнос төлөңүз.")
-        return redirect('payment_page', pk=order.id)
+        building = get_object_or_404(Building, id=building_id)
+        order_date = parse_date(request.POST.get('date') or '') or timezone.localdate()
+        order_time = parse_time(request.POST.get('time') or '') or timezone.localtime().time()
+
+        try:
+            # Заказ жана убакыттын брону бир транзакцияда: орун жок болсо заказ да түзүлбөйт
+            with transaction.atomic():
+                order = Order.objects.create(
+                    user=request.user,
+                    service=service,
+                    building=building,
+                    date=order_date,
+                    time=order_time,
+                    comment=comment,
+                    status='WAITING_PAYMENT'
+                )
+                reserve_slot(order)
+        except SlotUnavailable as exc:
+            messages.error(request, str(exc))
+        else:
+            messages.info(request, f"Заказ түзүлдү. Активдештирүү үчүн {order.prepayment_amount} сом взнос төлөңүз.")
+            return redirect('payment_page', pk=order.id)
 
     return render(request, 'create_order.html', {
         'services': services, 'buildings': buildings,
@@ -164,19 +231,15 @@ def create_order(request):
 @login_required
 def payment_page(request, pk):
     order = get_object_or_404(Order, pk=pk)
-    old_display = order.get_status_display()
 
     if request.method == 'POST':
-        order.status = 'PAID'
-        order.save()
-
-        # Тарыхка кыргызча жазуу (Төлөндү)
-        OrderHistory.objects.create(
-            order=order,
-            old_status=old_display,
-            new_status='Төлөндү',
-            changed_by=request.user
-        )
+        try:
+            transition(order, 'PAID', request.user)
+        except TransitionError as exc:
+            messages.error(request, str(exc))
+            return redirect('order_detail', pk=order.pk)
+        PAYMENTS_ACCEPTED.inc()
+        PAYMENTS_AMOUNT.inc(float(order.prepayment_amount or 0))
         messages.success(request, "Взнос кабыл алынды! Заказ аткарылууга берилди.")
         return redirect('dashboard')
 
@@ -193,28 +256,48 @@ def dashboard(request):
     if user.role == 'ADMIN':
         orders = Order.objects.all()
     elif user.role == 'MANAGER':
-        orders = Order.objects.filter(building=user.managed_building)
+        orders = Order.objects.filter(building_id=user.managed_building_id)
     else:
         orders = Order.objects.filter(user=user)
-    return render(request, 'orders.html', {'orders': orders.order_by('-created_at')})
+    # orders.html ар бир сапта order.building.name / order.service.name окуйт
+    orders = orders.select_related('building', 'service')
+    return render(request, 'orders.html', {
+        'orders': orders.order_by('-created_at'),
+        'can_bulk_update': can_manage_orders(user),
+        'status_choices': Order.STATUS_CHOICES,
+        'live_updates': events_enabled(),
+    })
+
+
+@login_required
+def dashboard_bulk_status(request):
+    # Dashboard'догу белгиленген заказдардын статусун бир жолу өзгөртүү
+    if request.method == 'POST':
+        try:
+            ids = [int(pk) for pk in request.POST.getlist('orders')]
+            updated = bulk_update_status(request.user, ids, request.POST.get('status', ''))
+        except ValueError:
+            messages.error(request, "Заказдар туура эмес тандалды.")
+        except TransitionError as exc:
+            messages.error(request, str(exc))
+        else:
+            messages.success(request, f"{updated} заказдын статусу жаңыртылды!")
+    return redirect('dashboard')
 
 
 @login_required
 def update_order_status(request, pk, status):
-    order = get_object_or_404(Order, pk=pk)
-    if (request.user.role == 'MANAGER' and order.building == request.user.managed_building) or request.user.role == 'ADMIN':
-        old_status = order.get_status_display()
-        order.status = status
-        order.save()
-        OrderHistory.objects.create(
-            order=order,
-            old_status=old_status,
-            new_status=order.get_status_display(),
-            changed_by=request.user
-        )
-        messages.success(request, f"Заказ статусу жаңыртылды!")
-    else:
+    order = get_object_or_404(Order.objects.only('pk', 'status', 'building_id', 'user_id'), pk=pk)
+    if not can_manage_order(request.user, order):
         messages.error(request, "Сизге бул аракетке уруксат жок!")
+        return redirect('dashboard')
+    try:
+        # URL'деги статус өтүүлөр таблицасы менен текшерилет, UPDATE ... WHERE status = <эски>
+        transition(order, status, request.user)
+    except TransitionError as exc:
+        messages.error(request, str(exc))
+    else:
+        messages.success(request, f"Заказ статусу жаңыртылды!")
     return redirect('dashboard')
 
 
@@ -222,7 +305,9 @@ def update_order_status(request, pk, status):
 def order_detail(request, pk):
     order = get_object_or_404(Order, pk=pk)
     history = OrderHistory.objects.filter(order=order).order_by('-change_date')
-    return render(request, 'order_detail.html', {'order': order, 'history': history})
+    return render(request, 'order_detail.html', {
+        'order': order, 'history': history, 'live_updates': events_enabled(),
+    })
 
 
 @login_required
@@ -238,21 +323,28 @@ def order_delete(request, pk):
 @login_required
 def order_edit(request, pk):
     order = get_object_or_404(Order, pk=pk)
-    old_status_display = order.get_status_display()
+    old_status = order.status
+    before = slot_state(order)
     if request.method == "POST":
         form = OrderForm(request.POST, instance=order)
         if form.is_valid():
-            updated_order = form.save()
-            new_status_display = updated_order.get_status_display()
-            if old_status_display != new_status_display:
-                OrderHistory.objects.create(
-                    order=updated_order,
-                    old_status=old_status_display,
-                    new_status=new_status_display,
-                    changed_by=request.user
-                )
-            messages.success(request, "Заказ ийгиликтүү жаңыланды!")
-            return redirect('order_detail', pk=order.id)
+            new_status = form.cleaned_data['status']
+            try:
+                with transaction.atomic():
+                    updated_order = form.save(commit=False)
+                    # Статус бул жерде жазылбайт: ал өзүнчө шарттуу UPDATE менен өзгөрөт
+                    updated_order.save(update_fields=['service', 'building'])
+                    if slot_changed(updated_order, before):
+                        move_slot(updated_order)
+                    if new_status != old_status:
+                        transition(updated_order, new_status, request.user, expected_status=old_status)
+            except SlotUnavailable as exc:
+                form.add_error(None, str(exc))
+            except TransitionError as exc:
+                form.add_error('status', str(exc))
+            else:
+                messages.success(request, "Заказ ийгиликтүү жаңыланды!")
+                return redirect('order_detail', pk=order.id)
     else:
         form = OrderForm(instance=order)
     return render(request, 'order_form.html', {'form': form, 'order': order})
@@ -270,7 +362,7 @@ def clients_view(request):
 
 @login_required
 def buildings_view(request):
-    buildings = Building.objects.all()
+    buildings = cached_catalog('buildings', lambda: list(Building.objects.all()))
     return render(request, 'buildings.html', {'buildings': buildings})
 
 
@@ -308,6 +400,24 @@ def client_create(request):
     return render(request, 'client_form.html')
 
 
+def metrics(request):
+    # Prometheus scrape: бардык worker'лердин бириккен маанилери
+    config = metrics_settings()
+    if not scrape_configured(config):
+        raise Http404("METRICS_TOKEN же METRICS_ALLOWED_IPS берилген эмес")
+    if not scrape_allowed(request, config):
+        return HttpResponse(status=401)
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def serve_media(request, path):
+    # DEBUG режиминде медиа; хештелген файлдар өзгөрбөйт, ошондуктан түбөлүк кэштелет
+    response = static_serve(request, path, document_root=settings.MEDIA_ROOT)
+    if is_hashed_name(path):
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE, immutable=True)
+    return response
+
+
 # =========================================================
 # 7. API БӨЛҮМҮ (REST FRAMEWORK - ТОЛУК)
 # =========================================================
@@ -320,12 +430,98 @@ def api_root(request, format=None):
         '1. Имараттар': reverse('building-list', request=request, format=format),
         '2. Менеджерлер': reverse('manager-list', request=request, format=format),
         '3. Кызматтар': reverse('service-list', request=request, format=format),
+        '3.1 Категориялар': reverse('category-list', request=request, format=format),
         '4. Кардарлар': reverse('client-list', request=request, format=format),
         '5. Заказдар': reverse('order-list', request=request, format=format),
         '6. Тарых': reverse('orderhistory-list', request=request, format=format),
     })
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def slot_availability(request):
+    # GET /api/slots/?building=1&service=2&start=2026-03-01&days=14
+    try:
+        building_id = int(request.query_params['building'])
+        service_id = int(request.query_params['service'])
+        days = int(request.query_params.get('days', 14))
+    except (KeyError, ValueError):
+        raise ValidationError("building, service (жана опционалдуу days) бүтүн сан болушу керек")
+    start = parse_date(request.query_params.get('start', '')) or timezone.localdate()
+    slots = free_slots(building_id, service_id, start, min(max(days, 1), MAX_DAYS))
+    return Response({
+        'building': building_id,
+        'service': service_id,
+        'slots': [{'date': day, 'time': time.strftime('%H:%M'), 'free': free} for day, time, free in slots],
+    })
+
+
+def reporting_building(user):
+    """Отчёт/экспорт үчүн: ADMIN — баары (None), MANAGER — өз имараты гана."""
+    if user.role == 'ADMIN' or user.is_staff:
+        return None
+    if user.role != 'MANAGER':
+        raise PermissionDenied("Сизге бул аракетке уруксат жок!")
+    if user.managed_building_id is None:
+        raise PermissionDenied("Сизге имарат бекитилген эмес")
+    return user.managed_building_id
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def order_reports(request):
+    # GET /api/reports/?start=2026-03-01&end=2026-03-31&group_by=service
+    building_id = reporting_building(request.user)
+    end = parse_date(request.query_params.get('end', '')) or timezone.localdate()
+    start = parse_date(request.query_params.get('start', '')) or end.replace(day=1)
+    if start > end:
+        raise ValidationError("start end'ден кийин болбошу керек")
+    group_by = request.query_params.get('group_by', 'day')
+    if group_by not in GROUP_FIELDS:
+        raise ValidationError(f"group_by: {', '.join(GROUP_FIELDS)} болушу керек")
+    return Response({
+        'start': start,
+        'end': end,
+        'group_by': group_by,
+        'rows': order_report(start, end, group_by=group_by, building_id=building_id),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_orders(request, kind, fmt):
+    # GET /api/exports/orders.csv?start=2026-01-01&end=2026-03-31&building=2
+    # GET /api/exports/history.jsonl
+    building_id = reporting_building(request.user)
+    filters = {}
+    for name in ('start', 'end'):
+        value = request.query_params.get(name)
+        if value:
+            filters[name] = parse_date(value)
+            if filters[name] is None:
+                raise ValidationError(f"{name}: күн YYYY-MM-DD форматында болушу керек")
+    building = request.query_params.get('building')
+    if building:
+        if not building.isdigit():
+            raise ValidationError("building бүтүн сан болушу керек")
+        if building_id is not None and int(building) != building_id:
+            raise PermissionDenied("Сиз башкарган имарат эмес")
+        building_id = int(building)
+
+    response = StreamingHttpResponse(stream_export(kind, fmt, building_id=building_id, **filters),
+                                     content_type=export_content_type(fmt))
+    suffix = '_'.join(str(filters[name]) for name in ('start', 'end') if name in filters)
+    filename = f"{kind}{'-' + suffix if suffix else ''}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class StatusConflict(APIException):
+    status_code = 409
+    default_detail = "Заказдын статусу башка колдонуучу тарабынан өзгөртүлдү"
+    default_code = 'status_conflict'
+
+
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -345,42 +541,246 @@ class ClientViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class BuildingViewSet(viewsets.ModelViewSet):
+class BuildingViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Building.objects.all()
     serializer_class = BuildingSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+
+class ServiceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # ?ordering=-rating_avg -> сакталган рейтинг боюнча (config_review окулбайт)
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['rating_avg', 'rating_count', 'price', 'name']
+    ordering = ['-id']  # курсор пагинациясы үчүн демейки тартип
+
+    # GET /api/services/search/?q=кран&limit=20 — type-ahead үчүн префикс издөө
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        except ValueError:
+            limit = 20
+        services = search_services(query, limit=limit) if query else Service.objects.none()
+        return Response(self.get_serializer(services, many=True).data)
+
+
+def visible_orders(user):
+    """API'де колдонуучуга көрүнгөн заказдар: ADMIN — баары, MANAGER — өз имараты, USER — өзүнүкү."""
+    if user.role == 'ADMIN' or user.is_staff:
+        orders = Order.objects.all()
+    elif user.role == 'MANAGER':
+        orders = Order.objects.filter(building_id=user.managed_building_id)
+    else:
+        orders = Order.objects.filter(user=user)
+    # OrderSerializer building/user/service'ти ичине камтыйт -> бир JOIN менен алабыз
+    orders = orders.select_related('building', 'user', 'service')
+    # (building_id, created_at) / (user_id, created_at) индекстерин колдонот
+    return orders.order_by('-created_at')
 
 
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderCursorPagination
 
     def get_queryset(self):
-        user = self.request.user
-        if user.role == 'ADMIN' or user.is_staff:
-            return Order.objects.all()
-        if user.role == 'MANAGER':
-            return Order.objects.filter(building=user.managed_building)
-        return Order.objects.filter(user=user)
+        return visible_orders(self.request.user)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user, status='NEW')
 
+    # POST /api/orders/bulk-status/ {"ids": [1, 2, 3], "status": "IN_PROGRESS"}
+    @action(detail=False, methods=['post'], url_path='bulk-status', serializer_class=BulkStatusSerializer)
+    def bulk_status(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            updated = bulk_update_status(request.user, serializer.validated_data['ids'],
+                                         serializer.validated_data['status'])
+        except TransitionPermissionError as exc:
+            raise PermissionDenied(str(exc))
+        except ConcurrentTransitionError as exc:
+            raise StatusConflict(str(exc))
+        except TransitionError as exc:
+            raise ValidationError({'ids': [str(exc)]})
+        return Response({'updated': updated})
+
     def perform_update(self, serializer):
-        instance = self.get_object()
-        old_status = instance.status
-        new_order = serializer.save()
-        if old_status != new_order.status:
-            OrderHistory.objects.create(order=new_order, old_status=old_status, new_status=new_order.status)
+        old_status = serializer.instance.status
+        new_status = serializer.validated_data.pop('status', old_status)
+        try:
+            with transaction.atomic():
+                order = serializer.save()
+                if new_status != old_status:
+                    transition(order, new_status, self.request.user, expected_status=old_status)
+        except ConcurrentTransitionError as exc:
+            raise StatusConflict(str(exc))
+        except TransitionError as exc:
+            raise ValidationError({'status': [str(exc)]})
 
 
 class OrderHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = OrderHistory.objects.all()
     serializer_class = OrderHistorySerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderHistoryCursorPagination
+
+# =========================================================
+# 8. ASYNC API (ASGI үчүн окуу endpoint'тери)
+# =========================================================
+# servic/asgi.py аркылуу иштегенде бул view'лар event loop'тун өзүндө
+# аткарылат: DRF view'лары сыяктуу бүт сурам thread'ке өткөрүлбөйт,
+# async ORM гана (aget/afirst/async for) колдонулат. Middleware чынжыры да
+# async (config/metrics.py, config/routers.py). Жооптор DRF'тегидей эле
+# serializer'лер менен түзүлөт; керектүү байланыштар select_related
+# менен алдын ала окулат — serializer базага кайрылбайт (кайрылса,
+# Django SynchronousOnlyOperation чыгарат). WSGI'де да иштейт.
+
+async def api_user(request):
+    """Сессия же "Authorization: Token <key>" боюнча колдонуучу, болбосо None."""
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Token '):
+        found = await acached_token(header[6:].strip())
+        return found[1] if found is not None and found[1].is_active else None
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def async_api_view(view):
+    @require_GET
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await api_user(request)
+        if user is None:
+            return JsonResponse({'detail': "Аутентификация маалыматтары берилген жок."}, status=403)
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def paginated_response(request, queryset, ordering, serializer_class):
+    try:
+        rows, next_url = await apaginate(request, queryset, ordering)
+    except ValueError as exc:
+        return JsonResponse({'detail': str(exc)}, status=404)
+    data = serializer_class(rows, many=True, context={'request': request}).data
+    return JsonResponse({'next': next_url, 'results': data})
+
+
+def not_found():
+    return JsonResponse({'detail': "Табылган жок."}, status=404)
+
+
+@async_api_view
+async def async_service_list(request):
+    return await paginated_response(request, Service.objects.all(), ('-id',), ServiceSerializer)
+
+
+@async_api_view
+async def async_service_detail(request, pk):
+    service = await Service.objects.filter(pk=pk).afirst()
+    if service is None:
+        return not_found()
+    return JsonResponse(ServiceSerializer(service, context={'request': request}).data)
+
+
+@async_api_view
+async def async_building_list(request):
+    return await paginated_response(request, Building.objects.all(), ('-id',), BuildingSerializer)
+
+
+@async_api_view
+async def async_order_list(request):
+    return await paginated_response(request, visible_orders(request.user), OrderCursorPagination.ordering,
+                                    OrderSerializer)
+
+
+@csrf_exempt  # DRF'тин RegisterView'су сыяктуу: cookie/сессия колдонулбайт
+@require_POST
+async def async_register(request):
+    # POST /api/async/register/ — RegisterView'дун ASGI варианты: PBKDF2 event loop'то эмес,
+    # config/passwords.py'дагы чектелген пулда
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'detail': "JSON туура эмес"}, status=400)
+    serializer = RegisterSerializer(data=payload)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    user = serializer.build_user(await amake_password(serializer.validated_data['password']))
+    try:
+        await sync_to_async(save_new_user)(user)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    return JsonResponse(RegisterSerializer(user).data, status=201)
+
+
+@async_api_view
+async def async_order_detail(request, pk):
+    order = await visible_orders(request.user).filter(pk=pk).afirst()
+    if order is None:
+        return not_found()
+    return JsonResponse(OrderSerializer(order, context={'request': request}).data)
+
+
+# =========================================================
+# 9. ЗАКАЗДАРДЫН СТАТУСУ ЖАНДУУ (Server-Sent Events)
+# =========================================================
+# dashboard жана order_detail баракчалары EventSource менен жазылат;
+# статус өзгөргөндө (config/events.py) окуя келет, барак кайра
+# жүктөлбөйт. ASGI үчүн гана: WSGI'де StreamingHttpResponse async генераторду
+# толугу менен чогултат — барак worker'ди түбөлүк ээлеп, бир да байт жөнөтпөйт.
+# Ошондуктан ORDER_EVENTS['ENABLED'] өчүк же сурам ASGI'ден келбесе — 204
+# (EventSource 204 алса кайра туташпайт), шаблондор скриптти да чыгарбайт.
+
+def sse_message(data, event=None):
+    lines = [f'event: {event}'] if event else []
+    lines.append(f'data: {json.dumps(data, ensure_ascii=False)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def order_event_stream(subscription, config):
+    try:
+        yield f"retry: {config['RETRY_MS']}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), config['KEEPALIVE'])
+            except TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if subscription.overflowed:
+                # Окуялар жоголду — кардар баракты толугу менен жаңыласын
+                yield sse_message({}, event='reload')
+                return
+            yield sse_message(event, event='status')
+    finally:
+        subscription.close()
+
+
+async def order_events(request):
+    # GET /orders/events/            — колдонуучуга көрүнгөн бардык заказдар
+    # GET /orders/events/?order=15   — бир заказ (order_detail)
+    if not events_enabled() or not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=403)
+    order_id = request.GET.get('order')
+    if order_id is not None and not order_id.isdigit():
+        return HttpResponse(status=400)
+    config = events_settings()
+    subscription = get_broker().subscribe(scope_for(user), order_id=int(order_id) if order_id else None)
+    response = StreamingHttpResponse(order_event_stream(subscription, config), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx буферлебесин
+    return response
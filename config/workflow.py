@@ -0,0 +1,145 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .events import publish_on_commit, status_event
+from .metrics import ORDER_TRANSITIONS
+from .models import Order, OrderHistory
+from .reports import move_status
+from .slots import release_slots
+
+
+# =========================================================
+# ЗАКАЗДЫН СТАТУСУН ӨЗГӨРТҮҮ (абалдар машинасы)
+# =========================================================
+# Ар бир өзгөртүү шарттуу `UPDATE ... WHERE id = %s AND status = <эски>`
+# менен колдонулат: эки менеджер бир учурда бир заказды өзгөртсө, экинчиси
+# 0 сап жаңыртып, ConcurrentTransitionError алат. Тарыхка дайыма коддор
+# ('NEW', 'PAID', ...) жазылат, текст шаблондо get_*_display менен чыгат.
+
+STATUS_CODES = {code for code, _ in Order.STATUS_CHOICES}
+MAX_BULK_ORDERS = 1000
+
+# эски статус -> уруксат берилген жаңы статустар
+TRANSITIONS = {
+    'NEW': {'WAITING_PAYMENT', 'PAID', 'IN_PROGRESS', 'CANCELLED'},
+    'WAITING_PAYMENT': {'PAID', 'CANCELLED'},
+    'PAID': {'IN_PROGRESS', 'CANCELLED'},
+    'IN_PROGRESS': {'DONE', 'CANCELLED'},
+    'DONE': set(),
+    'CANCELLED': set(),
+}
+
+
+class TransitionError(Exception):
+    pass
+
+
+class TransitionPermissionError(TransitionError):
+    pass
+
+
+class ConcurrentTransitionError(TransitionError):
+    pass
+
+
+def can_manage_orders(user):
+    return user.role in ('ADMIN', 'MANAGER') or user.is_staff
+
+
+def can_manage_order(user, order):
+    if user.role == 'ADMIN' or user.is_staff:
+        return True
+    return user.role == 'MANAGER' and order.building_id == user.managed_building_id
+
+
+def allowed_transitions(status):
+    return TRANSITIONS.get(status, set())
+
+
+def check_transition(old_status, new_status):
+    if new_status not in STATUS_CODES:
+        raise TransitionError(f"Белгисиз статус: {new_status}")
+    if new_status not in allowed_transitions(old_status):
+        old_label = dict(Order.STATUS_CHOICES).get(old_status, old_status)
+        new_label = dict(Order.STATUS_CHOICES)[new_status]
+        raise TransitionError(f"«{old_label}» абалынан «{new_label}» абалына өтүүгө болбойт")
+
+
+def transition(order, new_status, user=None, expected_status=None):
+    """Бир заказдын статусун шарттуу UPDATE менен өзгөртөт жана тарыхка жазат.
+
+    `expected_status` берилбесе, `order.status` (окулган учурдагы маани) колдонулат.
+    Ийгиликтүү болсо `order.status` жаңыртылат.
+    """
+    old_status = expected_status or order.status
+    check_transition(old_status, new_status)
+    with transaction.atomic():
+        updated = Order.objects.filter(pk=order.pk, status=old_status).update(status=new_status)
+        if not updated:
+            raise ConcurrentTransitionError("Заказдын статусу башка колдонуучу тарабынан өзгөртүлдү")
+        OrderHistory.objects.create(order_id=order.pk, old_status=old_status, new_status=new_status,
+                                    changed_by=user)
+        move_status([order.pk], old_status, new_status)
+        ORDER_TRANSITIONS.inc_on_commit(from_status=old_status, to_status=new_status)
+        publish_on_commit([status_event(order.pk, order.user_id, order.building_id, old_status, new_status)])
+        if new_status == 'CANCELLED':
+            release_slots([order.pk])
+    order.status = new_status
+    order.sync_rollup_state()
+    return order
+
+
+def bulk_update_status(user, order_ids, status):
+    """Бир нече заказдын статусун бир транзакцияда өзгөртөт.
+
+    Уруксат жана өтүүлөр бардык заказдар үчүн бир SELECT менен текшерилет,
+    статус ар бир эски статус үчүн бир `UPDATE ... WHERE id IN (...) AND status = <эски>`
+    менен коюлат, тарых bulk_create менен жазылат. Өзгөргөн заказдардын санын кайтарат.
+    """
+    if status not in STATUS_CODES:
+        raise TransitionError(f"Белгисиз статус: {status}")
+    order_ids = set(order_ids)
+    if not order_ids:
+        return 0
+    if len(order_ids) > MAX_BULK_ORDERS:
+        raise TransitionError(f"Бир жолу {MAX_BULK_ORDERS} заказдан ашык болбошу керек")
+    if not can_manage_orders(user):
+        raise TransitionPermissionError("Сизге бул аракетке уруксат жок!")
+
+    with transaction.atomic():
+        rows = list(
+            Order.objects.select_for_update()
+            .filter(pk__in=order_ids)
+            .values_list('pk', 'status', 'building_id', 'user_id')
+        )
+        if len(rows) != len(order_ids):
+            raise TransitionError("Айрым заказдар табылган жок")
+        if user.role == 'MANAGER' and not user.is_staff:
+            if any(building_id != user.managed_building_id for _, _, building_id, _ in rows):
+                raise TransitionPermissionError("Айрым заказдар сиз башкарган имаратка таандык эмес")
+
+        by_old_status = defaultdict(list)
+        for pk, old, _, _ in rows:
+            if old != status:
+                check_transition(old, status)
+                by_old_status[old].append(pk)
+        if not by_old_status:
+            return 0
+        for old, pks in by_old_status.items():
+            updated = Order.objects.filter(pk__in=pks, status=old).update(status=status)
+            if updated != len(pks):
+                raise ConcurrentTransitionError("Айрым заказдардын статусу башка колдонуучу тарабынан өзгөртүлдү")
+            move_status(pks, old, status)
+            ORDER_TRANSITIONS.inc_on_commit(len(pks), from_status=old, to_status=status)
+        OrderHistory.objects.bulk_create(
+            OrderHistory(order_id=pk, old_status=old, new_status=status, changed_by=user)
+            for old, pks in by_old_status.items() for pk in pks
+        )
+        if status == 'CANCELLED':
+            release_slots([pk for pks in by_old_status.values() for pk in pks])
+        changed_at = timezone.now()
+        publish_on_commit([status_event(pk, user_id, building_id, old, status, changed_at)
+                           for pk, old, building_id, user_id in rows if old != status])
+    return sum(len(pks) for pks in by_old_status.values())
@@ -28,6 +28,12 @@ INSTALLED_APPS = [
 
 # 4. ОРТОНКУ КАТМАРЛАР (MIDDLEWARE)
 MIDDLEWARE = [
+    # Биринчи орунда: калган middleware'лердин сурамдары да эсептелет.
+    # PROFILING['ENABLED'] болбосо Django аны өзү алып салат (config/profiling.py)
+    'config.profiling.ProfilingMiddleware',
+    'config.metrics.MetricsMiddleware',
+    # Жазуудан кийин окууларды негизги базага бекитет (реплика жок болсо эч нерсе кылбайт)
+    'config.routers.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware', # Сөзсүз 1-орундарда
     'django.middleware.locale.LocaleMiddleware',           # ТИЛ ҮЧҮН УШУЛ ЖЕРДЕ БОЛУШУ ШАРТ!
@@ -61,16 +67,71 @@ TEMPLATES = [
 WSGI_APPLICATION = 'servic.wsgi.application'
 
 # 6. БАЗА (DATABASE)
+# SQLITE_PROFILE=production — бир нече worker бир файлга жазган сайттар үчүн.
+# Ар бир жаңы байланышта колдонулат:
+#   * journal_mode=WAL: окуучулар жазуучуну бөгөттөбөйт (жана тескерисинче);
+#   * synchronous=NORMAL: WAL'да коопсуз, commit ар бир жолу fsync кылбайт;
+#   * cache_size / mmap_size: баракчалардын кэши жана mmap менен окуу;
+#   * timeout: "database is locked" ордуна кулпуну ушунча секунд күтөт;
+#   * transaction_mode=IMMEDIATE: atomic() дароо жазуу кулпусун алат, ошондо
+#     DEFERRED транзакциянын окуудан жазууга өтүүсүндөгү дароо SQLITE_BUSY болбойт.
+# Текшерүү: python manage.py sqlite_stress --profile both
+SQLITE_PRODUCTION_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20)),
+    'init_command': ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA cache_size=-{int(os.environ.get('SQLITE_CACHE_MB', 64)) * 1024}",
+        f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_MB', 256)) * 1024 * 1024}",
+        'PRAGMA temp_store=MEMORY',
+    ]),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('SQLITE_PATH') or BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_PRODUCTION_OPTIONS if os.environ.get('SQLITE_PROFILE') == 'production' else {},
     }
 }
 
+# 6.1 READ-РЕПЛИКАЛАР (config/routers.py)
+# Каталог жана отчёттор репликадан окулат, жазуулар жана заказдар — 'default'ден.
+# Жергиликтүү текшерүү эки SQLite файл менен:
+#   DATABASE_REPLICA_PATHS=replica.sqlite3 python manage.py sync_replica
+#   DATABASE_REPLICA_PATHS=replica.sqlite3 python manage.py runserver
+# Башка СУБД'лар үчүн DATABASES'ке alias кошуп, аны DATABASE_REPLICAS'ка жазыңыз.
+DATABASE_REPLICAS = []
+for _index, _path in enumerate(p.strip() for p in os.environ.get('DATABASE_REPLICA_PATHS', '').split(',') if p.strip()):
+    _alias = f'replica{_index + 1}'
+    # Тесттерде реплика тесттик 'default' базасынын өзү
+    DATABASES[_alias] = {**DATABASES['default'], 'NAME': _path, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ['config.routers.PrimaryReplicaRouter']
+# Жазуудан кийин колдонуучунун сурамдары ушунча секунд негизги базадан окулат
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+
 # 7. КОЛДОНУУЧУНУН МОДЕЛИ
 AUTH_USER_MODEL = 'config.User'
 
+# 7.1 АУТЕНТИФИКАЦИЯНЫН КЭШИ (config/authentication.py)
+# Сессиядагы жана токендеги колдонуучу кэштен окулат (жылуу кэште 0 SQL).
+# ModelBackend бир релиз калат: Django сессияда backend'дин жолун сактайт
+# (_auth_user_backend) жана тизмеде жок backend'дин сессиясын таштайт —
+# ансыз деплой бардыгын системадан чыгарып салмак. Жаңы кирүүлөр
+# CachedModelBackend'ге жазылат; SESSION_COOKIE_AGE (2 жума) өткөн соң
+# кийинки релизде ModelBackend'ди алып салыңыз.
+AUTHENTICATION_BACKENDS = [
+    'config.authentication.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_CACHE_TIMEOUT = int(os.environ.get('AUTH_CACHE_TIMEOUT', 60))
+# Сессиялардын өзүн да кэштен окуу үчүн: SESSION_ENGINE=django.contrib.sessions.backends.cached_db
+# (жазуу базага да кетет; кэш бир нече worker үчүн жалпы болушу керек)
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.db')
+
 # 8. ПАРОЛЬ ВАЛИДАЦИЯСЫ
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator', },
@@ -79,6 +140,9 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator', },
 ]
 
+# /api/async/register/ паролдорду ушунча thread'те хештейт (демейки: CPU саны)
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0)) or None
+
 # 9. ТИЛ ЖАНА УБАКЫТ (I18N)
 LANGUAGE_CODE = 'ky'
 TIME_ZONE = 'Asia/Bishkek'
@@ -105,18 +169,87 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Жүктөлгөн файлдар мазмунунун хеши боюнча аталат (config/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'config.storage.HashedMediaStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Хештелген медиа файлдар өзгөрбөйт: Cache-Control: max-age=<бир жыл>, immutable
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# 10.1 КЭШ
+# Демейки: процесстин ичиндеги locmem. Бир нече worker үчүн мисалы:
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://127.0.0.1:6379/1
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache CACHE_LOCATION=/var/tmp/servic_cache
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'servic-default'),
+        # Башкы бетте ар бир кызматтын карточкасы өзүнчө фрагмент: 300 (демейки) аз
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000))},
+    }
+}
+
+# Каталогдун (кызматтар, категориялар, имараттар) кэштеги өмүрү, секунд менен
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 600))
+# Башкы беттеги заказдардын статистикасы (секунд)
+STATISTICS_CACHE_TIMEOUT = int(os.environ.get('STATISTICS_CACHE_TIMEOUT', 60))
+
+# 10.2 ПРОФИЛДӨӨ (PROFILING=1 менен күйгүзүлөт)
+# Ар бир жоопко Server-Timing (db / template / serializer / total) кошулат,
+# жай сурамдар жана кайталанган SQL 'config.profiling' логуна JSON катары жазылат.
+PROFILING = {
+    'ENABLED': os.environ.get('PROFILING') == '1',
+    'SLOW_REQUEST_MS': int(os.environ.get('PROFILING_SLOW_MS', 500)),
+    'DUPLICATE_QUERY_THRESHOLD': int(os.environ.get('PROFILING_DUPLICATES', 5)),
+    # 0.01 = ар бир 100 сурамдын бири cProfile менен PROFILE_DIR'ге жазылат
+    'PROFILE_SAMPLE_RATE': float(os.environ.get('PROFILING_SAMPLE_RATE', 0)),
+    'PROFILE_DIR': os.environ.get('PROFILING_DIR', str(BASE_DIR / 'profiles')),
+}
+
+# 10.3 МЕТРИКАЛАР (/metrics, Prometheus)
+# Бир нече WSGI worker болсо METRICS_DIR'ди бардыгына жалпы папкага коюңуз
+# (мисалы /run/servic-metrics) жана аны ар бир деплойдо тазалаңыз.
+# /metrics METRICS_TOKEN же METRICS_ALLOWED_IPS (мис. "10.0.0.0/8,127.0.0.1")
+# берилгенде гана ачык; болбосо 404.
+METRICS = {
+    'ENABLED': os.environ.get('METRICS', '1') == '1',
+    'DIR': os.environ.get('METRICS_DIR') or None,
+    'FLUSH_INTERVAL': float(os.environ.get('METRICS_FLUSH_INTERVAL', 5)),
+    # Берилсе: Authorization: Bearer <token>
+    'TOKEN': os.environ.get('METRICS_TOKEN') or None,
+    'ALLOWED_IPS': [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()],
+}
+
+# 10.4 ЗАКАЗДАРДЫН СТАТУСУ ЖАНДУУ (/orders/events/, SSE — ASGI менен иштетиңиз)
+# InProcessBroker бир процесстин ичинде гана: бир нече worker үчүн жалпы broker керек.
+# ORDER_EVENTS_ENABLED=1 ASGI деплойдо (servic.asgi) гана: WSGI'де ар бир ачык
+# барак worker'ди түбөлүк ээлейт, ошондуктан демейки боюнча өчүк.
+ORDER_EVENTS = {
+    'ENABLED': os.environ.get('ORDER_EVENTS_ENABLED') == '1',
+    'BROKER': os.environ.get('ORDER_EVENTS_BROKER', 'config.events.InProcessBroker'),
+    'KEEPALIVE': int(os.environ.get('ORDER_EVENTS_KEEPALIVE', 20)),
+}
+
 # 11. DJANGO REST FRAMEWORK ЖӨНДӨӨЛӨРҮ
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'config.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Бардык тизмелер курсор менен бөлүнөт (config/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 50)),
 }
 
+# ?page_size= параметринин жогорку чеги
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 200))
+
 # 12. SWAGGER (SPECTACULAR)
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Service.kg API',
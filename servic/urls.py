@@ -1,8 +1,10 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from config.views import metrics, serve_media
+
 urlpatterns = [
     # 1. Админ панель
     path('admin/', admin.site.urls),
@@ -15,9 +17,12 @@ urlpatterns = [
 
     # 4. API интерфейс
     path('api/', include('config.api_urls')),
+
+    # 5. Prometheus метрикалары
+    path('metrics', metrics, name='metrics'),
 ]
 
 # Сүрөттөр (media) жана статикалык файлдар үчүн (DEBUG режиминде)
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media)]
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file